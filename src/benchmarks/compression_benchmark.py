@@ -0,0 +1,162 @@
+"""Recall versus size of the compact embedding formats.
+
+Every configuration (float16, int8, ubinary, PCA projections and PCA + int8)
+is compared with exact float32 search over the same vectors: the report gives
+bytes per stored vector and recall@k of the compressed search against the
+float32 top k. Vectors come from a synthetic anisotropic corpus, or from an
+indexed project (full-size float vectors) through the configured vector DB:
+
+    $ python -m benchmarks.compression_benchmark --points 20000 --embedding-size 1024
+    $ python -m benchmarks.compression_benchmark --project-id 1 --components 256 128
+"""
+import json
+import time
+import argparse
+
+import numpy as np
+
+from stores.llm.EmbeddingCompressor import PCAProjection, quantize_vectors
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Embedding compression recall benchmark")
+    parser.add_argument("--project-id", default=None, help="Use this project's indexed vectors")
+    parser.add_argument("--points", type=int, default=20000, help="Synthetic corpus size")
+    parser.add_argument("--embedding-size", type=int, default=1024, help="Synthetic embedding size")
+    parser.add_argument("--rank", type=int, default=96, help="Intrinsic dimensionality of the synthetic corpus")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--components", type=int, nargs="+", default=None,
+                        help="PCA sizes (default: 1/2, 1/4 and 1/8 of the embedding size)")
+    parser.add_argument("--fit-sample", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def normalize(vectors):
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def generate_vectors(num_points: int, embedding_size: int, rank: int, rng):
+    # Real embeddings are far from isotropic: most variance sits in a few directions
+    mixing = rng.standard_normal((rank, embedding_size), dtype=np.float32)
+    spectrum = (1.0 / np.sqrt(np.arange(1, rank + 1, dtype=np.float32)))[:, None]
+    latent = rng.standard_normal((num_points, rank), dtype=np.float32)
+    noise = 0.05 * rng.standard_normal((num_points, embedding_size), dtype=np.float32)
+    return normalize(latent @ (mixing * spectrum) + noise)
+
+
+def load_project_vectors(project_id: str):
+    from helpers.config import get_settings
+    from helpers.clients import create_vectordb_client
+    from controllers import NLPController
+
+    vectordb_client = create_vectordb_client(get_settings())
+    nlp_controller = NLPController(vectordb_client, None, None, None)
+    collection_name, filters = nlp_controller.get_collection_scope(project_id=project_id)
+
+    try:
+        vectors = [
+            vector
+            for batch in vectordb_client.iterate_points(collection_name=collection_name, filters=filters)
+            for _, vector, _ in batch
+        ]
+    finally:
+        vectordb_client.disconnect()
+
+    return normalize(np.asarray(vectors, dtype=np.float32))
+
+
+def top_k(corpus, queries, k: int):
+    # Cosine, like the vector stores: quantized vectors are scaled per vector
+    scores = normalize(queries) @ normalize(corpus).T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return top
+
+
+def measure(name: str, corpus, queries, truth, k: int, bytes_per_vector: float):
+    started = time.perf_counter()
+    found = top_k(corpus, queries, k)
+    search_seconds = time.perf_counter() - started
+
+    recall = np.mean([
+        len(set(found_row.tolist()) & set(truth_row.tolist())) / k
+        for found_row, truth_row in zip(found, truth)
+    ])
+
+    return {
+        "config": name,
+        "dimensions": int(corpus.shape[1]),
+        "bytes_per_vector": bytes_per_vector,
+        f"recall@{k}": round(float(recall), 4),
+        "search_ms_per_query": round(search_seconds * 1000 / len(queries), 3),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rng = np.random.default_rng(args.seed)
+
+    if args.project_id:
+        vectors = load_project_vectors(args.project_id)
+        rng.shuffle(vectors)
+    else:
+        vectors = generate_vectors(args.points + args.queries, args.embedding_size, args.rank, rng)
+
+    # Held-out vectors stand in for queries
+    queries, corpus = vectors[:args.queries], vectors[args.queries:]
+    embedding_size = corpus.shape[1]
+    truth = top_k(corpus, queries, args.k)
+
+    components = args.components or [ embedding_size // 2, embedding_size // 4, embedding_size // 8 ]
+
+    results = [
+        measure("float32", corpus, queries, truth, args.k, 4 * embedding_size),
+        measure("float16", corpus.astype(np.float16).astype(np.float32), queries, truth, args.k, 2 * embedding_size),
+    ]
+
+    for embedding_type, bytes_per_vector in (("int8", embedding_size), ("ubinary", embedding_size / 8)):
+        results.append(measure(
+            embedding_type,
+            quantize_vectors(corpus, embedding_type),
+            quantize_vectors(queries, embedding_type),
+            truth, args.k, bytes_per_vector,
+        ))
+
+    fit_sample = corpus[:args.fit_sample]
+    for n_components in components:
+        projection = PCAProjection.fit(fit_sample, n_components=n_components)
+        projected_corpus = projection.transform(corpus)
+        projected_queries = projection.transform(queries)
+
+        result = measure(f"pca{n_components}", projected_corpus, projected_queries, truth, args.k, 4 * n_components)
+        result["explained_variance"] = round(float(projection.explained_variance_ratio.sum()), 4)
+        results.append(result)
+
+        results.append(measure(
+            f"pca{n_components}+int8",
+            quantize_vectors(projected_corpus, "int8"),
+            quantize_vectors(projected_queries, "int8"),
+            truth, args.k, n_components,
+        ))
+
+    report = {
+        "source": f"project:{args.project_id}" if args.project_id else "synthetic",
+        "points": int(len(corpus)),
+        "queries": int(len(queries)),
+        "embedding_size": int(embedding_size),
+        "k": args.k,
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import random
+
+TOPICS = [
+    ("billing", ["invoice", "payment", "refund", "subscription"]),
+    ("shipping", ["delivery", "tracking", "courier", "address"]),
+    ("account", ["password", "login", "profile", "verification"]),
+    ("product", ["warranty", "specification", "stock", "price"]),
+    ("support", ["ticket", "complaint", "agent", "hours"]),
+]
+
+QUESTION_TEMPLATES = {
+    "en": [
+        "How do I change my {keyword} for the {topic} service?",
+        "What happens to my {keyword} after a {topic} request?",
+        "Where can I find the {keyword} details of order {number}?",
+        "Why was my {keyword} rejected by the {topic} team?",
+    ],
+    "ar": [
+        "كيف يمكنني تغيير {keyword} في خدمة {topic}؟",
+        "ماذا يحدث إلى {keyword} بعد طلب {topic}؟",
+        "أين أجد تفاصيل {keyword} للطلب رقم {number}؟",
+    ],
+}
+
+ANSWER_TEMPLATES = {
+    "en": [
+        "Open the {topic} section, select {keyword} and follow the steps. Reference {number}.",
+        "The {keyword} is reviewed by the {topic} team within {days} business days.",
+        "Contact support with reference {number} and the {keyword} will be updated.",
+    ],
+    "ar": [
+        "افتح قسم {topic} واختر {keyword} ثم اتبع الخطوات. المرجع {number}.",
+        "تتم مراجعة {keyword} من فريق {topic} خلال {days} أيام عمل.",
+    ],
+}
+
+
+def generate_dataset(num_samples: int, languages: list = None, seed: int = 0):
+    """Synthetic Q&A dataset in the structure read by ProcessController.load_custom_json"""
+    languages = languages or ["en", "ar"]
+    rng = random.Random(seed)
+
+    data = []
+    for idx in range(num_samples):
+        language = languages[idx % len(languages)]
+        topic, keywords = rng.choice(TOPICS)
+        keyword = rng.choice(keywords)
+        variables = {
+            "topic": topic,
+            "keyword": keyword,
+            "number": 10000 + idx,
+            "days": rng.randint(1, 14),
+        }
+
+        data.append({
+            "question": rng.choice(QUESTION_TEMPLATES[language]).format(**variables),
+            "answer": rng.choice(ANSWER_TEMPLATES[language]).format(**variables),
+            "language": language,
+            "category": topic,
+            "keywords": [keyword, topic],
+            "source": "synthetic",
+        })
+
+    return {
+        "dataset_info": {
+            "total_samples": num_samples,
+            "languages": languages,
+        },
+        "data": data,
+    }
+
+
+def generate_queries(dataset: dict, num_queries: int, seed: int = 0):
+    """Questions drawn from the dataset, so searches hit realistic neighbourhoods"""
+    rng = random.Random(seed + 1)
+    questions = [ item["question"] for item in dataset["data"] ]
+    return [ rng.choice(questions) for _ in range(num_queries) ]
@@ -0,0 +1,247 @@
+"""End-to-end load benchmark for the HTTP API.
+
+Runs the app in-process with the deterministic FAKE providers and the MEMORY
+vector backend (or against a running server with --base-url), drives
+upload -> push -> search -> answer at a fixed concurrency and prints a JSON
+report that can be diffed between releases:
+
+    $ python -m benchmarks.load_benchmark --samples 2000 --concurrency 32 \
+        --requests 500 --latency-ms 40 --jitter-ms 10 --output bench.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import platform
+from collections import Counter
+
+import httpx
+import numpy as np
+
+from .datasets import generate_dataset, generate_queries
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end load benchmark")
+    parser.add_argument("--base-url", default=None,
+                        help="Benchmark a running server instead of an in-process app")
+    parser.add_argument("--project-id", default=None)
+    parser.add_argument("--samples", type=int, default=1000, help="Q&A pairs per uploaded file")
+    parser.add_argument("--files", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per search/answer phase")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=10, help="Unreported requests before each phase")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--overlap-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20, help="Fake provider latency")
+    parser.add_argument("--jitter-ms", type=float, default=5, help="Fake provider latency jitter")
+    parser.add_argument("--embedding-size", type=int, default=384)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--keep", action="store_true", help="Keep uploaded files and the collection")
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args):
+    # Backends are forced, everything else only gets a default so a local .env still applies
+    os.environ["GENERATION_BACKEND"] = "FAKE"
+    os.environ["EMBEDDING_BACKEND"] = "FAKE"
+    os.environ["GENERATION_SECONDARY_BACKEND"] = ""
+    os.environ["VECTOR_DB_BACKEND"] = "MEMORY"
+    os.environ["FAKE_PROVIDER_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_PROVIDER_JITTER_MS"] = str(args.jitter_ms)
+    os.environ["EMBEDDING_MODEL_SIZE"] = str(args.embedding_size)
+
+    defaults = {
+        "APP_NAME": "EGRONX-AI",
+        "APP_VERSION": "benchmark",
+        "OPENAI_API_KEY": "",
+        "OPENAI_API_URL": "",
+        "COHERE_API_KEY": "",
+        "FILE_ALLOWED_TYPES": '["application/json", "text/csv"]',
+        "FILE_MAX_SIZE": "50",
+        "FILE_DEFAULT_CHUNK_SIZE": "512000",
+        "GENERATION_MODEL_ID": "fake-generation",
+        "EMBEDDING_MODEL_ID": "fake-embedding",
+        "INPUT_DEFAULT_MAX_CHARACTERS": "1024",
+        "GENERATION_DEFAULT_MAX_TOKENS": "200",
+        "GENERATION_DEFAULT_TEMPERATURE": "0.1",
+        "VECTOR_DB_PATH": "benchmark_db",
+        "VECTOR_DB_DISTANCE_METHOD": "cosine",
+    }
+    for key, value in defaults.items():
+        os.environ.setdefault(key, value)
+
+
+def summarize(name: str, latencies: list, statuses: Counter, wall_seconds: float):
+    latencies_ms = np.asarray(latencies, dtype=np.float64) * 1000
+    ok = sum(count for status, count in statuses.items() if 200 <= status < 300)
+
+    summary = {
+        "requests": int(len(latencies)),
+        "ok": ok,
+        "errors": int(len(latencies) - ok),
+        "status_codes": { str(status): count for status, count in sorted(statuses.items()) },
+        "wall_seconds": round(wall_seconds, 4),
+        "rps": round(len(latencies) / wall_seconds, 2) if wall_seconds > 0 else None,
+        "latency_ms": None,
+    }
+
+    if len(latencies_ms):
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+        summary["latency_ms"] = {
+            "min": round(float(latencies_ms.min()), 3),
+            "mean": round(float(latencies_ms.mean()), 3),
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "max": round(float(latencies_ms.max()), 3),
+        }
+
+    return summary
+
+
+async def run_phase(name: str, send_request, total: int, concurrency: int, warmup: int = 0):
+    """Fire `total` requests through `concurrency` workers, each calling send_request(idx)"""
+
+    for idx in range(warmup):
+        await send_request(idx)
+
+    latencies, statuses, responses = [], Counter(), [None] * total
+    next_idx = iter(range(total))
+
+    async def worker():
+        for idx in next_idx:
+            started = time.perf_counter()
+            try:
+                response = await send_request(idx)
+                status = response.status_code
+                responses[idx] = response
+            except httpx.HTTPError:
+                status = 0
+            latencies.append(time.perf_counter() - started)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[ worker() for _ in range(max(1, min(concurrency, total))) ])
+    wall_seconds = time.perf_counter() - started
+
+    return summarize(name, latencies, statuses, wall_seconds), responses
+
+
+async def run_benchmark(args, client: httpx.AsyncClient):
+    project_id = args.project_id
+    datasets = [
+        generate_dataset(num_samples=args.samples, seed=args.seed + idx)
+        for idx in range(args.files)
+    ]
+    queries = generate_queries(datasets[0], num_queries=args.requests + args.warmup, seed=args.seed)
+
+    phases = {}
+
+    # step1: upload the synthetic datasets
+    payloads = [ json.dumps(dataset, ensure_ascii=False).encode("utf-8") for dataset in datasets ]
+
+    async def upload(idx):
+        return await client.post(f"/data/upload/{project_id}", files={
+            "file": (f"bench_{idx}.json", payloads[idx], "application/json")
+        })
+
+    phases["upload"], responses = await run_phase("upload", upload, args.files, args.concurrency)
+    file_ids = [ r.json()["file_id"] for r in responses if r is not None and r.status_code == 200 ]
+    if not file_ids:
+        raise RuntimeError("No file could be uploaded, aborting the benchmark")
+
+    # step2: chunk, embed and index every uploaded file
+    async def push(idx):
+        return await client.post(f"/nlp/index/push/{project_id}", json={
+            "file_id": file_ids[idx],
+            "chunk_size": args.chunk_size,
+            "overlap_size": args.overlap_size,
+            "do_reset": 0,
+        })
+
+    phases["push"], responses = await run_phase("push", push, len(file_ids), args.concurrency)
+    phases["push"]["inserted_items"] = sum(
+        r.json().get("inserted_items_count", 0) for r in responses if r is not None and r.status_code == 200
+    )
+
+    # step3: semantic search and RAG answers under concurrent load
+    async def search(idx):
+        return await client.post(f"/nlp/index/search/{project_id}", json={
+            "text": queries[idx], "limit": args.limit,
+        })
+
+    async def answer(idx):
+        return await client.post(f"/nlp/index/answer/{project_id}", json={
+            "text": queries[idx], "limit": args.limit,
+        })
+
+    phases["search"], _ = await run_phase("search", search, args.requests, args.concurrency, args.warmup)
+    phases["answer"], _ = await run_phase("answer", answer, args.requests, args.concurrency, args.warmup)
+
+    return phases
+
+
+def cleanup(app, project_id: str):
+    from controllers import ProjectController
+    from controllers.NLPController import NLPController
+
+    # Drops the collection, or only the project's points in a shared collection
+    NLPController(
+        vectordb_client=app.vectordb_client,
+        generation_client=None,
+        embedding_client=None,
+        template_parser=None,
+    ).reset_vector_db_collection(project={"project_id": project_id})
+    shutil.rmtree(ProjectController().get_project_path(project_id=project_id), ignore_errors=True)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    args.project_id = args.project_id or f"bench{int(time.time())}"
+
+    app = None
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        configure_environment(args)
+        from main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://benchmark"
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout) as client:
+        try:
+            phases = await run_benchmark(args, client)
+        finally:
+            if app is not None and not args.keep:
+                cleanup(app, args.project_id)
+
+    report = {
+        "benchmark": "load",
+        "timestamp": int(time.time()),
+        "target": args.base_url or "in-process",
+        "python": platform.python_version(),
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("output", "base_url", "keep")
+        },
+        "phases": phases,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+    return report
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,165 @@
+"""Span splitter vs langchain's RecursiveCharacterTextSplitter.
+
+First checks that both produce exactly the same chunks over a randomized
+corpus (several chunk sizes and overlaps, mixed separators and whitespace),
+exiting non-zero on the first mismatch, then reports split time and traced
+memory for both on a CSV-like corpus:
+
+    $ python -m benchmarks.splitter_benchmark --records 20000 --chunk-size 500
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from helpers.text_splitter import SpanTextSplitter
+
+WORDS = (
+    "price", "stock", "delivery", "warranty", "refund", "order", "account",
+    "password", "invoice", "السعر", "الطلب", "الشحن", "ضمان", "استرجاع",
+)
+SEPARATORS = (" ", " ", " ", " ", "\n", "\n\n", "  ", "\t", " \n ")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Text splitter benchmark")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--overlap-size", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3, help="Timed rounds; the best is reported")
+    parser.add_argument("--equivalence-texts", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def random_text(rng: random.Random, max_words: int):
+    parts = []
+    for _ in range(rng.randint(0, max_words)):
+        word = rng.choice(WORDS)
+        # Occasional unbroken runs force the character-level fallback
+        if rng.random() < 0.02:
+            word = word * rng.randint(10, 80)
+        parts.append(word)
+        parts.append(rng.choice(SEPARATORS))
+    return "".join(parts)
+
+
+def generate_records(num_records: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        {
+            "text": f"question: {random_text(rng, 40)}\nanswer: {random_text(rng, 160)}",
+            "metadata": { "source": "bench.csv", "row": idx },
+        }
+        for idx in range(num_records)
+    ]
+
+
+def check_equivalence(num_texts: int, seed: int):
+    rng = random.Random(seed)
+    texts = [ random_text(rng, 400) for _ in range(num_texts) ] + [ "", "   ", "\n\n\n", "a" ]
+    metadatas = [ { "idx": idx } for idx in range(len(texts)) ]
+
+    checked = 0
+    for chunk_size, overlap_size in ((1, 0), (5, 2), (20, 0), (50, 10), (100, 20), (500, 20), (1000, 200)):
+        expected = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=overlap_size, length_function=len
+        ).create_documents(texts, metadatas=metadatas)
+        actual = SpanTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=overlap_size
+        ).create_chunks(texts, metadatas=metadatas)
+
+        if len(expected) != len(actual):
+            raise AssertionError(
+                f"chunk_size={chunk_size} overlap={overlap_size}: "
+                f"{len(actual)} chunks, langchain produced {len(expected)}"
+            )
+
+        for idx, (doc, chunk) in enumerate(zip(expected, actual)):
+            if doc.page_content != chunk.page_content or doc.metadata != chunk.metadata:
+                raise AssertionError(
+                    f"chunk_size={chunk_size} overlap={overlap_size}: chunk {idx} differs: "
+                    f"{chunk.page_content!r} != {doc.page_content!r}"
+                )
+        checked += len(expected)
+
+    return checked
+
+
+def measure(split, texts: list, metadatas: list, rounds: int):
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        chunks = split(texts, metadatas)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+        del chunks
+
+    # Memory is traced separately so tracemalloc's overhead does not skew the timings
+    tracemalloc.start()
+    chunks = split(texts, metadatas)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "chunks": len(chunks),
+        "seconds": round(best, 4),
+        "chunks_per_second": round(len(chunks) / best, 1) if best else None,
+        "retained_mb": round(retained / 1024 ** 2, 2),
+        "peak_mb": round(peak / 1024 ** 2, 2),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    try:
+        checked = check_equivalence(num_texts=args.equivalence_texts, seed=args.seed)
+    except AssertionError as e:
+        print(f"Span splitter output differs from langchain: {e}", file=sys.stderr)
+        return 1
+
+    records = generate_records(num_records=args.records, seed=args.seed)
+    texts = [ record["text"] for record in records ]
+    metadatas = [ record["metadata"] for record in records ]
+
+    langchain_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=args.chunk_size, chunk_overlap=args.overlap_size, length_function=len
+    )
+    span_splitter = SpanTextSplitter(chunk_size=args.chunk_size, chunk_overlap=args.overlap_size)
+
+    report = {
+        "records": args.records,
+        "chunk_size": args.chunk_size,
+        "overlap_size": args.overlap_size,
+        "equivalent_chunks_checked": checked,
+        "langchain": measure(
+            lambda t, m: langchain_splitter.create_documents(t, metadatas=m), texts, metadatas, args.rounds
+        ),
+        "spans": measure(
+            lambda t, m: span_splitter.create_chunks(t, metadatas=m), texts, metadatas, args.rounds
+        ),
+        # What an indexing pass pays when it reads every chunk's text once
+        "spans_materialized": measure(
+            lambda t, m: [ c.page_content for c in span_splitter.iter_chunks(t, metadatas=m) ],
+            texts, metadatas, args.rounds
+        ),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Cold-start benchmark: import time of `main` and time until the server answers.
+
+Every round starts a fresh interpreter, so nothing is shared between runs:
+
+  * import:  `import main` in a new process
+  * live:    process spawn until `GET /health/live` first answers 200 (uvicorn)
+  * ready:   process spawn until `GET /health/ready` answers 200 (warm-up done)
+
+    $ python -m benchmarks.startup_benchmark --rounds 5
+    $ python -m benchmarks.startup_benchmark --backends env   # providers from .env
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Startup time benchmark")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--backends", choices=["fake", "env"], default="fake",
+                        help="FAKE/MEMORY backends, or whatever .env configures")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def build_environment(backends: str):
+    env = dict(os.environ)
+    if backends == "fake":
+        env.update({
+            "GENERATION_BACKEND": "FAKE",
+            "EMBEDDING_BACKEND": "FAKE",
+            "GENERATION_SECONDARY_BACKEND": "",
+            "VECTOR_DB_BACKEND": "MEMORY",
+            "FAKE_PROVIDER_LATENCY_MS": "0",
+            "FAKE_PROVIDER_JITTER_MS": "0",
+        })
+        for name, value in {
+            "APP_NAME": "bench", "APP_VERSION": "0", "OPENAI_API_KEY": "", "OPENAI_API_URL": "",
+            "COHERE_API_KEY": "", "GENERATION_MODEL_ID": "fake", "EMBEDDING_MODEL_ID": "fake",
+            "EMBEDDING_MODEL_SIZE": "384", "VECTOR_DB_PATH": "qdrant_db",
+        }.items():
+            env.setdefault(name, value)
+    return env
+
+
+def find_free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict):
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def wait_for(client: httpx.Client, url: str, deadline: float):
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(url).status_code == 200:
+                return time.perf_counter()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(f"{url} did not answer 200 in time")
+
+
+def measure_server(env: dict, timeout: float):
+    port = find_free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=SRC_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=5.0) as client:
+            deadline = started + timeout
+            live_at = wait_for(client, f"{base_url}/health/live", deadline)
+            ready_at = wait_for(client, f"{base_url}/health/ready", deadline)
+            warm_up = client.get(f"{base_url}/health/ready").json().get("warmup_seconds", {})
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return live_at - started, ready_at - started, warm_up
+
+
+def summarize(values: list):
+    return {
+        "median": round(statistics.median(values), 4),
+        "min": round(min(values), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    env = build_environment(backends=args.backends)
+
+    import_seconds, live_seconds, ready_seconds = [], [], []
+    warm_up = {}
+    for _ in range(args.rounds):
+        import_seconds.append(measure_import(env))
+        live, ready, warm_up = measure_server(env, timeout=args.timeout)
+        live_seconds.append(live)
+        ready_seconds.append(ready)
+
+    report = {
+        "rounds": args.rounds,
+        "backends": args.backends,
+        "import_main_seconds": summarize(import_seconds),
+        "time_to_live_seconds": summarize(live_seconds),
+        "time_to_ready_seconds": summarize(ready_seconds),
+        "last_warmup_seconds": warm_up,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
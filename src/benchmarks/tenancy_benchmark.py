@@ -0,0 +1,192 @@
+"""Per-project collections vs one shared, project-filtered collection.
+
+For every project count, each collection mode is loaded in a fresh process
+against its own storage directory, then the report records load time,
+resident memory after loading, the time to reopen the storage (a restart)
+and tenant-scoped search latency:
+
+    $ python -m benchmarks.tenancy_benchmark --projects 1000 10000 --points 20
+    $ python -m benchmarks.tenancy_benchmark --backend MEMORY
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+
+import numpy as np
+
+MODES = ("PER_PROJECT", "SHARED")
+TENANT_FIELD = "project_id"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-tenant collection benchmark")
+    parser.add_argument("--projects", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--points", type=int, default=20, help="Points per project")
+    parser.add_argument("--embedding-size", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--backend", choices=["QDRANT", "MEMORY"], default="QDRANT")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the JSON report here instead of stdout")
+    # Internal: run a single (mode, projects) measurement in this process
+    parser.add_argument("--worker-mode", choices=MODES, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-projects", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-path", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def get_rss_mb():
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak rather than current RSS where /proc is unavailable (KiB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def create_client(backend: str, db_path: str):
+    if backend == "QDRANT":
+        from stores.vectordb.providers.QdrantDBProvider import QdrantDBProvider
+        client = QdrantDBProvider(db_path=db_path, distance_method="cosine")
+    else:
+        from stores.vectordb.providers.InMemoryDBProvider import InMemoryDBProvider
+        client = InMemoryDBProvider(distance_method="cosine")
+
+    client.connect()
+    return client
+
+
+def get_scope(mode: str, project_id: str):
+    if mode == "SHARED":
+        return "collection_shared", { TENANT_FIELD: project_id }
+    return f"collection_{project_id}", None
+
+
+def load_projects(client, mode: str, num_projects: int, points: int, embedding_size: int, rng):
+    for idx in range(num_projects):
+        project_id = f"p{idx}"
+        collection_name, filters = get_scope(mode, project_id)
+
+        _ = client.create_collection(
+            collection_name=collection_name,
+            embedding_size=embedding_size,
+            tenant_field=TENANT_FIELD if filters else None,
+        )
+        _ = client.insert_many(
+            collection_name=collection_name,
+            texts=[ f"{project_id} chunk {n}" for n in range(points) ],
+            vectors=rng.standard_normal((points, embedding_size), dtype=np.float32).tolist(),
+            metadata=[ { "file_id": "bench.json" } ] * points,
+            record_ids=[ str(uuid.uuid5(uuid.NAMESPACE_URL, f"{project_id}/bench/{n}")) for n in range(points) ],
+            batch_size=256,
+            extra_payload=filters,
+        )
+
+
+def measure_searches(client, mode: str, num_projects: int, queries: int, limit: int,
+                     embedding_size: int, rng):
+    latencies = []
+    for _ in range(queries):
+        collection_name, filters = get_scope(mode, f"p{int(rng.integers(num_projects))}")
+        vector = rng.standard_normal(embedding_size, dtype=np.float32).tolist()
+
+        started = time.perf_counter()
+        _ = client.search_by_vector(
+            collection_name=collection_name, vector=vector, limit=limit, filters=filters
+        )
+        latencies.append(time.perf_counter() - started)
+
+    latencies = np.asarray(latencies) * 1000
+    return {
+        "p50": round(float(np.percentile(latencies, 50)), 3),
+        "p95": round(float(np.percentile(latencies, 95)), 3),
+        "p99": round(float(np.percentile(latencies, 99)), 3),
+    }
+
+
+def run_worker(args):
+    rng = np.random.default_rng(args.seed)
+    rss_before = get_rss_mb()
+
+    started = time.perf_counter()
+    client = create_client(args.backend, args.worker_path)
+    load_projects(client, args.worker_mode, args.worker_projects, args.points, args.embedding_size, rng)
+    load_seconds = time.perf_counter() - started
+
+    result = {
+        "mode": args.worker_mode,
+        "projects": args.worker_projects,
+        "points": args.worker_projects * args.points,
+        "load_seconds": round(load_seconds, 3),
+        "rss_mb": round(get_rss_mb() - rss_before, 1),
+    }
+
+    if args.backend == "QDRANT":
+        # Reopening the storage is what every restart pays
+        client.disconnect()
+        started = time.perf_counter()
+        client = create_client(args.backend, args.worker_path)
+        result["reopen_seconds"] = round(time.perf_counter() - started, 3)
+
+    result["search_ms"] = measure_searches(
+        client, args.worker_mode, args.worker_projects, args.queries, args.limit, args.embedding_size, rng
+    )
+    sys.stdout.write(json.dumps(result) + "\n")
+
+
+def run_configuration(args, mode: str, num_projects: int):
+    db_path = tempfile.mkdtemp(prefix="tenancy_bench_")
+    try:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.tenancy_benchmark",
+             "--worker-mode", mode, "--worker-projects", str(num_projects), "--worker-path", db_path,
+             "--points", str(args.points), "--embedding-size", str(args.embedding_size),
+             "--queries", str(args.queries), "--limit", str(args.limit),
+             "--backend", args.backend, "--seed", str(args.seed)],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, check=True,
+        )
+    finally:
+        shutil.rmtree(db_path, ignore_errors=True)
+
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.worker_mode:
+        return run_worker(args)
+
+    report = {
+        "backend": args.backend,
+        "points_per_project": args.points,
+        "embedding_size": args.embedding_size,
+        "results": [
+            run_configuration(args, mode, num_projects)
+            for num_projects in args.projects
+            for mode in MODES
+        ],
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
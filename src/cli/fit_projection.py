@@ -0,0 +1,94 @@
+"""Fit a PCA projection (EMBEDDING_PROJECTION_PATH) on a project's indexed vectors.
+
+    $ python -m cli.fit_projection <project_id> --components 128
+        [--sample 20000] [--output assets/projections/<project_id>_128.npz]
+
+The project must have been indexed with full-size float vectors (no projection,
+EMBEDDING_TYPE=float). Set EMBEDDING_PROJECTION_PATH to the written file and
+EMBEDDING_MODEL_SIZE to --components, then re-push (or reset and re-push) the
+projects: vectors of different sizes cannot share a collection.
+Uses the same settings (.env) as the API; stop a server using the embedded
+Qdrant storage first.
+"""
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+
+from helpers.config import get_settings
+from helpers.clients import create_vectordb_client
+from controllers import NLPController
+from stores.llm.EmbeddingCompressor import PCAProjection
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fit a PCA embedding projection on indexed vectors")
+    parser.add_argument("project_id")
+    parser.add_argument("--components", type=int, required=True, help="Projected embedding size")
+    parser.add_argument("--sample", type=int, default=20000, help="Maximum number of vectors to fit on")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+def load_sample(vectordb_client, nlp_controller: NLPController, project_id: str,
+                sample: int, batch_size: int):
+    collection_name, filters = nlp_controller.get_collection_scope(project_id=project_id)
+
+    vectors = []
+    for batch in vectordb_client.iterate_points(
+        collection_name=collection_name, batch_size=batch_size, filters=filters
+    ):
+        vectors.extend(vector for _, vector, _ in batch)
+        if len(vectors) >= sample:
+            break
+
+    return np.asarray(vectors[:sample], dtype=np.float32)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = get_settings()
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "assets", "projections", f"{args.project_id}_{args.components}.npz",
+    )
+
+    vectordb_client = create_vectordb_client(settings)
+    nlp_controller = NLPController(
+        vectordb_client=vectordb_client,
+        generation_client=None,
+        embedding_client=None,
+        template_parser=None,
+    )
+
+    try:
+        vectors = load_sample(vectordb_client, nlp_controller, args.project_id, args.sample, args.batch_size)
+    finally:
+        vectordb_client.disconnect()
+
+    if len(vectors) <= args.components:
+        sys.stderr.write(f"Need more than {args.components} indexed vectors, found {len(vectors)}\n")
+        return 1
+
+    projection = PCAProjection.fit(vectors, n_components=args.components)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    projection.save(output)
+
+    sys.stdout.write(json.dumps({
+        "output": output,
+        "sample_size": len(vectors),
+        "input_size": projection.input_size,
+        "output_size": projection.output_size,
+        "explained_variance": round(float(projection.explained_variance_ratio.sum()), 4),
+    }, indent=2) + "\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Index every uploaded file of a project from the command line.
+
+    $ python -m cli.ingest <project_id> [--chunk-size 100] [--overlap-size 20]
+        [--batch-size 64] [--workers N] [--do-reset]
+
+Uses the same settings (.env) as the API. With the embedded Qdrant backend the
+storage directory is locked by a running server, so stop it first or point
+both at a Qdrant server.
+"""
+import sys
+import json
+import argparse
+
+from helpers.config import get_settings
+from helpers.clients import create_embedding_client, create_vectordb_client
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from controllers import NLPController, IngestController
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Index every file of a project")
+    parser.add_argument("project_id")
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--overlap-size", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: INGEST_MAX_WORKERS)")
+    parser.add_argument("--do-reset", action="store_true", help="Drop the project's collection first")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = get_settings()
+
+    llm_provider_factory = LLMProviderFactory(settings)
+    # A single caller gains nothing from the query micro-batcher
+    embedding_client = create_embedding_client(settings, llm_provider_factory, batching=False)
+    vectordb_client = create_vectordb_client(settings)
+
+    nlp_controller = NLPController(
+        vectordb_client=vectordb_client,
+        generation_client=None,
+        embedding_client=embedding_client,
+        template_parser=None,
+    )
+    ingest_controller = IngestController(nlp_controller=nlp_controller, max_workers=args.workers)
+
+    try:
+        files = ingest_controller.ingest_project(
+            project_id=args.project_id,
+            chunk_size=args.chunk_size,
+            overlap_size=args.overlap_size,
+            batch_size=args.batch_size,
+            do_reset=args.do_reset,
+        )
+    finally:
+        vectordb_client.disconnect()
+
+    sys.stdout.write(json.dumps({
+        "project_id": args.project_id,
+        "inserted_items_count": sum(f["indexed"] for f in files),
+        "files": files,
+    }, indent=2) + "\n")
+
+    return 0 if all(f["status"] in ("indexed", "empty") for f in files) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""Move per-project collections (`collection_<project_id>`) into the shared collection.
+
+    $ python -m cli.migrate_collections [--projects p1 p2 ...] [--batch-size 256]
+        [--drop-source] [--dry-run]
+
+Points keep their vectors, text and metadata and gain a `project_id` payload.
+UUID point ids are kept (they already embed the project id); integer ids from
+older indexes are remapped to uuid5 ids so projects cannot collide. Re-running
+is safe: points are upserted by id. A source collection is only dropped with
+--drop-source, and only once the shared collection holds all of its points.
+Uses the same settings (.env) as the API; stop a server using the embedded
+Qdrant storage first.
+"""
+import sys
+import json
+import uuid
+import argparse
+
+from helpers.config import get_settings
+from helpers.clients import create_vectordb_client
+from controllers import NLPController
+from stores.vectordb.VectorDBEnums import CollectionModeEnums
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate per-project collections into the shared collection")
+    parser.add_argument("--projects", nargs="*", default=None, help="Only these project ids (default: all)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--drop-source", action="store_true", help="Drop each source collection once verified")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be migrated")
+    return parser.parse_args(argv)
+
+
+def get_shared_record_id(project_id: str, record_id):
+    try:
+        return str(uuid.UUID(str(record_id)))
+    except ValueError:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{project_id}/{record_id}"))
+
+
+def list_source_projects(vectordb_client, nlp_controller: NLPController, shared_collection: str):
+    prefix = nlp_controller.create_collection_name(project_id="")
+    return sorted(
+        collection_name[len(prefix):]
+        for collection_name in vectordb_client.list_all_collections()
+        if collection_name.startswith(prefix) and collection_name != shared_collection
+    )
+
+
+def migrate_project(vectordb_client, nlp_controller: NLPController, project_id: str,
+                    shared_collection: str, batch_size: int, drop_source: bool):
+
+    source_collection = nlp_controller.create_collection_name(project_id=project_id)
+    filters = { NLPController.TENANT_FIELD: project_id }
+    source_points = vectordb_client.count_points(collection_name=source_collection)
+
+    for batch in vectordb_client.iterate_points(collection_name=source_collection, batch_size=batch_size):
+        # The shared collection is sized after the first vector actually migrated
+        _ = vectordb_client.create_collection(
+            collection_name=shared_collection,
+            embedding_size=len(batch[0][1]),
+            tenant_field=NLPController.TENANT_FIELD,
+        )
+
+        _ = vectordb_client.insert_many(
+            collection_name=shared_collection,
+            texts=[ payload.get("text") for _, _, payload in batch ],
+            vectors=[ vector for _, vector, _ in batch ],
+            metadata=[ payload.get("metadata") for _, _, payload in batch ],
+            record_ids=[ get_shared_record_id(project_id, record_id) for record_id, _, _ in batch ],
+            batch_size=batch_size,
+            extra_payload=filters,
+        )
+
+    migrated_points = vectordb_client.count_points(collection_name=shared_collection, filters=filters)
+
+    dropped = False
+    if drop_source and migrated_points >= source_points:
+        dropped = bool(vectordb_client.delete_collection(collection_name=source_collection))
+
+    return {
+        "project_id": project_id,
+        "source_points": source_points,
+        "migrated_points": migrated_points,
+        "status": "migrated" if migrated_points >= source_points else "incomplete",
+        "source_dropped": dropped,
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = get_settings()
+    shared_collection = settings.VECTOR_DB_SHARED_COLLECTION_NAME
+
+    if settings.VECTOR_DB_COLLECTION_MODE != CollectionModeEnums.SHARED.value:
+        sys.stderr.write(
+            "VECTOR_DB_COLLECTION_MODE is not SHARED: the API keeps using per-project "
+            "collections until it is switched.\n"
+        )
+
+    vectordb_client = create_vectordb_client(settings)
+    nlp_controller = NLPController(
+        vectordb_client=vectordb_client,
+        generation_client=None,
+        embedding_client=None,
+        template_parser=None,
+    )
+
+    try:
+        project_ids = list_source_projects(vectordb_client, nlp_controller, shared_collection)
+        if args.projects is not None:
+            project_ids = [ project_id for project_id in project_ids if project_id in set(args.projects) ]
+
+        if args.dry_run:
+            projects = [ { "project_id": project_id, "status": "pending" } for project_id in project_ids ]
+        else:
+            projects = [
+                migrate_project(
+                    vectordb_client=vectordb_client,
+                    nlp_controller=nlp_controller,
+                    project_id=project_id,
+                    shared_collection=shared_collection,
+                    batch_size=args.batch_size,
+                    drop_source=args.drop_source,
+                )
+                for project_id in project_ids
+            ]
+    finally:
+        vectordb_client.disconnect()
+
+    sys.stdout.write(json.dumps({
+        "shared_collection": shared_collection,
+        "projects": projects,
+    }, indent=2) + "\n")
+
+    return 0 if all(p["status"] in ("migrated", "pending") for p in projects) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,14 +2,27 @@ from .BaseController import BaseController
 from .ProjectController import ProjectController
 from fastapi import UploadFile
 from models import ResponseSignal
+from contextlib import contextmanager
+import tempfile
 import re
 import os
+import json
+import threading
+
+try:
+    import fcntl
+except ImportError:  # not on POSIX: only threads of one process are serialized
+    fcntl = None
 
 class DataController(BaseController):
+
+    # Guards every project's hash index within a process; the file lock covers the other workers
+    hash_index_lock = threading.Lock()
     
     def __init__(self):
         super().__init__()
         self.size_scale = 1048576 # convert MB to bytes
+        self.hash_index_name = ".hashes.json"
 
     def validate_uploaded_file(self, file: UploadFile):
 
@@ -54,3 +67,78 @@ class DataController(BaseController):
 
         return cleaned_file_name
 
+    def get_hash_index_path(self, project_id: str):
+        project_path = ProjectController().get_project_path(project_id=project_id)
+        return os.path.join(project_path, self.hash_index_name)
+
+    def load_hash_index(self, project_id: str):
+        hash_index_path = self.get_hash_index_path(project_id=project_id)
+        if not os.path.exists(hash_index_path):
+            return {}
+
+        with open(hash_index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @contextmanager
+    def lock_hash_index(self, project_id: str):
+        """Hold the project's hash index exclusively, across every uvicorn worker process"""
+        with self.hash_index_lock:
+            if fcntl is None:
+                yield
+                return
+
+            # The index itself is replaced on every write, so the lock lives in a file of its own
+            with open(self.get_hash_index_path(project_id=project_id) + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def save_hash_index(self, project_id: str, hash_index: dict):
+        hash_index_path = self.get_hash_index_path(project_id=project_id)
+
+        # Write-then-rename so a crash never leaves a truncated index behind
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(hash_index_path), prefix=self.hash_index_name, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(hash_index, f)
+            os.replace(tmp_path, hash_index_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def find_file_by_hash(self, project_id: str, file_hash: str):
+        """Return the file_id of a stored file with this sha256, if it still exists"""
+        project_path = ProjectController().get_project_path(project_id=project_id)
+
+        # Writes replace the index atomically, so reading needs no lock
+        file_id = self.load_hash_index(project_id=project_id).get(file_hash)
+
+        if file_id and os.path.exists(os.path.join(project_path, file_id)):
+            return file_id
+
+        return None
+
+    def register_file_hash(self, project_id: str, file_hash: str, file_id: str):
+        """Record `file_id` as the content for `file_hash` and return the canonical file_id.
+
+        When an identical file was stored first (e.g. by a concurrent upload),
+        its file_id is returned and the caller should discard its own copy.
+        """
+        project_path = ProjectController().get_project_path(project_id=project_id)
+
+        with self.lock_hash_index(project_id=project_id):
+            hash_index = self.load_hash_index(project_id=project_id)
+
+            existing_file_id = hash_index.get(file_hash)
+            if existing_file_id and existing_file_id != file_id and \
+                    os.path.exists(os.path.join(project_path, existing_file_id)):
+                return existing_file_id
+
+            hash_index[file_hash] = file_id
+            self.save_hash_index(project_id=project_id, hash_index=hash_index)
+
+        return file_id
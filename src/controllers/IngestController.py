@@ -0,0 +1,158 @@
+from .BaseController import BaseController
+from .ProjectController import ProjectController
+from .ProcessController import ProcessController
+from models import ProcessingEnum
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+import multiprocessing
+import logging
+import time
+import os
+
+
+def parse_project_file(project_id: str, file_id: str, chunk_size: int, overlap_size: int):
+    """Process-pool worker: load and split one file into plain (texts, metadata) lists"""
+    started = time.perf_counter()
+    try:
+        process_controller = ProcessController(project_id=project_id)
+        chunks = process_controller.process_file(
+            file_id=file_id,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+        )
+        process_controller.save_chunks_file_metadata(chunks)
+
+        texts = [ c.page_content for c in chunks ]
+        metadata = [
+            c.payload_metadata if hasattr(c, "payload_metadata") else c.metadata
+            for c in chunks
+        ]
+        return { "file_id": file_id, "texts": texts, "metadata": metadata, "error": None,
+                 "parse_seconds": time.perf_counter() - started }
+    except Exception as e:
+        return { "file_id": file_id, "texts": [], "metadata": [], "error": str(e),
+                 "parse_seconds": time.perf_counter() - started }
+
+
+class IngestController(BaseController):
+    """Indexes every file of a project: parsing and splitting fan out over a process
+    pool while the parent feeds one shared embed + upsert stage as results arrive."""
+
+    def __init__(self, nlp_controller, max_workers: int = None, executors=None):
+        super().__init__()
+        self.nlp_controller = nlp_controller
+        self.max_workers = max_workers or self.app_settings.INGEST_MAX_WORKERS or os.cpu_count()
+        # The API's shared ExecutorManager; without one (CLI) a pool is spawned per run
+        self.executors = executors
+        self.logger = logging.getLogger(__name__)
+
+    def list_project_files(self, project_id: str):
+        project_path = ProjectController().get_project_path(project_id=project_id)
+        supported_extensions = { e.value for e in ProcessingEnum }
+
+        # Hidden entries (.uploads, .meta, .hashes.json) are bookkeeping, not data
+        return sorted(
+            file_id for file_id in os.listdir(project_path)
+            if not file_id.startswith(".")
+            and os.path.isfile(os.path.join(project_path, file_id))
+            and os.path.splitext(file_id.lower())[-1] in supported_extensions
+        )
+
+    def ingest_project(self, project_id: str, chunk_size: int = 100, overlap_size: int = 20,
+                       batch_size: int = 64, do_reset: bool = False, file_ids: list = None):
+
+        project = {"project_id": project_id}
+        file_ids = file_ids if file_ids is not None else self.list_project_files(project_id=project_id)
+
+        statuses = {
+            file_id: { "file_id": file_id, "status": "pending", "chunks": 0, "indexed": 0, "error": None }
+            for file_id in file_ids
+        }
+
+        if not file_ids:
+            return list(statuses.values())
+
+        if do_reset:
+            _ = self.nlp_controller.reset_vector_db_collection(project=project)
+
+        # Chunks from different files share embedding batches: (file_id, text, metadata, record_id)
+        pending = []
+        stop_error = None
+
+        def flush(size: int):
+            nonlocal pending
+            while pending and len(pending) >= size:
+                batch, pending = pending[:batch_size], pending[batch_size:]
+                is_inserted = self.nlp_controller.index_texts(
+                    project=project,
+                    texts=[ item[1] for item in batch ],
+                    metadata=[ item[2] for item in batch ],
+                    record_ids=[ item[3] for item in batch ],
+                    batch_size=batch_size,
+                )
+                if not is_inserted:
+                    # The batch's files stay short of their chunk count and end up "failed"
+                    raise RuntimeError("vector db insert failed")
+                for item in batch:
+                    statuses[item[0]]["indexed"] += 1
+
+        with ExitStack() as stack:
+            if self.executors is not None:
+                submit = self.executors.submit_cpu
+            else:
+                # Spawned workers avoid forking a parent that already runs client threads
+                mp_context = multiprocessing.get_context("spawn")
+                submit = stack.enter_context(ProcessPoolExecutor(
+                    max_workers=min(self.max_workers, len(file_ids)), mp_context=mp_context
+                )).submit
+
+            futures = [
+                submit(parse_project_file, project_id, file_id, chunk_size, overlap_size)
+                for file_id in file_ids
+            ]
+
+            for future in as_completed(futures):
+                result = future.result()
+                status = statuses[result["file_id"]]
+                status["parse_seconds"] = round(result["parse_seconds"], 4)
+
+                if result["error"] or not result["texts"]:
+                    status["status"] = "failed" if result["error"] else "empty"
+                    status["error"] = result["error"]
+                    continue
+
+                status["chunks"] = len(result["texts"])
+                if stop_error is not None:
+                    continue
+
+                record_ids = self.nlp_controller.get_chunk_ids(
+                    project=project, file_id=result["file_id"], count=len(result["texts"])
+                )
+                pending.extend(zip(
+                    [result["file_id"]] * len(result["texts"]), result["texts"], result["metadata"], record_ids
+                ))
+
+                # Embedding the ready batches overlaps with the workers still parsing
+                try:
+                    flush(size=batch_size)
+                except Exception as e:
+                    self.logger.error(f"Error while indexing project {project_id}: {e}")
+                    stop_error = e
+
+        if stop_error is None:
+            try:
+                flush(size=1)
+            except Exception as e:
+                self.logger.error(f"Error while indexing project {project_id}: {e}")
+                stop_error = e
+
+        for status in statuses.values():
+            if status["status"] != "pending":
+                continue
+            if status["indexed"] == status["chunks"]:
+                status["status"] = "indexed"
+            else:
+                status["status"] = "failed"
+                status["error"] = str(stop_error)
+
+        return list(statuses.values())
@@ -1,11 +1,27 @@
 from .BaseController import BaseController
-from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.llm.LLMEnums import DocumentTypeEnum, OpenAIEnums, CoHereEnums
+from stores.llm.LLMExceptions import ProviderError, ProviderThrottledError
+from stores.llm.RateLimiter import estimate_tokens
+from stores.vectordb.VectorDBEnums import CollectionModeEnums, DistanceMethodEnums
+from models.db_schemes import RetrievedDocument
+from models import RetrievalModeEnum, AnswerPathEnum
+from helpers.mmr import maximal_marginal_relevance
+from helpers.deadline import Deadline, DeadlineExceeded
+from helpers.metrics import (track_stage, BATCH_SIZE, CHUNKS_PROCESSED, LLM_TOKENS,
+                             LLM_ERRORS, CACHE_REQUESTS)
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import List
+import difflib
+import logging
 import json
+import uuid
+import re
 
 
 class NLPController(BaseController):
 
+    TENANT_FIELD = "project_id"
+
     def __init__(self, vectordb_client, generation_client,
                  embedding_client, template_parser):
         super().__init__()
@@ -15,144 +31,678 @@ class NLPController(BaseController):
         self.embedding_client = embedding_client
         self.template_parser = template_parser
 
+        # Why the last generation fell back to the top document: "throttled" / "failed"
+        self.generation_error = None
+        # How the last answer was produced (AnswerPathEnum)
+        self.answer_path = None
+
+        self.logger = logging.getLogger(__name__)
+
+    def get_provider_name(self, client, error: Exception = None):
+        provider = getattr(error, "provider", None)
+        if provider:
+            # Limiter names are "PROVIDER" or "PROVIDER:model"
+            return provider.split(":")[0]
+        client = getattr(client, "primary", None) or client
+        return client.__class__.__name__.replace("Provider", "").upper()
+
+    def count_llm_error(self, client, operation: str, error: Exception):
+        LLM_ERRORS.inc(
+            provider=self.get_provider_name(client, error),
+            operation=operation,
+            error=error.__class__.__name__,
+        )
+
     def create_collection_name(self, project_id: str):
         return f"collection_{project_id}".strip()
-    
-    def reset_vector_db_collection(self, project):
-        collection_name = self.create_collection_name(project_id=project["project_id"])
+
+    def is_shared_collection_mode(self):
+        return self.app_settings.VECTOR_DB_COLLECTION_MODE == CollectionModeEnums.SHARED.value
+
+    def get_collection_scope(self, project_id: str):
+        """(collection_name, filters) holding a project's points in the configured mode"""
+        if self.is_shared_collection_mode():
+            return self.app_settings.VECTOR_DB_SHARED_COLLECTION_NAME, { self.TENANT_FIELD: project_id }
+
+        return self.create_collection_name(project_id=project_id), None
+
+    def get_question_collection_scope(self, project_id: str):
+        """(collection_name, filters) of the project's question-only Q&A vectors"""
+        collection_name, filters = self.get_collection_scope(project_id=project_id)
+        # Prefixed rather than suffixed, so it never looks like a `collection_<project_id>`
+        return f"questions_{collection_name}", filters
+
+    def reset_collection_scope(self, collection_name: str, filters: dict = None):
+        # A shared collection only loses this project's points
+        if filters:
+            return self.vectordb_client.delete_by_filter(collection_name=collection_name, filters=filters)
+
         return self.vectordb_client.delete_collection(collection_name=collection_name)
+
+    def reset_vector_db_collection(self, project):
+        _ = self.reset_collection_scope(*self.get_question_collection_scope(project_id=project["project_id"]))
+
+        return self.reset_collection_scope(*self.get_collection_scope(project_id=project["project_id"]))
     
     def get_vector_db_collection_info(self, project):
-        collection_name = self.create_collection_name(project_id=project["project_id"])
+        collection_name, filters = self.get_collection_scope(project_id=project["project_id"])
         collection_info = self.vectordb_client.get_collection_info(collection_name=collection_name)
 
-        return json.loads(
+        collection_info = json.loads(
             json.dumps(collection_info, default=lambda x: x.__dict__)
         )
+
+        if filters and collection_info is not None:
+            collection_info["project_points_count"] = self.vectordb_client.count_points(
+                collection_name=collection_name, filters=filters
+            )
+
+        return collection_info
     
-    def index_into_vector_db(self, project, chunks: List, chunks_ids: List[int],
-                             do_reset: bool = False, batch_size: int = 64):
-        
-        # step1: get collection name
-        collection_name = self.create_collection_name(project_id=project["project_id"])
+    def get_chunk_ids(self, project, file_id: str, count: int):
+        """Stable point ids: unique across a project's files, identical when a file is re-pushed"""
+        return [
+            str(uuid.uuid5(uuid.NAMESPACE_URL, f"{project['project_id']}/{file_id}/{idx}"))
+            for idx in range(count)
+        ]
 
-        # step2: manage items
+    def get_chunk_payloads(self, chunks: List):
         texts = [ c.page_content for c in chunks ]
-        metadata = [ c.metadata for c in chunks ]
+        # Compact Q&A chunks only store per-record fields plus a file_id in the payload
+        metadata = [
+            c.payload_metadata if hasattr(c, "payload_metadata") else c.metadata
+            for c in chunks
+        ]
+        return texts, metadata
+
+    def index_into_vector_db(self, project, chunks: List, chunks_ids: List,
+                             do_reset: bool = False, batch_size: int = 64):
+
+        texts, metadata = self.get_chunk_payloads(chunks)
+
+        return self.index_texts(
+            project=project,
+            texts=texts,
+            metadata=metadata,
+            record_ids=chunks_ids,
+            do_reset=do_reset,
+            batch_size=batch_size,
+        )
+
+    def embed_documents(self, texts: List[str], batch_size: int = 64,
+                        document_type: str = DocumentTypeEnum.DOCUMENT.value):
         # Embed in batches to respect provider rate limits
         vectors = []
         for i in range(0, len(texts), batch_size):
             batch_texts = texts[i:i+batch_size]
-            # Use provider batch embedding if available
-            if hasattr(self.embedding_client, 'embed_texts'):
-                batch_vectors = self.embedding_client.embed_texts(
-                    texts=batch_texts,
-                    document_type=DocumentTypeEnum.DOCUMENT.value
-                )
-            else:
-                batch_vectors = [
-                    self.embedding_client.embed_text(
-                        text=t, document_type=DocumentTypeEnum.DOCUMENT.value
-                    ) for t in batch_texts
-                ]
+            BATCH_SIZE.observe(len(batch_texts), operation="embed_documents")
+            LLM_TOKENS.inc(estimate_tokens(*batch_texts), operation="embed_documents", direction="input")
+
+            try:
+                with track_stage("embed_documents"):
+                    # Use provider batch embedding if available
+                    if hasattr(self.embedding_client, 'embed_texts'):
+                        batch_vectors = self.embedding_client.embed_texts(
+                            texts=batch_texts,
+                            document_type=document_type
+                        )
+                    else:
+                        batch_vectors = [
+                            self.embedding_client.embed_text(
+                                text=t, document_type=document_type
+                            ) for t in batch_texts
+                        ]
+            except ProviderError as e:
+                self.count_llm_error(self.embedding_client, "embed_documents", e)
+                raise
+
             vectors.extend(batch_vectors)
 
-        # step3: create collection if not exists
+        return vectors
+
+    def index_texts(self, project, texts: List[str], metadata: List[dict], record_ids: List,
+                    do_reset: bool = False, batch_size: int = 64):
+
+        # step1: embed the texts
+        vectors = self.embed_documents(texts=texts, batch_size=batch_size)
+
+        # step2: store them alongside their payloads
+        is_inserted = self.insert_vectors(
+            project=project,
+            texts=texts,
+            vectors=vectors,
+            metadata=metadata,
+            record_ids=record_ids,
+            do_reset=do_reset,
+        )
+
+        # step3: question-only vectors of curated Q&A pairs, for the extractive answer path
+        if is_inserted and self.app_settings.QA_QUESTION_VECTORS_ENABLED:
+            is_inserted = self.index_questions(
+                project=project,
+                metadata=metadata,
+                record_ids=record_ids,
+                batch_size=batch_size,
+            )
+
+        return is_inserted
+
+    def index_questions(self, project, metadata: List[dict], record_ids: List, batch_size: int = 64):
+        pairs = [
+            (record_id, item)
+            for record_id, item in zip(record_ids, metadata)
+            if item and item.get("question") and item.get("answer")
+        ]
+        if not pairs:
+            return True
+
+        questions = [ item["question"] for _, item in pairs ]
+
+        # Stored questions are compared with incoming questions, so both are embedded as queries
+        vectors = self.embed_documents(
+            texts=questions,
+            batch_size=batch_size,
+            document_type=DocumentTypeEnum.QUERY.value,
+        )
+
+        return self.insert_vectors(
+            project=project,
+            texts=questions,
+            vectors=vectors,
+            metadata=[ { "answer": item["answer"], "file_id": item.get("file_id") } for _, item in pairs ],
+            record_ids=[ record_id for record_id, _ in pairs ],
+            scope=self.get_question_collection_scope(project_id=project["project_id"]),
+        )
+
+    def insert_vectors(self, project, texts: List[str], vectors: List, metadata: List[dict],
+                       record_ids: List, do_reset: bool = False, embedding_size: int = None,
+                       batch_size: int = 50, scope: tuple = None):
+        """Store already-embedded texts; no provider is called when `embedding_size` is given.
+
+        `scope` is the (collection_name, filters) to write to, the project's own by default.
+        """
+
+        # step1: get collection name (and the project's partition in shared mode)
+        collection_name, filters = scope or self.get_collection_scope(project_id=project["project_id"])
+
+        # step2: create collection if not exists
+        if do_reset:
+            if scope is None:
+                # Question vectors point at the answers being replaced
+                _ = self.reset_collection_scope(*self.get_question_collection_scope(project_id=project["project_id"]))
+            _ = self.reset_collection_scope(collection_name=collection_name, filters=filters)
+
         _ = self.vectordb_client.create_collection(
             collection_name=collection_name,
-            embedding_size=self.embedding_client.embedding_size,
-            do_reset=do_reset,
+            embedding_size=embedding_size or self.embedding_client.embedding_size,
+            tenant_field=self.TENANT_FIELD if filters else None,
         )
 
-        # step4: insert into vector db
-        _ = self.vectordb_client.insert_many(
+        # step3: insert into vector db
+        is_inserted = self.vectordb_client.insert_many(
             collection_name=collection_name,
             texts=texts,
             metadata=metadata,
             vectors=vectors,
-            record_ids=chunks_ids,
+            record_ids=record_ids,
+            batch_size=batch_size,
+            extra_payload=filters,
         )
 
-        return True
+        CHUNKS_PROCESSED.inc(len(texts), stage="indexed")
+
+        return is_inserted
+
+    def search_vector_db_collection(self, project, text: str, limit: int = 10,
+                                    use_mmr: bool = False, mmr_lambda: float = 0.5,
+                                    mmr_oversample: int = 4, deadline: Deadline = None,
+                                    query_vector: list = None):
 
-    def search_vector_db_collection(self, project, text: str, limit: int = 10):
+        deadline = deadline or Deadline()
 
-        # step1: get collection name
-        collection_name = self.create_collection_name(project_id=project["project_id"])
+        # step1: get collection name (and the project's partition in shared mode)
+        collection_name, filters = self.get_collection_scope(project_id=project["project_id"])
 
-        # step2: get text embedding vector
-        vector = self.embedding_client.embed_text(text=text, 
-                                                 document_type=DocumentTypeEnum.QUERY.value)
+        # step2: get text embedding vector (unless the caller already embedded the query)
+        deadline.check(stage="embedding")
+        vector = query_vector or self.embed_query(text=text, deadline=deadline)
 
         if not vector or len(vector) == 0:
             return False
 
-        # step3: do semantic search
-        results = self.vectordb_client.search_by_vector(
-            collection_name=collection_name,
-            vector=vector,
-            limit=limit
-        )
+        deadline.check(stage="search")
+
+        # step3: do semantic search (over-fetching candidates when diversifying)
+        search_limit = limit * max(int(mmr_oversample), 1) if use_mmr else limit
+        with track_stage("search"):
+            results = self.vectordb_client.search_by_vector(
+                collection_name=collection_name,
+                vector=vector,
+                limit=search_limit,
+                with_vectors=use_mmr,
+                filters=filters,
+            )
 
         if not results:
             return False
 
+        deadline.check(stage="reranking")
+
+        # step4: keep the `limit` most relevant yet mutually diverse candidates
+        if use_mmr:
+            with track_stage("rerank"):
+                results = self.rerank_mmr(
+                    query_vector=vector,
+                    documents=results,
+                    limit=limit,
+                    lambda_mult=mmr_lambda,
+                )
+
         return results
-    
-    def answer_rag_question(self, project, query: str, limit: int = 10):
-        
-        answer, full_prompt, chat_history = None, None, None
 
-        # step1: retrieve related documents
+    def embed_query(self, text: str, deadline: Deadline):
+        LLM_TOKENS.inc(estimate_tokens(text), operation="embed_query", direction="input")
+
+        try:
+            with track_stage("embed"):
+                return self.submit_query_embedding(text=text, deadline=deadline)
+        except ProviderError as e:
+            self.count_llm_error(self.embedding_client, "embed_query", e)
+            raise
+
+    def submit_query_embedding(self, text: str, deadline: Deadline):
+        # The micro-batcher hands out futures, so a query embedding can be abandoned
+        # once the deadline passes instead of holding the request hostage
+        if hasattr(self.embedding_client, "submit") and deadline.remaining() is not None:
+            future = self.embedding_client.submit(text=text, document_type=DocumentTypeEnum.QUERY.value)
+            try:
+                return future.result(timeout=deadline.remaining())
+            except FutureTimeoutError:
+                raise DeadlineExceeded("Request deadline reached during embedding")
+
+        return self.embedding_client.embed_text(text=text,
+                                                document_type=DocumentTypeEnum.QUERY.value)
+
+    def rerank_mmr(self, query_vector: list, documents: List[RetrievedDocument],
+                   limit: int, lambda_mult: float = 0.5):
+
+        candidates = [ doc for doc in documents if doc.vector ]
+        if len(candidates) <= limit:
+            selected_documents = documents[:limit]
+        else:
+            selected_indices = maximal_marginal_relevance(
+                query_vector=query_vector,
+                candidate_vectors=[ doc.vector for doc in candidates ],
+                k=limit,
+                lambda_mult=lambda_mult,
+            )
+            selected_documents = [ candidates[idx] for idx in selected_indices ]
+
+        # Vectors are only needed for reranking, drop them before they travel further
+        for doc in selected_documents:
+            doc.vector = None
+
+        return selected_documents
+
+    def get_provider_roles(self, client):
+        # CoHere expects upper-case roles and names the assistant CHATBOT
+        if client.__class__.__name__ == "CoHereProvider":
+            return CoHereEnums
+        return OpenAIEnums
+
+    def build_chat_history(self, client, system_prompt: str, session: dict = None,
+                           history_turns: int = 0):
+        roles = self.get_provider_roles(client)
+
+        chat_history = [
+            client.construct_prompt(
+                prompt=system_prompt,
+                role=roles.SYSTEM.value,
+            )
+        ]
+
+        # Only the last N turns of the conversation go back to the provider
+        if session and history_turns > 0:
+            chat_history.extend([
+                client.construct_prompt(
+                    prompt=turn["text"],
+                    role=roles.USER.value if turn["role"] == "user" else roles.ASSISTANT.value,
+                )
+                for turn in session["turns"][-history_turns:]
+            ])
+
+        return chat_history
+
+    def retrieve_documents(self, project, query: str, limit: int = 10,
+                           session: dict = None, retrieval_mode: str = None,
+                           search_options: dict = None, deadline: Deadline = None,
+                           query_vector: list = None):
+
+        search_options = { **(search_options or {}), "query_vector": query_vector }
+
+        previous_documents = []
+        if session:
+            previous_documents = [
+                RetrievedDocument(**doc) for doc in session["documents"]
+            ]
+
+        # Follow-ups may change topic, so by default they search again and add what is new
+        retrieval_mode = retrieval_mode or RetrievalModeEnum.EXTEND.value
+
+        # Follow-ups answer from the session's retrieval set without touching the provider
+        if previous_documents and retrieval_mode == RetrievalModeEnum.REUSE.value:
+            CACHE_REQUESTS.inc(cache="session_documents", result="hit")
+            return previous_documents
+
+        CACHE_REQUESTS.inc(cache="session_documents", result="miss")
+
+        if not previous_documents or retrieval_mode == RetrievalModeEnum.REFRESH.value:
+            retrieved_documents = self.search_vector_db_collection(
+                project=project,
+                text=query,
+                limit=limit,
+                deadline=deadline,
+                **search_options,
+            )
+            return retrieved_documents or []
+
+        # Extend: over-fetch by the known set so `limit` unseen documents can be appended
+        known_ids = { doc.id for doc in previous_documents }
         retrieved_documents = self.search_vector_db_collection(
             project=project,
             text=query,
+            limit=limit + len(known_ids),
+            deadline=deadline,
+            **search_options,
+        ) or []
+
+        new_documents = [ doc for doc in retrieved_documents if doc.id not in known_ids ]
+        return previous_documents + new_documents[:limit]
+
+    @staticmethod
+    def get_question_similarity(query: str, question: str):
+        # Case, punctuation and spacing differences do not count against a match
+        def normalize(text: str):
+            return " ".join(re.findall(r"\w+", text.casefold()))
+
+        return difflib.SequenceMatcher(None, normalize(query), normalize(question)).ratio()
+
+    def is_question_vector_search_enabled(self):
+        # Only a cosine score is a similarity that one threshold can be set for
+        distance_method = self.app_settings.VECTOR_DB_DISTANCE_METHOD or DistanceMethodEnums.COSINE.value
+        return (
+            self.app_settings.QA_QUESTION_VECTORS_ENABLED
+            and self.app_settings.QA_FAST_PATH_VECTOR_THRESHOLD > 0
+            and distance_method == DistanceMethodEnums.COSINE.value
+        )
+
+    def find_stored_answer(self, project, query: str, query_vector: list = None,
+                           documents: List[RetrievedDocument] = None):
+        """Stored answer of a curated question matching `query`, or None.
+
+        Given the query vector, searches the question-only vectors and compares the
+        cosine score with QA_FAST_PATH_VECTOR_THRESHOLD; otherwise compares the query
+        text with the question of the top retrieved Q&A pair (QA_FAST_PATH_TEXT_THRESHOLD).
+        """
+        if query_vector is not None:
+            threshold = self.app_settings.QA_FAST_PATH_VECTOR_THRESHOLD
+            collection_name, filters = self.get_question_collection_scope(project_id=project["project_id"])
+            if not self.vectordb_client.is_collection_existed(collection_name):
+                return None
+
+            with track_stage("search"):
+                results = self.vectordb_client.search_by_vector(
+                    collection_name=collection_name,
+                    vector=query_vector,
+                    limit=1,
+                    filters=filters,
+                )
+
+            if results and results[0].score >= threshold and results[0].metadata:
+                return results[0].metadata.get("answer")
+            return None
+
+        threshold = self.app_settings.QA_FAST_PATH_TEXT_THRESHOLD
+        top_metadata = documents[0].metadata if documents else None
+        if not top_metadata or not top_metadata.get("question") or not top_metadata.get("answer"):
+            return None
+
+        if self.get_question_similarity(query, top_metadata["question"]) >= threshold:
+            return top_metadata["answer"]
+        return None
+
+    def remember_turn(self, session: dict, query: str, answer: str,
+                      documents: List[RetrievedDocument] = None):
+        if session is None:
+            return
+
+        session["turns"].extend([
+            { "role": "user", "text": query },
+            { "role": "assistant", "text": answer },
+        ])
+        if documents:
+            session["documents"] = [ doc.dict() for doc in documents ]
+
+    def answer_rag_question(self, project, query: str, limit: int = 10, language: str = None,
+                            session: dict = None, retrieval_mode: str = None,
+                            history_turns: int = 0, search_options: dict = None,
+                            deadline: Deadline = None):
+        
+        answer, full_prompt, chat_history = None, None, None
+        deadline = deadline or Deadline()
+        self.answer_path = AnswerPathEnum.GENERATED.value
+
+        query_vector = None
+
+        # step0: a curated question matching the query answers it without any generation
+        if self.is_question_vector_search_enabled():
+            query_vector = self.embed_query(text=query, deadline=deadline)
+            answer = self.find_stored_answer(project=project, query=query, query_vector=query_vector)
+            CACHE_REQUESTS.inc(cache="qa_answers", result="hit" if answer else "miss")
+            if answer:
+                self.answer_path = AnswerPathEnum.EXTRACTIVE.value
+                self.remember_turn(session=session, query=query, answer=answer)
+                return answer, full_prompt, chat_history
+
+        # step1: retrieve related documents (reusing the session's set when possible)
+        retrieved_documents = self.retrieve_documents(
+            project=project,
+            query=query,
             limit=limit,
+            session=session,
+            retrieval_mode=retrieval_mode,
+            search_options=search_options,
+            deadline=deadline,
+            query_vector=query_vector,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
             return answer, full_prompt, chat_history
-        
+
+        # Text match against the top hit: the only check without question vectors, a cheap second chance with them
+        if self.app_settings.QA_FAST_PATH_TEXT_THRESHOLD > 0:
+            answer = self.find_stored_answer(project=project, query=query, documents=retrieved_documents)
+            CACHE_REQUESTS.inc(cache="qa_answers", result="hit" if answer else "miss")
+            if answer:
+                self.answer_path = AnswerPathEnum.EXTRACTIVE.value
+                self.remember_turn(session=session, query=query, answer=answer, documents=retrieved_documents)
+                return answer, full_prompt, chat_history
+
+        answer, full_prompt, chat_history = self.generate_answer(
+            query=query,
+            retrieved_documents=retrieved_documents,
+            language=language,
+            session=session,
+            history_turns=history_turns,
+            deadline=deadline,
+        )
+
+        # step5: Remember the turn and the retrieval set for follow-up questions
+        self.remember_turn(session=session, query=query, answer=answer, documents=retrieved_documents)
+
+        return answer, full_prompt, chat_history
+
+    def generate_answer(self, query: str, retrieved_documents: List[RetrievedDocument],
+                        language: str = None, session: dict = None, history_turns: int = 0,
+                        deadline: Deadline = None):
+        """Prompt the generation model with the retrieved documents; the top document on failure"""
+
+        answer, full_prompt, chat_history = None, None, None
+
         # step2: Construct LLM prompt
-        system_prompt = self.template_parser.get("rag", "system_prompt")
+        with track_stage("template_render"):
+            system_prompt = self.template_parser.get("rag", "system_prompt", language=language)
 
-        documents_prompts = "\n".join([
-            self.template_parser.get("rag", "document_prompt", {
+            documents_prompts = self.template_parser.render_many("rag", "document_prompt", [
+                {
                     "doc_num": idx + 1,
                     "chunk_text": doc.text,
-            })
-            for idx, doc in enumerate(retrieved_documents)
-        ])
+                }
+                for idx, doc in enumerate(retrieved_documents)
+            ], language=language)
 
-        footer_prompt = self.template_parser.get("rag", "footer_prompt")
+            footer_prompt = self.template_parser.get("rag", "footer_prompt", language=language)
 
-        # step3: Construct Generation Client Prompts
-        # Choose system role string per provider
-        system_role = "system"
-        if self.generation_client.__class__.__name__ == "CoHereProvider":
-            system_role = "SYSTEM"
-
-        chat_history = [
-            self.generation_client.construct_prompt(
-                prompt=system_prompt,
-                role=system_role,
+        # step3: Construct Generation Client Prompts (per backend, roles differ)
+        def build_chat_history(client):
+            return self.build_chat_history(
+                client=client,
+                system_prompt=system_prompt,
+                session=session,
+                history_turns=history_turns,
             )
-        ]
 
-        full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
+        full_prompt = "\n\n".join([ documents_prompts, footer_prompt, query ])
+        LLM_TOKENS.inc(estimate_tokens(system_prompt, full_prompt), operation="generate", direction="input")
 
         # step4: Retrieve the Answer with graceful fallback on provider errors
+        # or as soon as the request deadline is reached
         try:
-            answer = self.generation_client.generate_text(
-                prompt=full_prompt,
-                chat_history=chat_history
-            )
-        except Exception:
+            with track_stage("generate"):
+                if hasattr(self.generation_client, "generate_with_fallbacks"):
+                    answer, chat_history = self.generation_client.generate_with_fallbacks(
+                        prompt=full_prompt,
+                        build_chat_history=build_chat_history,
+                        deadline=deadline,
+                    )
+                else:
+                    chat_history = build_chat_history(self.generation_client)
+                    answer = self.generation_client.generate_text(
+                        prompt=full_prompt,
+                        chat_history=chat_history
+                    )
+        except DeadlineExceeded as e:
+            self.logger.warning(f"{e}, falling back to top document")
+            self.generation_error = "deadline"
             answer = None
+        except ProviderThrottledError as e:
+            self.logger.warning(f"Generation throttled, falling back to top document: {e}")
+            self.count_llm_error(self.generation_client, "generate", e)
+            self.generation_error = "throttled"
+            answer = None
+        except Exception as e:
+            self.logger.error(f"Generation failed, falling back to top document: {e}")
+            self.count_llm_error(self.generation_client, "generate", e)
+            self.generation_error = "failed"
+            answer = None
+
+        if answer:
+            LLM_TOKENS.inc(estimate_tokens(answer), operation="generate", direction="output")
+
+        if chat_history is None:
+            chat_history = build_chat_history(
+                getattr(self.generation_client, "primary", self.generation_client)
+            )
 
         if not answer:
             # Fallback: return the highest-ranked document text as a best-effort answer
             top_doc = retrieved_documents[0]
             answer = top_doc.text
+            self.generation_error = self.generation_error or "failed"
+            self.answer_path = AnswerPathEnum.TOP_DOCUMENT.value
 
         return answer, full_prompt, chat_history
+
+    def search_projects(self, project_ids: List[str], text: str, scatter_gather, limit: int = 10,
+                        shard_timeout: float = None, deadline: Deadline = None):
+        """Search several projects with one query embedding.
+
+        Returns (results, shards): the merged top `limit` as (project_id, document) and one status entry per project (ok / empty / timeout / error).
+        """
+        deadline = deadline or Deadline()
+
+        # step1: embed the query once for every project
+        deadline.check(stage="embedding")
+        vector = self.embed_query(text=text, deadline=deadline)
+        if not vector or len(vector) == 0:
+            return [], []
+
+        # step2: query every project's collection concurrently, each within the shard timeout
+        deadline.check(stage="search")
+        outcomes = scatter_gather.gather(
+            {
+                project_id: (lambda project_id=project_id: self.search_vector_db_collection(
+                    project={ "project_id": project_id },
+                    text=text,
+                    limit=limit,
+                    query_vector=vector,
+                ))
+                for project_id in project_ids
+            },
+            timeout=deadline.bound(shard_timeout or scatter_gather.shard_timeout),
+        )
+
+        shards = [
+            {
+                "project_id": project_id,
+                "status": outcome["status"],
+                "hits": len(outcome["result"] or []),
+                "took_ms": round(outcome["seconds"] * 1000, 2),
+            }
+            for project_id, outcome in outcomes.items()
+        ]
+
+        # step3: merge the per-project rankings on their scores
+        with track_stage("merge"):
+            results = scatter_gather.merge_top_k(
+                { project_id: outcome["result"] for project_id, outcome in outcomes.items() },
+                limit=limit,
+            )
+
+        return results, shards
+
+    def answer_projects_question(self, project_ids: List[str], query: str, scatter_gather,
+                                 limit: int = 10, language: str = None,
+                                 shard_timeout: float = None, deadline: Deadline = None):
+        """Answer from the merged documents of several projects; returns (answer, prompt, history, shards)"""
+        deadline = deadline or Deadline()
+        self.answer_path = AnswerPathEnum.GENERATED.value
+
+        results, shards = self.search_projects(
+            project_ids=project_ids,
+            text=query,
+            scatter_gather=scatter_gather,
+            limit=limit,
+            shard_timeout=shard_timeout,
+            deadline=deadline,
+        )
+
+        retrieved_documents = [ document for _, document in results ]
+        if not retrieved_documents:
+            return None, None, None, shards
+
+        if self.app_settings.QA_FAST_PATH_TEXT_THRESHOLD > 0:
+            answer = self.find_stored_answer(project=None, query=query, documents=retrieved_documents)
+            CACHE_REQUESTS.inc(cache="qa_answers", result="hit" if answer else "miss")
+            if answer:
+                self.answer_path = AnswerPathEnum.EXTRACTIVE.value
+                return answer, None, None, shards
+
+        answer, full_prompt, chat_history = self.generate_answer(
+            query=query,
+            retrieved_documents=retrieved_documents,
+            language=language,
+            deadline=deadline,
+        )
+
+        return answer, full_prompt, chat_history, shards
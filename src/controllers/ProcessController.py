@@ -2,14 +2,46 @@ from .BaseController import BaseController
 from .ProjectController import ProjectController
 import os
 import json
+import base64
 import logging
-from langchain_community.document_loaders import JSONLoader, CSVLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain.schema import Document
+import itertools
+import threading
+from collections import OrderedDict
 from models import ProcessingEnum
+from models.chunks import QAChunk, FileInfo
+from helpers.metrics import track_stage, CHUNKS_PROCESSED
+from helpers.text_splitter import get_text_splitter
+
+def parse_file(project_id: str, file_id: str, chunk_size: int = None, overlap_size: int = 20):
+    """Process-pool worker: load and split one file (see ExecutorManager.submit_cpu)"""
+    return ProcessController(project_id=project_id).process_file(
+        file_id=file_id,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+    )
+
+
+def parse_file_page(project_id: str, file_id: str, page_size: int, chunk_size: int = None, overlap_size: int = 20,
+                    offset: int = 0, record: int = None, skip: int = 0):
+    """Process-pool worker: one page of a file's chunks and the next position (see get_chunks_page)"""
+    return ProcessController(project_id=project_id).get_chunks_page(
+        file_id=file_id,
+        page_size=page_size,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+        offset=offset,
+        record=record,
+        skip=skip,
+    )
+
 
 class ProcessController(BaseController):
 
+    # Parsed JSON records of recently paged files, keyed by (path, mtime, size): shared by every
+    # instance of a process, so paging through a file parses it once rather than once per page
+    json_records_cache = OrderedDict()
+    json_records_lock = threading.Lock()
+
     def __init__(self, project_id: str):
         super().__init__()
         self.project_id = project_id
@@ -31,6 +63,8 @@ class ProcessController(BaseController):
         if file_ext == ProcessingEnum.JSON.value:
             return self.load_custom_json(file_path)
         elif file_ext == ProcessingEnum.CSV.value:
+            # langchain_community is slow to import, so only CSV processing pays for it
+            from langchain_community.document_loaders import CSVLoader
             return CSVLoader(file_path, encoding="utf-8")
         else:
             raise ValueError(f"Unsupported file extension: {file_ext}")
@@ -41,44 +75,92 @@ class ProcessController(BaseController):
             with open(file_path, 'r', encoding='utf-8') as file:
                 data = json.load(file)
             
-            documents = []
-            
             # Extract data array from JSON structure
             qa_data = data.get('data', [])
             dataset_info = data.get('dataset_info', {})
-            
-            for item in qa_data:
-                # Create content combining question and answer
-                content = f"Question: {item.get('question', '')}\nAnswer: {item.get('answer', '')}"
-                
-                # Create metadata for each Q&A pair
-                metadata = {
-                    'language': item.get('language', 'unknown'),
-                    'category': item.get('category', 'unknown'),
-                    'keywords': item.get('keywords', []),
-                    'source': item.get('source', 'unknown'),
-                    'file_path': file_path,
-                    'dataset_total_samples': dataset_info.get('total_samples', 0),
-                    'dataset_languages': dataset_info.get('languages', [])
-                }
-                
-                # Create Document object
-                doc = Document(page_content=content, metadata=metadata)
-                documents.append(doc)
-            
-            return documents
+
+            # File- and dataset-level metadata is kept once per file instead of being copied
+            # into every Q&A pair; indexing stores it in a sidecar (save_chunks_file_metadata)
+            file_id = os.path.basename(file_path)
+            file_info = FileInfo(file_id=file_id, metadata={
+                'file_path': file_path,
+                'dataset_total_samples': dataset_info.get('total_samples', 0),
+                'dataset_languages': dataset_info.get('languages', [])
+            })
+
+            # One compact record per Q&A pair; page_content/metadata are built on access
+            return [
+                QAChunk(
+                    question=item.get('question', ''),
+                    answer=item.get('answer', ''),
+                    language=item.get('language', 'unknown'),
+                    category=item.get('category', 'unknown'),
+                    keywords=item.get('keywords', []),
+                    source=item.get('source', 'unknown'),
+                    file_info=file_info,
+                )
+                for item in qa_data
+            ]
             
         except Exception as e:
             logging.error(f"Failed to load custom JSON file {file_path}: {str(e)}")
             raise
 
+    def get_file_metadata_path(self, file_id: str, create: bool = False):
+        metadata_dir = os.path.join(self.project_path, ".meta")
+        if create and not os.path.exists(metadata_dir):
+            os.makedirs(metadata_dir)
+
+        return os.path.join(metadata_dir, f"{os.path.basename(file_id)}.json")
+
+    def save_file_metadata(self, file_id: str, metadata: dict):
+        metadata_path = self.get_file_metadata_path(file_id=file_id, create=True)
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+
+    def save_chunks_file_metadata(self, chunks: list):
+        """Write the sidecar of every file the chunks share a FileInfo with; called when indexing"""
+        file_infos = {}
+        for chunk in chunks:
+            file_info = getattr(chunk, "file_info", None)
+            if file_info is not None:
+                file_infos[file_info.file_id] = file_info
+
+        for file_info in file_infos.values():
+            self.save_file_metadata(file_id=file_info.file_id, metadata=file_info.metadata)
+
+    def get_file_metadata(self, file_id: str):
+        """File-level metadata to join back onto records whose payload only carries file_id"""
+        metadata_path = self.get_file_metadata_path(file_id=file_id)
+        if not os.path.exists(metadata_path):
+            return {}
+
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def join_file_metadata(self, metadata_list: list):
+        """Payload metadata with the file-level fields of its file_id merged in (each sidecar read once)"""
+        file_metadata = {}
+        joined = []
+        for metadata in metadata_list:
+            file_id = (metadata or {}).get("file_id")
+            if not file_id:
+                joined.append(metadata)
+                continue
+
+            if file_id not in file_metadata:
+                file_metadata[file_id] = self.get_file_metadata(file_id=file_id)
+            joined.append({ **file_metadata[file_id], **metadata })
+
+        return joined
+
     def get_file_content(self, file_id: str):
         """Load and return file content using appropriate loader"""
         try:
             file_ext = self.get_file_extension(file_id=file_id)
             
             if file_ext == ProcessingEnum.JSON.value:
-                # For JSON, we already return Document objects from our custom loader
+                # For JSON, the custom loader already returns compact QAChunk records
                 return self.get_file_loader(file_id)
             else:
                 # For CSV and other formats, use standard loaders
@@ -111,19 +193,15 @@ class ProcessController(BaseController):
             # For Q&A JSON data, return as-is (each Q&A pair is already a good chunk)
             return file_content
         else:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size,
-                chunk_overlap=overlap_size,
-                length_function=len,
-            )
+            text_splitter = self.get_text_splitter(chunk_size=chunk_size, overlap_size=overlap_size)
 
             try:
                 # Extract text content and metadata
                 file_content_texts = [rec.page_content for rec in file_content]
                 file_content_metadata = [rec.metadata for rec in file_content]
 
-                # Create chunks
-                chunks = text_splitter.create_documents(
+                # Chunks are spans over the record texts and share their metadata
+                chunks = text_splitter.create_chunks(
                     file_content_texts,
                     metadatas=file_content_metadata
                 )
@@ -134,19 +212,130 @@ class ProcessController(BaseController):
                 logging.error(f"Failed to process file content for {file_id}: {str(e)}")
                 raise
 
+    def get_text_splitter(self, chunk_size: int, overlap_size: int):
+        return get_text_splitter(chunk_size=chunk_size, chunk_overlap=overlap_size)
+
+    def get_json_records(self, file_id: str):
+        """QAChunk records of a JSON file, parsed once per file version (PROCESS_CACHED_FILES)"""
+        file_path = os.path.join(self.project_path, file_id)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        stat = os.stat(file_path)
+        cache_key = (file_path, stat.st_mtime_ns, stat.st_size)
+        max_files = self.app_settings.PROCESS_CACHED_FILES
+
+        with self.json_records_lock:
+            records = self.json_records_cache.get(cache_key)
+            if records is not None:
+                self.json_records_cache.move_to_end(cache_key)
+                return records
+
+        records = self.load_custom_json(file_path)
+
+        if max_files > 0:
+            with self.json_records_lock:
+                self.json_records_cache[cache_key] = records
+                while len(self.json_records_cache) > max_files:
+                    self.json_records_cache.popitem(last=False)
+
+        return records
+
+    def iter_positioned_chunks(self, file_id: str, chunk_size: int = None, overlap_size: int = 20,
+                               record: int = 0, skip: int = 0):
+        """Same chunks as process_file as (record_index, index_in_record, chunk), from a position.
+
+        Starting at `record` (after its first `skip` chunks) skips earlier records
+        without splitting them. The file is opened eagerly, so missing or unsupported
+        files raise here rather than halfway through a streamed response.
+        """
+        if chunk_size is None:
+            chunk_size = self.app_settings.FILE_DEFAULT_CHUNK_SIZE
+
+        if self.get_file_extension(file_id=file_id) == ProcessingEnum.JSON.value:
+            # The custom JSON loader already returns one QAChunk per Q&A pair
+            records = self.get_json_records(file_id)
+            start = record + (1 if skip else 0)
+            return ((index, 0, records[index]) for index in range(start, len(records)))
+
+        loader = self.get_file_loader(file_id)
+        text_splitter = self.get_text_splitter(chunk_size=chunk_size, overlap_size=overlap_size)
+
+        def generate_chunks():
+            for record_index, source in enumerate(itertools.islice(loader.lazy_load(), record, None), start=record):
+                chunks = text_splitter.iter_chunks([source.page_content], metadatas=[source.metadata])
+                if record_index == record and skip:
+                    chunks = itertools.islice(chunks, skip, None)
+                    for chunk_index, chunk in enumerate(chunks, start=skip):
+                        yield record_index, chunk_index, chunk
+                    continue
+                for chunk_index, chunk in enumerate(chunks):
+                    yield record_index, chunk_index, chunk
+
+        return generate_chunks()
+
+    def get_chunks_page(self, file_id: str, page_size: int, chunk_size: int = None, overlap_size: int = 20,
+                        offset: int = 0, record: int = None, skip: int = 0):
+        """One page of chunks plus the position of the next page (None after the last one)"""
+        if record is None:
+            # Cursors issued before positions were recorded: count chunks from the start
+            positioned = itertools.islice(
+                self.iter_positioned_chunks(file_id=file_id, chunk_size=chunk_size, overlap_size=overlap_size),
+                offset, None
+            )
+        else:
+            positioned = self.iter_positioned_chunks(
+                file_id=file_id, chunk_size=chunk_size, overlap_size=overlap_size, record=record, skip=skip
+            )
+
+        items = list(itertools.islice(positioned, page_size + 1))
+
+        next_position = None
+        if len(items) > page_size:
+            next_record, next_skip, _ = items[page_size]
+            next_position = { "offset": offset + page_size, "record": next_record, "skip": next_skip }
+            items = items[:page_size]
+
+        return [ chunk for _, _, chunk in items ], next_position
+
+    def encode_cursor(self, file_id: str, offset: int, record: int = None, skip: int = 0):
+        # `offset` numbers the chunks; `record`/`skip` let the next page resume without re-splitting
+        payload = json.dumps({ "file_id": file_id, "offset": offset, "record": record, "skip": skip }).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii")
+
+    def decode_cursor(self, cursor: str, file_id: str):
+        """Return the position (offset, record, skip) of a cursor issued for this file, or None if invalid"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            offset = int(payload["offset"])
+            record = payload.get("record")
+            record = int(record) if record is not None else None
+            skip = int(payload.get("skip") or 0)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+        if payload.get("file_id") != file_id or offset < 0 or skip < 0 or (record is not None and record < 0):
+            return None
+
+        return { "offset": offset, "record": record, "skip": skip }
+
     def process_file(self, file_id: str, chunk_size: int = None, overlap_size: int = 20):
         """Complete pipeline: load file content and process it into chunks"""
         try:
             # Load file content
-            file_content = self.get_file_content(file_id)
+            with track_stage("load"):
+                file_content = self.get_file_content(file_id)
             
             # Process into chunks
-            chunks = self.process_file_content(
-                file_content=file_content,
-                file_id=file_id,
-                chunk_size=chunk_size,
-                overlap_size=overlap_size
-            )
+            with track_stage("split"):
+                chunks = self.process_file_content(
+                    file_content=file_content,
+                    file_id=file_id,
+                    chunk_size=chunk_size,
+                    overlap_size=overlap_size
+                )
+
+            CHUNKS_PROCESSED.inc(len(chunks), stage="split")
             
             return chunks
             
@@ -167,7 +356,7 @@ class ProcessController(BaseController):
             if language:
                 filtered_content = [
                     doc for doc in content 
-                    if doc.metadata.get('language') == language
+                    if doc.language == language
                 ]
                 return filtered_content
             
@@ -190,7 +379,7 @@ class ProcessController(BaseController):
             if category:
                 filtered_content = [
                     doc for doc in content 
-                    if doc.metadata.get('category') == category
+                    if doc.category == category
                 ]
                 return filtered_content
             
@@ -0,0 +1,85 @@
+from .BaseController import BaseController
+import os
+import re
+import json
+import time
+
+
+class ProfileController(BaseController):
+
+    PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}_[a-z0-9]{6}$")
+
+    # kind -> file suffix
+    PROFILE_FILES = {
+        "summary": ".json",
+        "collapsed": ".collapsed.txt",
+        "allocations": ".allocations.txt",
+    }
+
+    def __init__(self, max_profiles: int = 50):
+        super().__init__()
+        self.max_profiles = max_profiles
+        self.profiles_dir = os.path.join(
+            self.base_dir,
+            "assets/profiles"
+        )
+
+    def get_profiles_path(self):
+        if not os.path.exists(self.profiles_dir):
+            os.makedirs(self.profiles_dir)
+
+        return self.profiles_dir
+
+    def generate_profile_id(self):
+        return time.strftime("%Y%m%dT%H%M%S") + "_" + self.generate_random_string(length=6)
+
+    def get_profile_file_path(self, profile_id: str, kind: str):
+        # Profile ids end up in file paths, so anything but the generated shape is rejected
+        if kind not in self.PROFILE_FILES or not self.PROFILE_ID_PATTERN.match(profile_id):
+            return None
+
+        file_path = os.path.join(self.get_profiles_path(), profile_id + self.PROFILE_FILES[kind])
+        if not os.path.exists(file_path):
+            return None
+
+        return file_path
+
+    def save_profile(self, profile_id: str, summary: dict, collapsed: str, allocations: str):
+        profiles_path = self.get_profiles_path()
+        contents = {
+            "summary": json.dumps({ "profile_id": profile_id, "created_at": int(time.time()), **summary }, indent=2),
+            "collapsed": collapsed,
+            "allocations": allocations,
+        }
+
+        for kind, content in contents.items():
+            with open(os.path.join(profiles_path, profile_id + self.PROFILE_FILES[kind]), "w", encoding="utf-8") as f:
+                f.write(content)
+
+        self.prune_profiles()
+
+    def list_profiles(self):
+        summaries = []
+        for file_name in sorted(os.listdir(self.get_profiles_path()), reverse=True):
+            if not file_name.endswith(self.PROFILE_FILES["summary"]):
+                continue
+            try:
+                with open(os.path.join(self.profiles_dir, file_name), "r", encoding="utf-8") as f:
+                    summaries.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+
+        return summaries
+
+    def prune_profiles(self):
+        # Only the newest `max_profiles` profiles are kept on disk
+        profile_ids = sorted({
+            file_name.split(".")[0] for file_name in os.listdir(self.get_profiles_path())
+            if self.PROFILE_ID_PATTERN.match(file_name.split(".")[0])
+        }, reverse=True)
+
+        for profile_id in profile_ids[self.max_profiles:]:
+            for suffix in self.PROFILE_FILES.values():
+                file_path = os.path.join(self.profiles_dir, profile_id + suffix)
+                if os.path.exists(file_path):
+                    os.remove(file_path)
@@ -0,0 +1,361 @@
+from .BaseController import BaseController
+from models import ResponseSignal
+import numpy as np
+import hashlib
+import shutil
+import orjson
+import uuid
+import gzip
+import time
+import json
+import os
+import re
+
+
+class SnapshotController(BaseController):
+    """Project index snapshots under `assets/snapshots/<project_id>/<snapshot_id>/`.
+
+    `vectors.npy` holds the float32 vectors (memory-mappable), `payloads.jsonl.gz`
+    one `{id, text, metadata}` line per vector in the same order, and
+    `manifest.json` the embedding model, size and file checksums. Question-only
+    Q&A vectors, when the project has them, are stored the same way in
+    `question_vectors.npy` and `question_payloads.jsonl.gz`.
+    """
+
+    SNAPSHOT_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}_[a-z0-9]{6}$")
+    FORMAT_VERSION = 1
+
+    VECTORS_FILE = "vectors.npy"
+    PAYLOADS_FILE = "payloads.jsonl.gz"
+    MANIFEST_FILE = "manifest.json"
+    QUESTION_VECTORS_FILE = "question_vectors.npy"
+    QUESTION_PAYLOADS_FILE = "question_payloads.jsonl.gz"
+
+    def __init__(self, nlp_controller, max_snapshots: int = None):
+        super().__init__()
+        self.nlp_controller = nlp_controller
+        self.max_snapshots = max_snapshots or self.app_settings.SNAPSHOT_MAX_PER_PROJECT
+        self.snapshots_dir = os.path.join(
+            self.base_dir,
+            "assets/snapshots"
+        )
+
+    def get_project_snapshots_path(self, project_id: str):
+        project_snapshots_path = os.path.join(self.snapshots_dir, project_id)
+        if not os.path.exists(project_snapshots_path):
+            os.makedirs(project_snapshots_path)
+
+        return project_snapshots_path
+
+    def get_snapshot_path(self, project_id: str, snapshot_id: str):
+        # Snapshot ids end up in file paths, so anything but the generated shape is rejected
+        if not self.SNAPSHOT_ID_PATTERN.match(snapshot_id or ""):
+            return None
+
+        snapshot_path = os.path.join(self.get_project_snapshots_path(project_id), snapshot_id)
+        if not os.path.exists(os.path.join(snapshot_path, self.MANIFEST_FILE)):
+            return None
+
+        return snapshot_path
+
+    def get_snapshot_file_path(self, project_id: str, snapshot_id: str, file_name: str):
+        if file_name not in (self.VECTORS_FILE, self.PAYLOADS_FILE, self.MANIFEST_FILE,
+                             self.QUESTION_VECTORS_FILE, self.QUESTION_PAYLOADS_FILE):
+            return None
+
+        snapshot_path = self.get_snapshot_path(project_id=project_id, snapshot_id=snapshot_id)
+        return os.path.join(snapshot_path, file_name) if snapshot_path else None
+
+    def get_manifest(self, snapshot_path: str):
+        with open(os.path.join(snapshot_path, self.MANIFEST_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def list_snapshots(self, project_id: str):
+        project_snapshots_path = self.get_project_snapshots_path(project_id)
+        manifests = []
+        for snapshot_id in sorted(os.listdir(project_snapshots_path), reverse=True):
+            snapshot_path = self.get_snapshot_path(project_id=project_id, snapshot_id=snapshot_id)
+            if snapshot_path:
+                manifests.append(self.get_manifest(snapshot_path))
+
+        return manifests
+
+    def prune_snapshots(self, project_id: str):
+        project_snapshots_path = self.get_project_snapshots_path(project_id)
+        snapshot_ids = sorted(
+            snapshot_id for snapshot_id in os.listdir(project_snapshots_path)
+            if self.SNAPSHOT_ID_PATTERN.match(snapshot_id)
+        )
+        for snapshot_id in snapshot_ids[:-self.max_snapshots]:
+            shutil.rmtree(os.path.join(project_snapshots_path, snapshot_id), ignore_errors=True)
+
+    @staticmethod
+    def hash_file(file_path: str, chunk_size: int = 1048576):
+        hasher = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def write_points(self, collection_name: str, filters: dict, points_count: int,
+                     vectors_path: str, payloads_path: str, batch_size: int = 1024):
+        """Stream up to `points_count` points into a vectors/payloads file pair; returns (written, embedding_size)"""
+        vectordb_client = self.nlp_controller.vectordb_client
+
+        vectors, written = None, 0
+        with gzip.open(payloads_path, "wb", compresslevel=5) as payloads_file:
+            for batch in vectordb_client.iterate_points(
+                collection_name=collection_name, batch_size=batch_size, filters=filters
+            ):
+                # Points inserted while exporting are left for the next snapshot
+                batch = batch[:points_count - written]
+                if not batch:
+                    break
+
+                batch_vectors = np.asarray([ vector for _, vector, _ in batch ], dtype=np.float32)
+                if vectors is None:
+                    vectors = np.lib.format.open_memmap(
+                        vectors_path, mode="w+", dtype=np.float32,
+                        shape=(points_count, batch_vectors.shape[1]),
+                    )
+                vectors[written:written + len(batch)] = batch_vectors
+
+                payloads_file.write(b"".join(
+                    orjson.dumps({
+                        "id": record_id,
+                        "text": payload.get("text"),
+                        "metadata": payload.get("metadata"),
+                    }) + b"\n"
+                    for record_id, _, payload in batch
+                ))
+                written += len(batch)
+
+        if vectors is None:
+            return 0, None
+
+        embedding_size = vectors.shape[1]
+        vectors.flush()
+        if written < points_count:
+            # Points deleted while exporting: shrink the file to the rows actually written
+            rows = np.array(vectors[:written])
+            del vectors
+            np.save(vectors_path, rows)
+        else:
+            del vectors
+
+        return written, int(embedding_size)
+
+    def count_question_points(self, project_id: str):
+        vectordb_client = self.nlp_controller.vectordb_client
+        collection_name, filters = self.nlp_controller.get_question_collection_scope(project_id=project_id)
+        if not vectordb_client.is_collection_existed(collection_name):
+            return 0
+        return vectordb_client.count_points(collection_name=collection_name, filters=filters)
+
+    def export_snapshot(self, project_id: str, batch_size: int = 1024):
+        """Write the project's points to a new snapshot; returns its manifest, or None if empty"""
+
+        vectordb_client = self.nlp_controller.vectordb_client
+        collection_name, filters = self.nlp_controller.get_collection_scope(project_id=project_id)
+
+        points_count = vectordb_client.count_points(collection_name=collection_name, filters=filters)
+        if not points_count:
+            return None
+
+        snapshot_id = time.strftime("%Y%m%dT%H%M%S") + "_" + self.generate_random_string(length=6)
+        # Written under a hidden name and renamed, so a half-written snapshot is never listed
+        tmp_path = os.path.join(self.get_project_snapshots_path(project_id), f".{snapshot_id}")
+        os.makedirs(tmp_path)
+
+        vectors_path = os.path.join(tmp_path, self.VECTORS_FILE)
+        payloads_path = os.path.join(tmp_path, self.PAYLOADS_FILE)
+
+        try:
+            written, embedding_size = self.write_points(
+                collection_name=collection_name, filters=filters, points_count=points_count,
+                vectors_path=vectors_path, payloads_path=payloads_path, batch_size=batch_size,
+            )
+            if not written:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                return None
+
+            files = {
+                self.VECTORS_FILE: self.hash_file(vectors_path),
+                self.PAYLOADS_FILE: self.hash_file(payloads_path),
+            }
+
+            # The extractive answer path searches these, so a restored project keeps it
+            question_written = 0
+            question_points_count = self.count_question_points(project_id=project_id)
+            if question_points_count:
+                question_vectors_path = os.path.join(tmp_path, self.QUESTION_VECTORS_FILE)
+                question_payloads_path = os.path.join(tmp_path, self.QUESTION_PAYLOADS_FILE)
+                question_written, _ = self.write_points(
+                    *self.nlp_controller.get_question_collection_scope(project_id=project_id),
+                    points_count=question_points_count,
+                    vectors_path=question_vectors_path,
+                    payloads_path=question_payloads_path,
+                    batch_size=batch_size,
+                )
+                if question_written:
+                    files[self.QUESTION_VECTORS_FILE] = self.hash_file(question_vectors_path)
+                    files[self.QUESTION_PAYLOADS_FILE] = self.hash_file(question_payloads_path)
+
+            manifest = {
+                "snapshot_id": snapshot_id,
+                "project_id": project_id,
+                "format_version": self.FORMAT_VERSION,
+                "created_at": int(time.time()),
+                "points_count": written,
+                "question_points_count": question_written,
+                "embedding_backend": self.app_settings.EMBEDDING_BACKEND,
+                "embedding_model_id": self.app_settings.EMBEDDING_MODEL_ID,
+                "embedding_size": embedding_size,
+                "embedding_type": self.app_settings.EMBEDDING_TYPE,
+                "distance_method": self.app_settings.VECTOR_DB_DISTANCE_METHOD,
+                "files": files,
+            }
+            with open(os.path.join(tmp_path, self.MANIFEST_FILE), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+
+            os.replace(tmp_path, os.path.join(os.path.dirname(tmp_path), snapshot_id))
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        self.prune_snapshots(project_id=project_id)
+
+        return manifest
+
+    def check_compatibility(self, manifest: dict):
+        # Vectors from another model would be searched with incompatible query embeddings
+        if manifest.get("format_version") != self.FORMAT_VERSION:
+            return False
+        return (
+            manifest.get("embedding_model_id") == self.app_settings.EMBEDDING_MODEL_ID
+            and manifest.get("embedding_size") == self.app_settings.EMBEDDING_MODEL_SIZE
+            and manifest.get("embedding_type", "float") == self.app_settings.EMBEDDING_TYPE
+        )
+
+    def verify_snapshot(self, snapshot_path: str, manifest: dict):
+        return all(
+            self.hash_file(os.path.join(snapshot_path, file_name)) == file_hash
+            for file_name, file_hash in manifest["files"].items()
+        )
+
+    def iter_payloads(self, snapshot_path: str, file_name: str = None):
+        with gzip.open(os.path.join(snapshot_path, file_name or self.PAYLOADS_FILE), "rb") as payloads_file:
+            for line in payloads_file:
+                yield orjson.loads(line)
+
+    def import_snapshot(self, project_id: str, snapshot_path: str, do_reset: bool = False,
+                        batch_size: int = 256, force: bool = False, verify: bool = True):
+        """Bulk-load a snapshot into `project_id` without calling any embedding provider.
+
+        Only snapshots without question vectors, imported with QA_QUESTION_VECTORS_ENABLED,
+        embed the questions again. Returns (signal, imported_count).
+        """
+        manifest = self.get_manifest(snapshot_path)
+
+        if not force and not self.check_compatibility(manifest):
+            return ResponseSignal.SNAPSHOT_INCOMPATIBLE.value, 0
+
+        if verify and not self.verify_snapshot(snapshot_path, manifest):
+            return ResponseSignal.SNAPSHOT_CORRUPTED.value, 0
+
+        # Ids of another project's snapshot would collide with that project's own points
+        remap_ids = manifest["project_id"] != project_id
+
+        def get_record_id(record_id):
+            if not remap_ids:
+                return record_id
+            return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{project_id}/{record_id}"))
+
+        project = { "project_id": project_id }
+
+        signal, imported = self.load_points(
+            project=project, snapshot_path=snapshot_path, manifest=manifest,
+            vectors_file=self.VECTORS_FILE, payloads_file=self.PAYLOADS_FILE,
+            get_record_id=get_record_id, do_reset=do_reset, batch_size=batch_size,
+        )
+        if signal is not None:
+            return signal, imported
+
+        # Question-only vectors share their answer's point id, so they are remapped the same way
+        if self.QUESTION_VECTORS_FILE in manifest["files"]:
+            signal, _ = self.load_points(
+                project=project, snapshot_path=snapshot_path, manifest=manifest,
+                vectors_file=self.QUESTION_VECTORS_FILE, payloads_file=self.QUESTION_PAYLOADS_FILE,
+                get_record_id=get_record_id, batch_size=batch_size,
+                scope=self.nlp_controller.get_question_collection_scope(project_id=project_id),
+            )
+        elif self.app_settings.QA_QUESTION_VECTORS_ENABLED:
+            # Older snapshots have none: rebuild them from the stored question/answer metadata
+            signal = self.rebuild_questions(
+                project=project, snapshot_path=snapshot_path,
+                get_record_id=get_record_id, batch_size=batch_size,
+            )
+        if signal is not None:
+            return signal, imported
+
+        return ResponseSignal.SNAPSHOT_IMPORTED.value, imported
+
+    def load_points(self, project: dict, snapshot_path: str, manifest: dict, vectors_file: str,
+                    payloads_file: str, get_record_id, do_reset: bool = False,
+                    batch_size: int = 256, scope: tuple = None):
+        """Insert one vectors/payloads file pair; returns (error signal or None, imported_count)"""
+        vectors = np.load(os.path.join(snapshot_path, vectors_file), mmap_mode="r")
+
+        imported, batch = 0, []
+
+        def flush():
+            nonlocal imported, batch
+            is_inserted = self.nlp_controller.insert_vectors(
+                project=project,
+                texts=[ item["text"] for item in batch ],
+                vectors=vectors[imported:imported + len(batch)],
+                metadata=[ item["metadata"] for item in batch ],
+                record_ids=[ get_record_id(item["id"]) for item in batch ],
+                do_reset=do_reset and imported == 0,
+                embedding_size=manifest["embedding_size"],
+                batch_size=batch_size,
+                scope=scope,
+            )
+            imported += len(batch)
+            batch = []
+            return is_inserted
+
+        for item in self.iter_payloads(snapshot_path, file_name=payloads_file):
+            batch.append(item)
+            if len(batch) >= batch_size and not flush():
+                return ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value, imported
+
+        if batch and not flush():
+            return ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value, imported
+
+        return None, imported
+
+    def rebuild_questions(self, project: dict, snapshot_path: str, get_record_id, batch_size: int = 256):
+        """Embed the questions of imported Q&A points again; returns an error signal or None"""
+        batch = []
+
+        def flush():
+            nonlocal batch
+            is_inserted = self.nlp_controller.index_questions(
+                project=project,
+                metadata=[ item["metadata"] for item in batch ],
+                record_ids=[ get_record_id(item["id"]) for item in batch ],
+                batch_size=batch_size,
+            )
+            batch = []
+            return is_inserted
+
+        for item in self.iter_payloads(snapshot_path):
+            batch.append(item)
+            if len(batch) >= batch_size and not flush():
+                return ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
+
+        if batch and not flush():
+            return ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
+
+        return None
@@ -0,0 +1,182 @@
+from .DataController import DataController
+from .ProjectController import ProjectController
+from models import ResponseSignal
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+
+
+class UploadController(DataController):
+    """Resumable uploads: parts are staged under `<project>/.uploads/<upload_id>/`
+    and assembled into a regular project file once every part has arrived."""
+
+    UPLOAD_ID_PATTERN = re.compile(r"^[a-z0-9]{24}$")
+
+    def __init__(self):
+        super().__init__()
+        self.uploads_dir_name = ".uploads"
+        self.manifest_name = "manifest.json"
+
+    def get_uploads_path(self, project_id: str):
+        project_path = ProjectController().get_project_path(project_id=project_id)
+        uploads_path = os.path.join(project_path, self.uploads_dir_name)
+
+        if not os.path.exists(uploads_path):
+            os.makedirs(uploads_path)
+
+        return uploads_path
+
+    def get_upload_path(self, project_id: str, upload_id: str):
+        # Upload ids end up in file paths, so anything but the generated shape is rejected
+        if not self.UPLOAD_ID_PATTERN.match(upload_id or ""):
+            return None
+
+        upload_path = os.path.join(self.get_uploads_path(project_id=project_id), upload_id)
+        if not os.path.exists(os.path.join(upload_path, self.manifest_name)):
+            return None
+
+        return upload_path
+
+    def get_part_path(self, upload_path: str, part_number: int):
+        return os.path.join(upload_path, f"part_{part_number:06d}")
+
+    def validate_upload_request(self, content_type: str, file_size: int):
+
+        if content_type not in self.app_settings.FILE_ALLOWED_TYPES:
+            return False, ResponseSignal.FILE_TYPE_NOT_SUPPORTED.value
+
+        if file_size <= 0 or file_size > self.app_settings.FILE_MAX_SIZE * self.size_scale:
+            return False, ResponseSignal.FILE_SIZE_EXCEEDED.value
+
+        return True, ResponseSignal.FILE_VALIDATED_SUCCESS.value
+
+    def get_part_size(self, file_size: int, part_size: int = None):
+        return min(part_size or self.app_settings.FILE_UPLOAD_PART_SIZE, file_size)
+
+    def validate_part_size(self, file_size: int, part_size: int = None):
+        # Tiny parts would leave one file per few bytes on disk
+        min_part_size = min(self.app_settings.FILE_UPLOAD_MIN_PART_SIZE, file_size)
+        if part_size is not None and part_size < min_part_size:
+            return False, ResponseSignal.UPLOAD_PART_SIZE_INVALID.value
+
+        part_size = self.get_part_size(file_size=file_size, part_size=part_size)
+        if -(-file_size // part_size) > self.app_settings.FILE_UPLOAD_MAX_PARTS:
+            return False, ResponseSignal.UPLOAD_PART_SIZE_INVALID.value
+
+        return True, ResponseSignal.FILE_VALIDATED_SUCCESS.value
+
+    def create_upload(self, project_id: str, file_name: str, content_type: str,
+                      file_size: int, file_hash: str = None, part_size: int = None):
+
+        self.prune_expired_uploads(project_id=project_id)
+
+        part_size = self.get_part_size(file_size=file_size, part_size=part_size)
+        uploads_path = self.get_uploads_path(project_id=project_id)
+
+        upload_id = self.generate_random_string(length=24)
+        while os.path.exists(os.path.join(uploads_path, upload_id)):
+            upload_id = self.generate_random_string(length=24)
+
+        manifest = {
+            "upload_id": upload_id,
+            "file_name": self.get_clean_file_name(orig_file_name=file_name),
+            "content_type": content_type,
+            "file_size": file_size,
+            "sha256": file_hash.lower() if file_hash else None,
+            "part_size": part_size,
+            "total_parts": -(-file_size // part_size),
+            "created_at": int(time.time()),
+        }
+
+        upload_path = os.path.join(uploads_path, upload_id)
+        os.makedirs(upload_path)
+        with open(os.path.join(upload_path, self.manifest_name), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        return manifest
+
+    def get_manifest(self, upload_path: str):
+        with open(os.path.join(upload_path, self.manifest_name), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def get_expected_part_size(self, manifest: dict, part_number: int):
+        if part_number < 1 or part_number > manifest["total_parts"]:
+            return None
+
+        if part_number < manifest["total_parts"]:
+            return manifest["part_size"]
+
+        return manifest["file_size"] - manifest["part_size"] * (manifest["total_parts"] - 1)
+
+    def list_received_parts(self, upload_path: str):
+        return sorted(
+            int(name.split("_")[1]) for name in os.listdir(upload_path)
+            if name.startswith("part_") and not name.endswith(".tmp")
+        )
+
+    def get_upload_status(self, upload_path: str):
+        manifest = self.get_manifest(upload_path=upload_path)
+        received_parts = self.list_received_parts(upload_path=upload_path)
+
+        return {
+            **manifest,
+            "received_parts": received_parts,
+            "missing_parts": sorted(set(range(1, manifest["total_parts"] + 1)) - set(received_parts)),
+        }
+
+    def assemble_upload(self, project_id: str, upload_path: str):
+        """Concatenate the parts into a project file while hashing it.
+
+        Returns (signal, file_id, file_hash, deduplicated); file_id is None on failure.
+        """
+        manifest = self.get_manifest(upload_path=upload_path)
+
+        missing_parts = set(range(1, manifest["total_parts"] + 1)) - set(
+            self.list_received_parts(upload_path=upload_path)
+        )
+        if missing_parts:
+            return ResponseSignal.UPLOAD_INCOMPLETE.value, None, None, False
+
+        file_path, file_id = self.generate_unique_filepath(
+            orig_file_name=manifest["file_name"],
+            project_id=project_id
+        )
+
+        hasher = hashlib.sha256()
+        with open(file_path, "wb") as out_file:
+            for part_number in range(1, manifest["total_parts"] + 1):
+                with open(self.get_part_path(upload_path, part_number), "rb") as part_file:
+                    while chunk := part_file.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                        hasher.update(chunk)
+                        out_file.write(chunk)
+
+        file_hash = hasher.hexdigest()
+        if manifest["sha256"] and manifest["sha256"] != file_hash:
+            os.remove(file_path)
+            return ResponseSignal.UPLOAD_HASH_MISMATCH.value, None, file_hash, False
+
+        canonical_file_id = self.register_file_hash(
+            project_id=project_id, file_hash=file_hash, file_id=file_id
+        )
+        if canonical_file_id != file_id:
+            os.remove(file_path)
+
+        self.delete_upload(upload_path=upload_path)
+
+        return ResponseSignal.FILE_UPLOAD_SUCCESS.value, canonical_file_id, file_hash, canonical_file_id != file_id
+
+    def delete_upload(self, upload_path: str):
+        shutil.rmtree(upload_path, ignore_errors=True)
+
+    def prune_expired_uploads(self, project_id: str):
+        # Abandoned uploads are dropped once they outlive the resume window
+        uploads_path = self.get_uploads_path(project_id=project_id)
+        expires_before = time.time() - self.app_settings.FILE_UPLOAD_SESSION_TTL_SECONDS
+
+        for upload_id in os.listdir(uploads_path):
+            upload_path = os.path.join(uploads_path, upload_id)
+            if os.path.getmtime(upload_path) < expires_before:
+                self.delete_upload(upload_path=upload_path)
@@ -1,4 +1,8 @@
 from .DataController import DataController
 from .ProjectController import ProjectController
 from .ProcessController import ProcessController
-from .NLPController import NLPController
\ No newline at end of file
+from .NLPController import NLPController
+from .ProfileController import ProfileController
+from .UploadController import UploadController
+from .IngestController import IngestController
+from .SnapshotController import SnapshotController
@@ -0,0 +1,236 @@
+from starlette.responses import JSONResponse
+from .metrics import ADMISSION_REQUESTS, ADMISSION_QUEUE_WAIT
+from models.enums.ResponseEnums import ResponseSignal
+import itertools
+import asyncio
+import logging
+import heapq
+import math
+import time
+import re
+
+
+class Overloaded(Exception):
+    """The request cannot be admitted within its queue budget"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class PriorityLimiter:
+    """Event-loop concurrency limit with a bounded, priority-ordered wait queue.
+
+    A freed slot goes to the waiter with the lowest priority value. Requests of
+    priority > 0 may not take the last `reserved` slots, so lower-priority
+    traffic can never starve the interactive kind. Not thread-safe: only used
+    from the event loop.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int = 0, reserved: int = 0):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.reserved = min(reserved, max_concurrency - 1)
+
+        self.active = 0
+        self.waiters = []
+        self.queued = 0
+        self.counter = itertools.count()
+
+        # Exponentially weighted request duration, used to size Retry-After
+        self.average_seconds = None
+
+    def get_capacity(self, priority: int):
+        return self.max_concurrency if priority == 0 else self.max_concurrency - self.reserved
+
+    def retry_after(self):
+        average_seconds = self.average_seconds or 1.0
+        return max(1, math.ceil(average_seconds * (self.queued + 1) / self.max_concurrency))
+
+    async def acquire(self, priority: int = 0, timeout: float = None):
+        if self.active < self.get_capacity(priority) and not self.queued:
+            self.active += 1
+            return
+
+        if self.queued >= self.max_queue:
+            raise Overloaded("queue_full", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.counter), future))
+        self.queued += 1
+
+        # Queued lower-priority work must not block a request that fits right now
+        self.wake_waiters()
+        if future.done():
+            return
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the wait ended
+                if isinstance(e, asyncio.CancelledError):
+                    self.release()
+                    raise
+                return
+
+            future.cancel()
+            self.queued -= 1
+            # A waiter leaving may let the ones behind it in (e.g. a reserved slot is now usable)
+            self.wake_waiters()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise Overloaded("queue_timeout", self.retry_after())
+
+    def release(self, seconds: float = None):
+        self.active -= 1
+        if seconds is not None:
+            self.average_seconds = seconds if self.average_seconds is None else (
+                0.8 * self.average_seconds + 0.2 * seconds
+            )
+        self.wake_waiters()
+
+    def wake_waiters(self):
+        # Waiters are served in priority order; one that does not fit yet keeps its place
+        skipped = []
+        while self.waiters:
+            priority, order, future = heapq.heappop(self.waiters)
+            if future.cancelled():
+                continue
+            if self.active < self.get_capacity(priority):
+                self.active += 1
+                self.queued -= 1
+                future.set_result(True)
+                continue
+            skipped.append((priority, order, future))
+            if priority == 0:
+                break
+
+        for waiter in skipped:
+            heapq.heappush(self.waiters, waiter)
+
+    def get_stats(self):
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "average_seconds": round(self.average_seconds, 4) if self.average_seconds else None,
+        }
+
+
+class AdmissionController:
+    """Per-route-class concurrency limits under one shared, priority-ordered limit.
+
+    Each request waits at most its class' `queue_timeout` in total for both its
+    class slot and a shared slot. Interactive classes (priority 0) are served
+    first and keep `reserved` shared slots to themselves.
+    """
+
+    # Matched against the request path in order; unmatched paths are never limited
+    ROUTE_CLASSES = (
+        ("search", re.compile(r"^/nlp/index/search(-multi)?(/|$)")),
+        ("answer", re.compile(r"^/nlp/index/answer(-multi)?(/|$)")),
+        ("ingest", re.compile(r"^/(nlp/index/(push|push-all|import|export)|data/process)(/|$)")),
+    )
+
+    DEFAULT_LIMITS = {
+        "search": { "concurrency": 32, "queue": 128, "queue_timeout": 1.0, "priority": 0 },
+        "answer": { "concurrency": 16, "queue": 64, "queue_timeout": 2.0, "priority": 0 },
+        "ingest": { "concurrency": 2, "queue": 8, "queue_timeout": 10.0, "priority": 1 },
+    }
+
+    def __init__(self, limits: dict = None, max_concurrency: int = 48, reserved: int = 8):
+        self.limits = {
+            route_class: { **defaults, **((limits or {}).get(route_class) or {}) }
+            for route_class, defaults in self.DEFAULT_LIMITS.items()
+        }
+
+        self.limiters = {
+            route_class: PriorityLimiter(
+                name=route_class,
+                max_concurrency=config["concurrency"],
+                max_queue=config["queue"],
+            )
+            for route_class, config in self.limits.items()
+        }
+        self.shared_limiter = PriorityLimiter(
+            name="shared",
+            max_concurrency=max_concurrency,
+            max_queue=sum(config["queue"] for config in self.limits.values()),
+            reserved=reserved,
+        )
+
+        self.logger = logging.getLogger(__name__)
+
+    def get_route_class(self, path: str):
+        for route_class, pattern in self.ROUTE_CLASSES:
+            if pattern.match(path):
+                return route_class
+        return None
+
+    async def admit(self, route_class: str):
+        """Take a class slot and a shared slot, or raise Overloaded"""
+        config = self.limits[route_class]
+        limiter = self.limiters[route_class]
+        started = time.monotonic()
+
+        await limiter.acquire(priority=config["priority"], timeout=config["queue_timeout"])
+        try:
+            remaining = max(0.0, config["queue_timeout"] - (time.monotonic() - started))
+            await self.shared_limiter.acquire(priority=config["priority"], timeout=remaining)
+        except BaseException:
+            limiter.release()
+            raise
+
+        ADMISSION_QUEUE_WAIT.observe(time.monotonic() - started, route_class=route_class)
+
+    def release(self, route_class: str, seconds: float):
+        self.shared_limiter.release(seconds=seconds)
+        self.limiters[route_class].release(seconds=seconds)
+
+    def get_stats(self):
+        return {
+            "shared": self.shared_limiter.get_stats(),
+            **{ route_class: limiter.get_stats() for route_class, limiter in self.limiters.items() },
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware shedding load with a fast 503 + Retry-After once a route class is saturated"""
+
+    def __init__(self, app, admission: AdmissionController):
+        self.app = app
+        self.admission = admission
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        route_class = self.admission.get_route_class(scope["path"])
+        if route_class is None:
+            return await self.app(scope, receive, send)
+
+        try:
+            await self.admission.admit(route_class)
+        except Overloaded as e:
+            ADMISSION_REQUESTS.inc(route_class=route_class, result=e.reason)
+            response = JSONResponse(
+                status_code=503,
+                headers={ "Retry-After": str(e.retry_after) },
+                content={
+                    "signal": ResponseSignal.SERVER_OVERLOADED.value,
+                    "route_class": route_class,
+                    "reason": e.reason,
+                },
+            )
+            return await response(scope, receive, send)
+
+        ADMISSION_REQUESTS.inc(route_class=route_class, result="admitted")
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.admission.release(route_class, seconds=time.monotonic() - started)
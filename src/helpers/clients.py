@@ -0,0 +1,85 @@
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.EmbeddingBatcher import EmbeddingBatcher
+from stores.llm.EmbeddingCompressor import EmbeddingCompressor, PCAProjection
+from stores.llm.LLMEnums import EmbeddingTypeEnums
+from stores.llm.ResilientGenerationClient import ResilientGenerationClient
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+
+
+def create_generation_client(settings, llm_provider_factory: LLMProviderFactory):
+    primary_generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
+    primary_generation_client.set_generation_model(settings.GENERATION_MODEL_ID)
+
+    secondary_generation_client = None
+    if settings.GENERATION_SECONDARY_BACKEND:
+        secondary_generation_client = llm_provider_factory.create(provider=settings.GENERATION_SECONDARY_BACKEND)
+        secondary_generation_client.set_generation_model(
+            settings.GENERATION_SECONDARY_MODEL_ID or settings.GENERATION_MODEL_ID
+        )
+
+    # Deadline-aware generation with optional hedging and per-backend circuit breakers
+    return ResilientGenerationClient(
+        primary=primary_generation_client,
+        secondary=secondary_generation_client,
+        hedge_enabled=settings.GENERATION_HEDGE_ENABLED,
+        hedge_percentile=settings.GENERATION_HEDGE_PERCENTILE,
+        hedge_min_delay=settings.GENERATION_HEDGE_MIN_DELAY_SECONDS,
+        hedge_min_samples=settings.GENERATION_HEDGE_MIN_SAMPLES,
+        failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds=settings.CIRCUIT_BREAKER_RESET_SECONDS,
+        max_workers=settings.GENERATION_MAX_WORKERS,
+    )
+
+
+def create_embedding_client(settings, llm_provider_factory: LLMProviderFactory, batching: bool = None):
+    embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
+
+    # A local projection takes the provider's full-size vectors down to EMBEDDING_MODEL_SIZE
+    projection = None
+    if settings.EMBEDDING_PROJECTION_PATH:
+        projection = PCAProjection.load(settings.EMBEDDING_PROJECTION_PATH)
+        if settings.EMBEDDING_MODEL_SIZE and projection.output_size != settings.EMBEDDING_MODEL_SIZE:
+            raise ValueError(
+                f"EMBEDDING_MODEL_SIZE={settings.EMBEDDING_MODEL_SIZE} does not match the "
+                f"projection output size ({projection.output_size})"
+            )
+
+    embedding_client.set_embedding_model(
+        model_id=settings.EMBEDDING_MODEL_ID,
+        embedding_size=projection.input_size if projection else settings.EMBEDDING_MODEL_SIZE,
+    )
+
+    # Compact types come from the provider when it supports them (and nothing is projected
+    # first), otherwise its float vectors are quantized locally
+    embedding_type = settings.EMBEDDING_TYPE
+    if projection is None and embedding_type in getattr(embedding_client, "SUPPORTED_EMBEDDING_TYPES", ()):
+        embedding_client.set_embedding_type(embedding_type)
+        embedding_type = EmbeddingTypeEnums.FLOAT.value
+
+    # In-process models are loaded and exercised once before serving traffic
+    if hasattr(embedding_client, "warm_up"):
+        embedding_client.warm_up()
+
+    if projection is not None or embedding_type != EmbeddingTypeEnums.FLOAT.value:
+        embedding_client = EmbeddingCompressor(
+            embedding_client=embedding_client,
+            projection=projection,
+            embedding_type=embedding_type,
+        )
+
+    # Concurrent query embeddings are merged into batched provider calls
+    if settings.EMBEDDING_BATCHING_ENABLED if batching is None else batching:
+        embedding_client = EmbeddingBatcher(
+            embedding_client=embedding_client,
+            window_ms=settings.EMBEDDING_BATCH_WINDOW_MS,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_concurrent_batches=settings.EMBEDDING_BATCH_MAX_CONCURRENCY,
+        )
+
+    return embedding_client
+
+
+def create_vectordb_client(settings):
+    vectordb_client = VectorDBProviderFactory(settings).create(provider=settings.VECTOR_DB_BACKEND)
+    vectordb_client.connect()
+    return vectordb_client
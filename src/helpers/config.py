@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional
 
 class Settings(BaseSettings):
     APP_NAME: str
@@ -7,6 +8,20 @@ class Settings(BaseSettings):
     FILE_ALLOWED_TYPES: list
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int
+    FILE_UPLOAD_PART_SIZE: int = 5242880
+    FILE_UPLOAD_MIN_PART_SIZE: int = 65536
+    FILE_UPLOAD_MAX_PARTS: int = 10000
+    FILE_UPLOAD_SESSION_TTL_SECONDS: int = 86400
+    PROCESS_MAX_PAGE_SIZE: int = 1000
+    PROCESS_CACHED_FILES: int = 2
+    INGEST_MAX_WORKERS: int = 0
+    IO_MAX_WORKERS: int = 16
+    RESPONSE_GZIP_ENABLED: bool = False
+    RESPONSE_GZIP_MIN_SIZE: int = 1024
+    ADMISSION_CONTROL_ENABLED: bool = False
+    ADMISSION_LIMITS: dict = {}
+    ADMISSION_MAX_CONCURRENCY: int = 48
+    ADMISSION_INTERACTIVE_RESERVED: int = 8
     
     GENERATION_BACKEND: str
     EMBEDDING_BACKEND: str
@@ -18,6 +33,41 @@ class Settings(BaseSettings):
     GENERATION_MODEL_ID: str = None
     EMBEDDING_MODEL_ID: str = None
     EMBEDDING_MODEL_SIZE: int = None
+    EMBEDDING_TYPE: str = "float"
+    EMBEDDING_PROJECTION_PATH: Optional[str] = None
+    EMBEDDING_BATCHING_ENABLED: bool = True
+    EMBEDDING_BATCH_WINDOW_MS: float = 3
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
+    EMBEDDING_BATCH_MAX_CONCURRENCY: int = 4
+    RATE_LIMITS: dict = {}
+    RATE_LIMIT_MAX_IN_FLIGHT: int = 16
+    RATE_LIMIT_MAX_RETRIES: int = 4
+    RATE_LIMIT_BACKOFF_BASE_SECONDS: float = 0.5
+    RATE_LIMIT_BACKOFF_MAX_SECONDS: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_POOL_TIMEOUT_SECONDS: float = 5.0
+    HTTP_EMBEDDING_TIMEOUT_SECONDS: float = 10.0
+    HTTP_GENERATION_TIMEOUT_SECONDS: float = 30.0
+    HTTP2_ENABLED: bool = False
+    REQUEST_DEADLINE_SECONDS: float = 0
+    GENERATION_SECONDARY_BACKEND: Optional[str] = None
+    GENERATION_SECONDARY_MODEL_ID: Optional[str] = None
+    GENERATION_HEDGE_ENABLED: bool = False
+    GENERATION_HEDGE_PERCENTILE: float = 95
+    GENERATION_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    GENERATION_HEDGE_MIN_SAMPLES: int = 20
+    GENERATION_MAX_WORKERS: int = 16
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_SECONDS: float = 30.0
+    LOCAL_EMBEDDING_THREADS: int = 2
+    LOCAL_EMBEDDING_DEVICE: str = "cpu"
+    LOCAL_EMBEDDING_BACKEND: str = "torch"
+    LOCAL_EMBEDDING_BATCH_SIZE: int = 32
+    FAKE_PROVIDER_LATENCY_MS: float = 0
+    FAKE_PROVIDER_JITTER_MS: float = 0
     INPUT_DEFAULT_MAX_CHARACTERS: int = None
     GENERATION_DEFAULT_MAX_TOKENS: int = None
     GENERATION_DEFAULT_TEMPERATURE: float = None
@@ -25,6 +75,35 @@ class Settings(BaseSettings):
     VECTOR_DB_BACKEND: str
     VECTOR_DB_PATH: str
     VECTOR_DB_DISTANCE_METHOD: str = None
+    VECTOR_DB_COLLECTION_MODE: str = "PER_PROJECT"
+    VECTOR_DB_SHARED_COLLECTION_NAME: str = "collection_shared"
+    SNAPSHOT_MAX_PER_PROJECT: int = 5
+    QA_FAST_PATH_TEXT_THRESHOLD: float = 0
+    QA_FAST_PATH_VECTOR_THRESHOLD: float = 0
+    QA_QUESTION_VECTORS_ENABLED: bool = False
+    MULTI_SEARCH_MAX_PROJECTS: int = 20
+    MULTI_SEARCH_MAX_WORKERS: int = 16
+    MULTI_SEARCH_SHARD_TIMEOUT_SECONDS: float = 2.0
+    MULTI_SEARCH_MIN_SCORE: Optional[float] = None
+
+    SERVER_TIMING_ENABLED: bool = False
+    ADMIN_TOKEN: Optional[str] = None
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5
+    PROFILING_MAX_PROFILES: int = 50
+    STARTUP_WARMUP_ENABLED: bool = True
+
+    PRIMARY_LANG: str = "en"
+    DEFAULT_LANG: str = "en"
+    TEMPLATES_RELOAD_INTERVAL: float = 2.0
+
+    SESSION_MAX_ENTRIES: int = 1000
+    SESSION_TTL_SECONDS: int = 1800
+    SESSION_MAX_TURNS: int = 10
+    SESSION_HISTORY_TURNS: int = 4
+    SESSION_MAX_DOCUMENTS: int = 20
+    SESSION_SQLITE_DB: Optional[str] = None
+
     class Config:
         env_file = ".env"
         
@@ -0,0 +1,33 @@
+import time
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of its latency budget"""
+
+
+class Deadline:
+    """Absolute latency budget passed down through embedding, search and generation"""
+
+    def __init__(self, timeout_seconds: float = None):
+        self.expires_at = time.monotonic() + timeout_seconds if timeout_seconds else None
+
+    def remaining(self):
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self, stage: str):
+        if self.expired():
+            raise DeadlineExceeded(f"Request deadline reached before {stage}")
+
+    def bound(self, timeout: float = None):
+        """The smaller of `timeout` and the remaining budget (None means unbounded)"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
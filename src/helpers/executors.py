@@ -0,0 +1,183 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future
+from .metrics import (REGISTRY, EXECUTOR_TASKS, EXECUTOR_QUEUE_WAIT, EXECUTOR_BUSY_SECONDS,
+                      EXECUTOR_IN_FLIGHT, request_timings)
+from .profiling import ProfilingSession, request_profile
+import multiprocessing
+import contextvars
+import threading
+import asyncio
+import logging
+import time
+import os
+
+
+def run_in_worker(fn, args: tuple, kwargs: dict, profile: dict = None):
+    """Process-pool side of `ExecutorManager.submit_cpu`.
+
+    Runs `fn` with its own Server-Timing list and returns the result together
+    with the timings and the metrics it recorded, which the parent merges into
+    its registry (a worker's registry is never scraped). Tasks of a profiled
+    request (`profile` holds the session options) also return a profile report.
+    """
+    REGISTRY.drain()
+    timings = []
+    token = request_timings.set(timings)
+
+    session = ProfilingSession(**profile) if profile is not None else None
+    if session is not None:
+        session.start()
+
+    started = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        run_seconds = time.perf_counter() - started
+        request_timings.reset(token)
+        if session is not None:
+            session.stop()
+
+    return result, run_seconds, timings, REGISTRY.drain(), session.export() if session is not None else None
+
+
+class PoolStats:
+    """In-flight accounting of one pool: queue depth is what exceeds the workers"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+
+    def submitted(self):
+        with self.lock:
+            self.in_flight += 1
+            EXECUTOR_IN_FLIGHT.set(self.in_flight, pool=self.name)
+
+    def finished(self, failed: bool, queue_seconds: float, run_seconds: float):
+        with self.lock:
+            self.in_flight -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+            EXECUTOR_IN_FLIGHT.set(self.in_flight, pool=self.name)
+
+        EXECUTOR_TASKS.inc(pool=self.name, status="error" if failed else "ok")
+        EXECUTOR_QUEUE_WAIT.observe(max(0.0, queue_seconds), pool=self.name)
+        EXECUTOR_BUSY_SECONDS.inc(run_seconds, pool=self.name)
+
+    def get_stats(self):
+        with self.lock:
+            in_flight = self.in_flight
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": in_flight,
+                "queue_depth": max(0, in_flight - self.max_workers),
+                "utilization": round(min(in_flight, self.max_workers) / self.max_workers, 4),
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+
+class ExecutorManager:
+    """App-wide worker pools: processes for CPU-bound parsing and splitting, threads for blocking I/O.
+
+    Both pools are created up front but start their workers on first use, and
+    are shut down with the app (see the lifespan in main.py). Process-pool
+    tasks must be picklable module-level functions; their stage timings and
+    metrics are replayed in the parent.
+    """
+
+    def __init__(self, process_workers: int = None, thread_workers: int = 16):
+        process_workers = process_workers or os.cpu_count()
+
+        # Spawned workers avoid forking a parent that already runs client threads
+        self.process_pool = ProcessPoolExecutor(
+            max_workers=process_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.thread_pool = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="blocking-io")
+
+        self.stats = {
+            "process": PoolStats("process", process_workers),
+            "thread": PoolStats("thread", thread_workers),
+        }
+        self.logger = logging.getLogger(__name__)
+
+    def submit_cpu(self, fn, *args, **kwargs) -> Future:
+        """Run `fn` in the process pool; the returned future holds its plain result"""
+        stats = self.stats["process"]
+        # Timings are appended to the submitting request's list, whichever thread completes the task
+        timings = request_timings.get()
+        profile = request_profile.get()
+        result_future = Future()
+        submitted = time.perf_counter()
+
+        def on_done(future: Future):
+            elapsed = time.perf_counter() - submitted
+            try:
+                result, run_seconds, worker_timings, worker_metrics, worker_profile = future.result()
+            except BaseException as e:
+                stats.finished(failed=True, queue_seconds=0.0, run_seconds=0.0)
+                result_future.set_exception(e)
+                return
+
+            REGISTRY.merge(worker_metrics)
+            if timings is not None:
+                timings.extend(worker_timings)
+            if profile is not None and worker_profile is not None:
+                profile.merge_worker(worker_profile)
+            # Round trip minus run time: queueing plus (un)pickling the arguments and result
+            stats.finished(failed=False, queue_seconds=elapsed - run_seconds, run_seconds=run_seconds)
+            result_future.set_result(result)
+
+        stats.submitted()
+        try:
+            future = self.process_pool.submit(
+                run_in_worker, fn, args, kwargs, profile.get_worker_options() if profile is not None else None
+            )
+        except BaseException:
+            stats.finished(failed=True, queue_seconds=0.0, run_seconds=0.0)
+            raise
+
+        future.add_done_callback(on_done)
+        return result_future
+
+    def submit_io(self, fn, *args, **kwargs) -> Future:
+        """Run `fn` in the thread pool, in a copy of the caller's context (stages reach Server-Timing)"""
+        stats = self.stats["thread"]
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = context.run(fn, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                stats.finished(
+                    failed=failed, queue_seconds=started - submitted, run_seconds=time.perf_counter() - started
+                )
+
+        stats.submitted()
+        try:
+            return self.thread_pool.submit(run)
+        except BaseException:
+            stats.finished(failed=True, queue_seconds=0.0, run_seconds=0.0)
+            raise
+
+    async def run_cpu(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit_cpu(fn, *args, **kwargs))
+
+    async def run_io(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit_io(fn, *args, **kwargs))
+
+    def get_stats(self):
+        return { name: stats.get_stats() for name, stats in self.stats.items() }
+
+    def shutdown(self):
+        self.thread_pool.shutdown(wait=False, cancel_futures=True)
+        self.process_pool.shutdown(wait=False, cancel_futures=True)
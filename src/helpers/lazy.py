@@ -0,0 +1,92 @@
+import time
+import logging
+import threading
+
+
+class LazyObject:
+    """Stand-in for a component that is only built on first use.
+
+    Attribute access is forwarded to the real object, which is constructed
+    (once, under a lock) the first time it is needed or when `resolve()` is
+    called by the warm-up task. A failed build is not cached, so the next
+    access retries it.
+    """
+
+    __slots__ = ("_lazy_name", "_lazy_factory", "_lazy_value", "_lazy_lock")
+
+    def __init__(self, factory, name: str = None):
+        self._lazy_name = name or getattr(factory, "__name__", "component")
+        self._lazy_factory = factory
+        self._lazy_value = None
+        self._lazy_lock = threading.Lock()
+
+    @property
+    def is_resolved(self):
+        return self._lazy_value is not None
+
+    def resolve(self):
+        value = self._lazy_value
+        if value is not None:
+            return value
+
+        with self._lazy_lock:
+            if self._lazy_value is None:
+                self._lazy_value = self._lazy_factory()
+            return self._lazy_value
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        state = "resolved" if self.is_resolved else "pending"
+        return f"<LazyObject {self._lazy_name} ({state})>"
+
+
+class WarmUp:
+    """Resolves lazy components in the background; the app is ready once all of them are built.
+
+    With warm-up disabled components are only built on demand, so the app
+    reports ready straight away and the first requests pay for construction.
+    """
+
+    def __init__(self, components: dict, enabled: bool = True):
+        self.components = components
+        self.enabled = enabled
+        self.durations = {}
+        self.errors = {}
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.logger = logging.getLogger(__name__)
+
+    def run(self):
+        for name, component in self.components.items():
+            started = time.perf_counter()
+            try:
+                component.resolve()
+            except Exception as e:
+                self.logger.error(f"Warm-up of {name} failed: {e}")
+                self.errors[name] = str(e)
+                continue
+            self.durations[name] = round(time.perf_counter() - started, 4)
+
+        self.finished_at = time.monotonic()
+
+    def is_ready(self):
+        if not self.enabled:
+            return True
+        # Components may also have been built by early traffic before the warm-up reached them
+        return all(component.is_resolved for component in self.components.values())
+
+    def get_status(self):
+        return {
+            "ready": self.is_ready(),
+            "components": {
+                name: "ready" if component.is_resolved else (
+                    "failed" if name in self.errors else "pending"
+                )
+                for name, component in self.components.items()
+            },
+            "errors": self.errors,
+            "warmup_seconds": self.durations,
+            "uptime_seconds": round(time.monotonic() - self.started_at, 3),
+        }
@@ -0,0 +1,333 @@
+import time
+import bisect
+import threading
+import contextvars
+from contextlib import contextmanager
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+DEFAULT_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+# Per-request (name, seconds) pairs collected for the Server-Timing header
+request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(label_names: tuple, label_values: tuple, extra: str = None) -> str:
+    pairs = [ f'{name}="{escape_label_value(value)}"' for name, value in zip(label_names, label_values) ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+
+    metric_type = None
+
+    def __init__(self, name: str, documentation: str, label_names: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def label_key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def header(self):
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+
+
+class Counter(Metric):
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self.values.get(self.label_key(labels), 0)
+
+    def merge(self, values: dict):
+        with self.lock:
+            for key, value in values.items():
+                self.values[key] = self.values.get(key, 0) + value
+
+    def collect(self):
+        lines = self.header()
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{format_labels(self.label_names, key)} {format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def merge(self, values: dict):
+        # A worker's gauge describes the worker, not the parent
+        pass
+
+
+class Histogram(Metric):
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple = (),
+                 buckets: tuple = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self.label_key(labels)
+        # Per-bucket (non-cumulative) counts; collect() accumulates them
+        idx = bisect.bisect_left(self.buckets, value)
+
+        with self.lock:
+            series = self.values.get(key)
+            if series is None:
+                series = self.values[key] = { "counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0 }
+            series["counts"][idx] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def merge(self, values: dict):
+        with self.lock:
+            for key, other in values.items():
+                series = self.values.get(key)
+                if series is None:
+                    series = self.values[key] = { "counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0 }
+                series["counts"] = [ a + b for a, b in zip(series["counts"], other["counts"]) ]
+                series["sum"] += other["sum"]
+                series["count"] += other["count"]
+
+    def collect(self):
+        lines = self.header()
+        with self.lock:
+            for key, series in sorted(self.values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                    cumulative += count
+                    labels = format_labels(self.label_names, key, f'le="{format_value(float(bound))}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+                labels = format_labels(self.label_names, key)
+                lines.append(f"{self.name}_sum{labels} {format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Minimal thread-safe Prometheus registry rendered in the text exposition format"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric: Metric):
+        with self.lock:
+            # Re-registering (e.g. on module reload) hands back the existing series
+            return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, label_names: tuple = ()):
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: tuple = ()):
+        return self.register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: tuple = (),
+                  buckets: tuple = DEFAULT_LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def drain(self) -> dict:
+        """Take every recorded series and reset them; worker processes ship these to the parent"""
+        with self.lock:
+            metrics = list(self.metrics.values())
+
+        drained = {}
+        for metric in metrics:
+            with metric.lock:
+                if metric.values:
+                    drained[metric.name], metric.values = metric.values, {}
+        return drained
+
+    def merge(self, drained: dict):
+        """Add series drained from another process into this registry"""
+        for name, values in drained.items():
+            metric = self.metrics.get(name)
+            if metric is not None:
+                metric.merge(values)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "rag_stage_duration_seconds", "Latency of RAG pipeline stages", ("stage",)
+)
+VECTORDB_LATENCY = REGISTRY.histogram(
+    "vectordb_operation_duration_seconds", "Latency of vector database operations", ("operation",)
+)
+VECTORDB_ERRORS = REGISTRY.counter(
+    "vectordb_errors_total", "Failed vector database operations", ("operation",)
+)
+BATCH_SIZE = REGISTRY.histogram(
+    "batch_size", "Items per batched call", ("operation",), buckets=DEFAULT_SIZE_BUCKETS
+)
+CHUNKS_PROCESSED = REGISTRY.counter(
+    "chunks_processed_total", "Chunks produced by splitting and written to the index", ("stage",)
+)
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total", "Estimated tokens sent to and received from LLM providers", ("operation", "direction")
+)
+LLM_ERRORS = REGISTRY.counter(
+    "llm_errors_total", "LLM provider errors", ("provider", "operation", "error")
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total", "Cache lookups by result", ("cache", "result")
+)
+SCATTER_GATHER_SHARDS = REGISTRY.counter(
+    "scatter_gather_shards_total", "Per-project calls of multi-project requests by outcome", ("status",)
+)
+ADMISSION_REQUESTS = REGISTRY.counter(
+    "admission_requests_total", "Admission decisions by route class", ("route_class", "result")
+)
+ADMISSION_QUEUE_WAIT = REGISTRY.histogram(
+    "admission_queue_wait_seconds", "Time admitted requests waited for a slot", ("route_class",)
+)
+EXECUTOR_TASKS = REGISTRY.counter(
+    "executor_tasks_total", "Tasks run by the managed worker pools by outcome", ("pool", "status")
+)
+EXECUTOR_QUEUE_WAIT = REGISTRY.histogram(
+    "executor_queue_wait_seconds", "Time tasks waited for a free worker", ("pool",)
+)
+EXECUTOR_BUSY_SECONDS = REGISTRY.counter(
+    "executor_busy_seconds_total", "Worker time spent running tasks (rate / workers = utilization)", ("pool",)
+)
+EXECUTOR_IN_FLIGHT = REGISTRY.gauge(
+    "executor_in_flight_tasks", "Tasks submitted to a worker pool and not finished yet", ("pool",)
+)
+HTTP_POOL_REQUESTS = REGISTRY.counter(
+    "http_pool_requests_total", "Outbound LLM provider requests through the shared pool by outcome", ("status",)
+)
+HTTP_POOL_WAITS = REGISTRY.counter(
+    "http_pool_waits_total", "Outbound requests that found every pooled connection in use"
+)
+HTTP_POOL_ACQUIRE = REGISTRY.histogram(
+    "http_pool_acquire_seconds", "Time outbound requests waited to get a pooled connection"
+)
+HTTP_POOL_CONNECTIONS = REGISTRY.gauge(
+    "http_pool_connections", "Pooled provider connections by state, as of the last request", ("state",)
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "handler", "status")
+)
+
+
+def record_timing(name: str, seconds: float):
+    timings = request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+@contextmanager
+def track_stage(stage: str, histogram: Histogram = STAGE_LATENCY, label: str = "stage",
+                timing_name: str = None):
+    """Observe a pipeline stage in `histogram` and in the current request's Server-Timing"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed, **{ label: stage })
+        record_timing(timing_name or stage, elapsed)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency, optionally returned as Server-Timing"""
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = []
+        token = request_timings.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed = time.perf_counter() - started
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"server-timing", self.format_server_timing(timings, elapsed).encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_timings.reset(token)
+            # The endpoint name keeps the label set bounded (paths embed project ids)
+            endpoint = scope.get("endpoint")
+            HTTP_LATENCY.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                handler=getattr(endpoint, "__name__", "unmatched"),
+                status=status_code,
+            )
+
+    @staticmethod
+    def format_server_timing(timings: list, total: float) -> str:
+        # Repeated stages (e.g. several embedding batches) are summed into one entry
+        durations = {}
+        for name, seconds in timings:
+            durations[name] = durations.get(name, 0.0) + seconds
+        durations["total"] = total
+
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in durations.items()
+        )
@@ -0,0 +1,39 @@
+import numpy as np
+
+
+def maximal_marginal_relevance(query_vector: list, candidate_vectors: list,
+                               k: int, lambda_mult: float = 0.5):
+    """Pick `k` candidate indices balancing query relevance against redundancy.
+
+    Every step is a vectorized NumPy pass over the candidates, so the cost is
+    O(k * n * d) with no Python loop over the candidates themselves.
+    """
+    if k <= 0 or len(candidate_vectors) == 0:
+        return []
+
+    candidates = np.asarray(candidate_vectors, dtype=np.float32)
+    query = np.asarray(query_vector, dtype=np.float32)
+
+    # Cosine similarity on unit vectors, guarding against zero norms
+    candidates = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = candidates @ query
+    k = min(k, len(candidates))
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = candidates @ candidates[selected[0]]
+    is_selected = np.zeros(len(candidates), dtype=bool)
+    is_selected[selected[0]] = True
+
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[is_selected] = -np.inf
+
+        best = int(np.argmax(scores))
+        selected.append(best)
+        is_selected[best] = True
+
+        np.maximum(max_similarity, candidates @ candidates[best], out=max_similarity)
+
+    return selected
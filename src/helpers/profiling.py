@@ -0,0 +1,293 @@
+import os
+import sys
+import time
+import hmac
+import asyncio
+import threading
+import contextvars
+import tracemalloc
+from collections import Counter
+
+# Session profiling the current request; process-pool tasks it submits are profiled in their worker
+request_profile = contextvars.ContextVar("request_profile", default=None)
+
+# Root frame of the stacks sampled in worker processes
+WORKER_FRAME = "[worker process]"
+
+
+class SamplingProfiler(threading.Thread):
+    """Samples every thread's Python stack at a fixed interval into folded stacks.
+
+    Only stacks that pass through application code (files under `root_dir`) are
+    kept, which drops the server's own event-loop plumbing, and threads parked
+    in a wait are skipped, so the result is an on-CPU view of the request.
+    Samples hold raw code objects; labels are only formatted once at the end.
+    """
+
+    IDLE_LEAVES = {
+        ("threading.py", "wait"),
+        ("queue.py", "get"),
+        ("selectors.py", "select"),
+        ("thread.py", "_worker"),
+    }
+
+    def __init__(self, root_dir: str, interval: float = 0.005):
+        super().__init__(name="sampling-profiler", daemon=True)
+        self.root_dir = os.path.abspath(root_dir) + os.sep
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stop_event = threading.Event()
+
+    def is_idle(self, code):
+        return (os.path.basename(code.co_filename), code.co_name) in self.IDLE_LEAVES
+
+    def frame_label(self, code):
+        filename = code.co_filename
+        if filename.startswith(self.root_dir):
+            filename = os.path.relpath(filename, self.root_dir)
+        else:
+            filename = os.path.join(*filename.split(os.sep)[-2:])
+        return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+    def run(self):
+        own_thread_id = threading.get_ident()
+        own_file = __file__
+
+        root_dir = self.root_dir
+        in_app_files = {}
+
+        while not self.stop_event.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id or self.is_idle(frame.f_code):
+                    continue
+
+                stack, in_app = [], False
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(code)
+                    if not in_app:
+                        filename = code.co_filename
+                        is_app_file = in_app_files.get(filename)
+                        if is_app_file is None:
+                            is_app_file = in_app_files[filename] = (
+                                filename.startswith(root_dir) and filename != own_file
+                            )
+                        in_app = is_app_file
+                    frame = frame.f_back
+
+                if in_app:
+                    self.stacks[tuple(stack)] += 1
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+    def labelled_stacks(self):
+        """(frame labels from the root, count) per distinct stack, most frequent first"""
+        labels = {}
+        stacks = []
+        for stack, count in self.stacks.most_common():
+            for code in stack:
+                if code not in labels:
+                    labels[code] = self.frame_label(code)
+            stacks.append((tuple(labels[code] for code in reversed(stack)), count))
+        return stacks
+
+    def collapsed(self):
+        """Brendan Gregg's folded format, ready for flamegraph.pl or speedscope"""
+        return "".join(";".join(labels) + f" {count}\n" for labels, count in self.labelled_stacks())
+
+
+class ProfilingSession:
+    """CPU sampling plus tracemalloc allocation tracking around one request.
+
+    Work the request hands to the process pool is profiled by a session of its
+    own in the worker (see `run_in_worker`); its report is merged back here, with
+    the stacks under a `[worker process]` root frame.
+    """
+
+    def __init__(self, root_dir: str, interval: float = 0.005, top_allocations: int = 30,
+                 traceback_frames: int = 1):
+        self.profiler = SamplingProfiler(root_dir=root_dir, interval=interval)
+        self.root_dir = root_dir
+        self.interval = interval
+        self.top_allocations = top_allocations
+        self.traceback_frames = traceback_frames
+        self.started_tracemalloc = False
+        self.snapshot = None
+        self.started_at = None
+        self.duration = None
+        self.peak_memory = None
+
+        # Merged from worker processes, whose callbacks may run on any thread
+        self.worker_lock = threading.Lock()
+        self.worker_tasks = 0
+        self.worker_samples = 0
+        self.worker_stacks = Counter()
+        self.worker_allocations = []
+        self.worker_allocated_bytes = 0
+        self.worker_peak_memory = 0
+
+    def get_worker_options(self):
+        """Picklable arguments for the session a worker process runs around one task"""
+        return {
+            "root_dir": self.root_dir,
+            "interval": self.interval,
+            "top_allocations": self.top_allocations,
+            "traceback_frames": self.traceback_frames,
+        }
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+            self.started_tracemalloc = True
+
+        tracemalloc.reset_peak()
+        self.snapshot = tracemalloc.take_snapshot()
+        self.started_at = time.perf_counter()
+        self.profiler.start()
+
+    def stop(self):
+        self.profiler.stop()
+        self.duration = time.perf_counter() - self.started_at
+
+        _, self.peak_memory = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+
+        ignored = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        self.allocation_diff = snapshot.filter_traces(ignored).compare_to(
+            self.snapshot.filter_traces(ignored), "lineno"
+        )
+        self.snapshot = None
+
+    def get_allocated_bytes(self):
+        return sum(stat.size_diff for stat in self.allocation_diff if stat.size_diff > 0)
+
+    def export(self):
+        """Picklable report of a worker-side session, see `merge_worker`"""
+        return {
+            "samples": self.profiler.samples,
+            "stacks": self.profiler.labelled_stacks(),
+            "peak_memory_bytes": self.peak_memory,
+            "allocated_bytes": self.get_allocated_bytes(),
+            "allocations": [
+                (stat.size_diff, str(stat)) for stat in self.allocation_diff[:self.top_allocations]
+            ],
+        }
+
+    def merge_worker(self, report: dict):
+        with self.worker_lock:
+            self.worker_tasks += 1
+            self.worker_samples += report["samples"]
+            for labels, count in report["stacks"]:
+                self.worker_stacks[labels] += count
+            self.worker_allocations.extend(report["allocations"])
+            self.worker_allocated_bytes += report["allocated_bytes"]
+            self.worker_peak_memory = max(self.worker_peak_memory, report["peak_memory_bytes"])
+
+    def collapsed(self):
+        worker_lines = "".join(
+            ";".join((WORKER_FRAME, *labels)) + f" {count}\n"
+            for labels, count in self.worker_stacks.most_common()
+        )
+        return self.profiler.collapsed() + worker_lines
+
+    def allocations(self):
+        lines = [ f"# peak traced memory during request: {self.peak_memory / 1024:.1f} KiB" ]
+        for stat in self.allocation_diff[:self.top_allocations]:
+            lines.append(str(stat))
+
+        if self.worker_tasks:
+            lines.append(
+                f"# worker processes ({self.worker_tasks} tasks), "
+                f"peak traced memory of one task: {self.worker_peak_memory / 1024:.1f} KiB"
+            )
+            top = sorted(self.worker_allocations, key=lambda item: item[0], reverse=True)
+            lines.extend(line for _, line in top[:self.top_allocations])
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        return {
+            "duration_ms": round(self.duration * 1000, 3),
+            "samples": self.profiler.samples,
+            "distinct_stacks": len(self.profiler.stacks),
+            "peak_memory_bytes": self.peak_memory,
+            "allocated_bytes": self.get_allocated_bytes(),
+            "worker_tasks": self.worker_tasks,
+            "worker_samples": self.worker_samples,
+            "worker_peak_memory_bytes": self.worker_peak_memory,
+            "worker_allocated_bytes": self.worker_allocated_bytes,
+        }
+
+
+class ProfilingMiddleware:
+    """Profiles requests carrying `X-Profile: 1` (or `?profile=1`) and a valid `X-Admin-Token`.
+
+    Only installed when profiling is enabled, so unflagged traffic pays nothing
+    when it is off. One request is profiled at a time, as both tracemalloc and
+    the sampler are process-wide; concurrent flagged requests run unprofiled.
+    """
+
+    def __init__(self, app, profile_controller, admin_token: str, root_dir: str,
+                 interval: float = 0.005, top_allocations: int = 30):
+        self.app = app
+        self.profile_controller = profile_controller
+        self.admin_token = admin_token.encode("latin-1")
+        self.root_dir = root_dir
+        self.interval = interval
+        self.top_allocations = top_allocations
+        self.lock = threading.Lock()
+
+    def is_requested(self, scope):
+        headers = dict(scope["headers"])
+        flagged = headers.get(b"x-profile") in (b"1", b"true") or b"profile=1" in scope.get("query_string", b"").split(b"&")
+        return flagged and hmac.compare_digest(headers.get(b"x-admin-token", b""), self.admin_token)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.is_requested(scope):
+            return await self.app(scope, receive, send)
+
+        if not self.lock.acquire(blocking=False):
+            return await self.app(scope, receive, send)
+
+        try:
+            profile_id = self.profile_controller.generate_profile_id()
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-profile-id", profile_id.encode("latin-1"))
+                    ]
+                await send(message)
+
+            session = ProfilingSession(
+                root_dir=self.root_dir,
+                interval=self.interval,
+                top_allocations=self.top_allocations,
+            )
+
+            session.start()
+            token = request_profile.set(session)
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                request_profile.reset(token)
+                session.stop()
+        finally:
+            self.lock.release()
+
+        # Writing the report must not delay the next request on the event loop
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.profile_controller.save_profile,
+            profile_id,
+            { "method": scope["method"], "path": scope["path"], **session.summary() },
+            session.collapsed(),
+            session.allocations(),
+        )
@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from .metrics import SCATTER_GATHER_SHARDS
+import contextvars
+import logging
+import heapq
+import time
+
+
+class ScatterGather:
+    """Runs one call per shard (project) concurrently and merges their ranked results.
+
+    Every shard gets the same time budget, counted from submission: shards that
+    have not answered by then are reported as timed out and left out of the
+    merge, so one slow collection cannot hold the whole request.
+    """
+
+    def __init__(self, max_workers: int = 16, shard_timeout: float = None, min_score: float = None):
+        self.shard_timeout = shard_timeout
+        self.min_score = min_score
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scatter-gather")
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def timed(fn):
+        started = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - started
+
+    def gather(self, calls: dict, timeout: float = None):
+        """Run `{key: fn}` concurrently; returns `{key: {"status", "result", "seconds"}}`"""
+        timeout = timeout if timeout is not None else self.shard_timeout
+        started = time.perf_counter()
+
+        # Each call runs in a copy of the caller's context, so its stages still reach Server-Timing
+        futures = {
+            self.executor.submit(contextvars.copy_context().run, self.timed, fn): key
+            for key, fn in calls.items()
+        }
+        done, _ = wait(futures, timeout=timeout)
+
+        outcomes = {}
+        for future, key in futures.items():
+            if future not in done:
+                # Queued calls are dropped; running ones finish in the background and are ignored
+                future.cancel()
+                outcome = { "status": "timeout", "result": None, "seconds": time.perf_counter() - started }
+            elif future.exception() is not None:
+                self.logger.error(f"Shard {key} failed: {future.exception()}")
+                outcome = { "status": "error", "result": None, "seconds": time.perf_counter() - started }
+            else:
+                result, seconds = future.result()
+                outcome = { "status": "ok" if result else "empty", "result": result, "seconds": seconds }
+
+            SCATTER_GATHER_SHARDS.inc(status=outcome["status"])
+            outcomes[key] = outcome
+
+        return outcomes
+
+    def merge_top_k(self, shard_documents: dict, limit: int):
+        """Top `limit` of `{key: [RetrievedDocument]}` by score, as (key, document)
+
+        Every shard is queried with the same embedding and distance, so raw scores
+        are comparable across shards and keep their absolute relevance: a shard
+        with only weak matches does not get a top hit as good as the others'.
+        Documents below `min_score` are dropped.
+        """
+        candidates = (
+            (key, document)
+            for key, documents in shard_documents.items() if documents
+            for document in documents
+            if self.min_score is None or document.score >= self.min_score
+        )
+        # The key avoids ever comparing two documents
+        return heapq.nlargest(limit, candidates, key=lambda item: item[1].score)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,49 @@
+import asyncio
+from .metrics import CACHE_REQUESTS
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one shared in-flight computation"""
+
+    def __init__(self):
+        self.in_flight = {}
+        self.stats = {}
+
+    @staticmethod
+    def normalize_text(text: str):
+        return " ".join(text.split()).casefold()
+
+    def get_counters(self, operation: str):
+        if operation not in self.stats:
+            self.stats[operation] = { "calls": 0, "executions": 0, "coalesced": 0 }
+        return self.stats[operation]
+
+    async def do(self, operation: str, key: tuple, fn):
+        """Await `fn()` once per key; callers arriving while it runs share its result.
+
+        The computation runs as its own task, so a disconnecting caller never
+        cancels the work other callers are waiting on.
+        """
+        counters = self.get_counters(operation)
+        counters["calls"] += 1
+
+        flight_key = (operation, key)
+        task = self.in_flight.get(flight_key)
+
+        if task is None:
+            counters["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self.in_flight[flight_key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(flight_key, None))
+            CACHE_REQUESTS.inc(cache=f"single_flight_{operation}", result="miss")
+        else:
+            counters["coalesced"] += 1
+            CACHE_REQUESTS.inc(cache=f"single_flight_{operation}", result="hit")
+
+        return await asyncio.shield(task)
+
+    def get_stats(self):
+        return {
+            "in_flight": len(self.in_flight),
+            "operations": { operation: dict(counters) for operation, counters in self.stats.items() },
+        }
@@ -0,0 +1,146 @@
+from models.chunks import TextChunk
+from functools import lru_cache
+
+DEFAULT_SEPARATORS = ("\n\n", "\n", " ", "")
+
+
+class SpanTextSplitter:
+    """Recursive character splitter that works on offsets instead of strings.
+
+    Reproduces langchain's RecursiveCharacterTextSplitter (keep_separator=True,
+    strip_whitespace=True, length_function=len) chunk for chunk, but every
+    intermediate split is a (start, end) pair over the source text, so no
+    substring is copied until a chunk's text is actually read.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int, separators: tuple = DEFAULT_SEPARATORS):
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size "
+                f"({chunk_size}), should be smaller."
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+
+    def split_spans(self, text: str):
+        """(start, end) offsets of every chunk of `text`"""
+        return self._split(text, 0, len(text), self.separators)
+
+    def iter_spans(self, texts: list):
+        """(doc_index, start, end) for every chunk of every text"""
+        for doc_index, text in enumerate(texts):
+            for start, end in self.split_spans(text):
+                yield doc_index, start, end
+
+    def iter_chunks(self, texts: list, metadatas: list = None):
+        # Unlike langchain's create_documents, metadata is shared by reference, not deep-copied
+        for doc_index, start, end in self.iter_spans(texts):
+            yield TextChunk(
+                text=texts[doc_index],
+                start=start,
+                end=end,
+                metadata=metadatas[doc_index] if metadatas else {},
+            )
+
+    def create_chunks(self, texts: list, metadatas: list = None):
+        return list(self.iter_chunks(texts, metadatas))
+
+    def _split(self, text: str, start: int, end: int, separators: tuple):
+        final_spans = []
+
+        # Use the first separator present in this range; deeper ones are for oversized pieces
+        separator = separators[-1]
+        new_separators = ()
+        for i, candidate in enumerate(separators):
+            if candidate == "":
+                separator = candidate
+                break
+            if text.find(candidate, start, end) != -1:
+                separator = candidate
+                new_separators = separators[i + 1:]
+                break
+
+        good_splits = []
+        for split_start, split_end in self._split_on_separator(text, start, end, separator):
+            if split_end - split_start < self.chunk_size:
+                good_splits.append((split_start, split_end))
+                continue
+
+            if good_splits:
+                final_spans.extend(self._merge_splits(text, good_splits))
+                good_splits = []
+
+            if not new_separators:
+                final_spans.append((split_start, split_end))
+            else:
+                final_spans.extend(self._split(text, split_start, split_end, new_separators))
+
+        if good_splits:
+            final_spans.extend(self._merge_splits(text, good_splits))
+
+        return final_spans
+
+    @staticmethod
+    def _split_on_separator(text: str, start: int, end: int, separator: str):
+        if separator == "":
+            return [ (i, i + 1) for i in range(start, end) ]
+
+        # Separators stay attached to the piece that follows them (keep_separator=True)
+        splits = []
+        piece_start = start
+        position = text.find(separator, start, end)
+        while position != -1:
+            if position > piece_start:
+                splits.append((piece_start, position))
+            piece_start = position
+            position = text.find(separator, position + len(separator), end)
+
+        if end > piece_start:
+            splits.append((piece_start, end))
+
+        return splits
+
+    @staticmethod
+    def _strip_span(text: str, start: int, end: int):
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return (start, end) if end > start else None
+
+    def _merge_splits(self, text: str, splits: list):
+        # Adjacent splits are contiguous, so a window of them is just (first start, last end)
+        spans = []
+        window_start = 0
+        total = 0
+
+        for idx, (split_start, split_end) in enumerate(splits):
+            split_len = split_end - split_start
+
+            if total + split_len > self.chunk_size and idx > window_start:
+                span = self._strip_span(text, splits[window_start][0], splits[idx - 1][1])
+                if span is not None:
+                    spans.append(span)
+
+                # Slide the window until only the overlap is left and the next split fits
+                while total > self.chunk_overlap or (
+                    total + split_len > self.chunk_size and total > 0
+                ):
+                    total -= splits[window_start][1] - splits[window_start][0]
+                    window_start += 1
+
+            total += split_len
+
+        if window_start < len(splits):
+            span = self._strip_span(text, splits[window_start][0], splits[-1][1])
+            if span is not None:
+                spans.append(span)
+
+        return spans
+
+
+@lru_cache(maxsize=32)
+def get_text_splitter(chunk_size: int, chunk_overlap: int):
+    """Splitters are stateless, so one instance per configuration is shared"""
+    return SpanTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
@@ -1,13 +1,44 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import base , data , nlp
+from fastapi.middleware.gzip import GZipMiddleware
+from routes import base , data , nlp , debug
 from helpers.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
-from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from helpers.clients import create_generation_client, create_embedding_client, create_vectordb_client
+from stores.sessions import SessionStore
+from helpers.singleflight import SingleFlight
+from helpers.scatter_gather import ScatterGather
+from helpers.executors import ExecutorManager
 from templates.TemplateParser import TemplateParser
+from controllers.BaseController import BaseController
+from controllers import ProfileController
+from helpers.metrics import MetricsMiddleware
+from helpers.profiling import ProfilingMiddleware
+from helpers.admission import AdmissionController, AdmissionMiddleware
+from helpers.lazy import LazyObject, WarmUp
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+import asyncio
+import os
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serve /health/live immediately; providers and the vector DB are built behind it
+    warmup_task = None
+    if app.warm_up.enabled:
+        warmup_task = asyncio.create_task(run_in_threadpool(app.warm_up.run))
+
+    yield
+
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+
+    app.scatter_gather.shutdown()
+    app.executors.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -19,24 +50,107 @@ app.add_middleware(
 )
 
 settings = get_settings()
-llm_provider_factory = LLMProviderFactory(settings)
-vectordb_provider_factory = VectorDBProviderFactory(settings)
 
-app.generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
-app.generation_client.set_generation_model(settings.GENERATION_MODEL_ID)
+# Large responses (e.g. /data/process pages and NDJSON streams) are gzipped on request
+if settings.RESPONSE_GZIP_ENABLED:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.RESPONSE_GZIP_MIN_SIZE)
+
+# Per-route-class concurrency limits; saturated classes are shed with a fast 503
+app.admission = None
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.admission = AdmissionController(
+        limits=settings.ADMISSION_LIMITS,
+        max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+        reserved=settings.ADMISSION_INTERACTIVE_RESERVED,
+    )
+    app.add_middleware(AdmissionMiddleware, admission=app.admission)
 
-app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
-app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID, embedding_size=settings.EMBEDDING_MODEL_SIZE)
+# Request latency histograms, plus per-stage Server-Timing headers when enabled
+app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
+# Admin-only, per-request CPU/memory profiling; not even installed unless enabled
+profiling_enabled = settings.PROFILING_ENABLED and bool(settings.ADMIN_TOKEN)
+if profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        profile_controller=ProfileController(max_profiles=settings.PROFILING_MAX_PROFILES),
+        admin_token=settings.ADMIN_TOKEN,
+        root_dir=BaseController().base_dir,
+        interval=settings.PROFILING_SAMPLE_INTERVAL_MS / 1000.0,
+    )
+
+# Nothing below touches a provider SDK or opens the vector DB until first use or warm-up
+llm_provider_factory = LazyObject(lambda: LLMProviderFactory(settings), name="llm_provider_factory")
+app.rate_limiters = LazyObject(lambda: llm_provider_factory.rate_limiters, name="rate_limiters")
+app.http_transport = LazyObject(lambda: llm_provider_factory.http_transport, name="http_transport")
+
+app.generation_client = LazyObject(
+    lambda: create_generation_client(settings, llm_provider_factory), name="generation_client"
+)
+app.request_deadline_seconds = settings.REQUEST_DEADLINE_SECONDS
+
+app.embedding_client = LazyObject(
+    lambda: create_embedding_client(settings, llm_provider_factory), name="embedding_client"
+)
 
 # Initialize vector database client
-app.vectordb_client = vectordb_provider_factory.create(provider=settings.VECTOR_DB_BACKEND)
-app.vectordb_client.connect()
+app.vectordb_client = LazyObject(lambda: create_vectordb_client(settings), name="vectordb_client")
 
-# Simple template parser for RAG prompts
-app.template_parser = TemplateParser()
+app.warm_up = WarmUp(
+    components={
+        "vectordb": app.vectordb_client,
+        "embedding": app.embedding_client,
+        "generation": app.generation_client,
+    },
+    enabled=settings.STARTUP_WARMUP_ENABLED,
+)
+
+# File-backed, precompiled templates for RAG prompts
+app.template_parser = TemplateParser(
+    language=settings.PRIMARY_LANG,
+    default_language=settings.DEFAULT_LANG,
+    reload_interval=settings.TEMPLATES_RELOAD_INTERVAL,
+)
+
+# Server-side conversation sessions, spilled to SQLite once evicted from memory
+session_sqlite_path = None
+if settings.SESSION_SQLITE_DB:
+    session_sqlite_path = os.path.join(
+        BaseController().get_database_path(db_name="sessions"),
+        settings.SESSION_SQLITE_DB
+    )
+
+app.session_store = SessionStore(
+    max_sessions=settings.SESSION_MAX_ENTRIES,
+    ttl_seconds=settings.SESSION_TTL_SECONDS,
+    max_turns=settings.SESSION_MAX_TURNS,
+    max_documents=settings.SESSION_MAX_DOCUMENTS,
+    sqlite_path=session_sqlite_path,
+)
+app.session_history_turns = settings.SESSION_HISTORY_TURNS
+
+# Coalesces identical in-flight search/answer requests
+app.single_flight = SingleFlight()
+
+# Fans multi-project searches out over one bounded pool
+app.scatter_gather = ScatterGather(
+    max_workers=settings.MULTI_SEARCH_MAX_WORKERS,
+    shard_timeout=settings.MULTI_SEARCH_SHARD_TIMEOUT_SECONDS,
+    min_score=settings.MULTI_SEARCH_MIN_SCORE,
+)
+app.multi_search_max_projects = settings.MULTI_SEARCH_MAX_PROJECTS
+
+# Worker processes for file parsing/splitting and threads for blocking ingest I/O
+app.executors = ExecutorManager(
+    process_workers=settings.INGEST_MAX_WORKERS,
+    thread_workers=settings.IO_MAX_WORKERS,
+)
 
 app.include_router(base.base_router)
 app.include_router(data.data_router)
 app.include_router(nlp.nlp_router)
 
+if profiling_enabled:
+    app.include_router(debug.debug_router)
+
 
@@ -1,2 +1,4 @@
 from .enums.ResponseEnums import ResponseSignal
-from .enums.ProcessingEnum import ProcessingEnum
\ No newline at end of file
+from .enums.ProcessingEnum import ProcessingEnum
+from .enums.RetrievalEnum import RetrievalModeEnum
+from .enums.AnswerEnum import AnswerPathEnum
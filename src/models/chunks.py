@@ -0,0 +1,91 @@
+import sys
+
+
+def intern_value(value):
+    # Only str can be interned; anything else (None, numbers) is kept as-is
+    return sys.intern(value) if type(value) is str else value
+
+
+class FileInfo:
+    """File- and dataset-level metadata, shared by reference by every chunk of a file"""
+
+    __slots__ = ("file_id", "metadata")
+
+    def __init__(self, file_id: str, metadata: dict):
+        self.file_id = file_id
+        self.metadata = metadata
+
+
+class QAChunk:
+    """Compact Q&A record: question and answer kept apart, low-cardinality codes interned.
+
+    Exposes the same `page_content` / `metadata` as a langchain Document, but
+    both are built on access, so a file of Q&A pairs carries one copy of its
+    file-level metadata instead of one per pair.
+    """
+
+    __slots__ = ("question", "answer", "language", "category", "keywords", "source", "file_info")
+
+    def __init__(self, question: str, answer: str, language: str, category: str,
+                 keywords: list, source: str, file_info: FileInfo):
+        self.question = question
+        self.answer = answer
+        self.language = intern_value(language)
+        self.category = intern_value(category)
+        self.keywords = tuple(intern_value(keyword) for keyword in keywords or ())
+        self.source = intern_value(source)
+        self.file_info = file_info
+
+    @property
+    def page_content(self):
+        return f"Question: {self.question}\nAnswer: {self.answer}"
+
+    @property
+    def metadata(self):
+        return {
+            "language": self.language,
+            "category": self.category,
+            "keywords": list(self.keywords),
+            "source": self.source,
+            **self.file_info.metadata,
+        }
+
+    @property
+    def payload_metadata(self):
+        """Per-record metadata for the vector DB; file-level fields are joined via file_id.
+
+        Question and answer are kept as their own fields so a stored answer can be
+        returned as-is when a query matches its question.
+        """
+        return {
+            "question": self.question,
+            "answer": self.answer,
+            "language": self.language,
+            "category": self.category,
+            "keywords": list(self.keywords),
+            "source": self.source,
+            "file_id": self.file_info.file_id,
+        }
+
+
+class TextChunk:
+    """A chunk as a (start, end) span over its source text.
+
+    The source text and metadata dict are shared by every chunk cut from the
+    same record; the chunk's own string is only sliced out when read.
+    """
+
+    __slots__ = ("text", "start", "end", "metadata")
+
+    def __init__(self, text: str, start: int, end: int, metadata: dict):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.metadata = metadata
+
+    @property
+    def page_content(self):
+        return self.text[self.start:self.end]
+
+    def __len__(self):
+        return self.end - self.start
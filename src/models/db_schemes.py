@@ -1,8 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Optional, Union, List
 
 
 class RetrievedDocument(BaseModel):
     score: float
     text: str
+    id: Optional[Union[int, str]] = None
+    # Only populated for reranking, never serialized back to clients
+    vector: Optional[List[float]] = Field(default=None, exclude=True)
+    # Payload metadata for server-side decisions (e.g. the stored Q&A answer), not serialized
+    metadata: Optional[dict] = Field(default=None, exclude=True)
+
 
 
@@ -0,0 +1,9 @@
+from enum import Enum
+
+class AnswerPathEnum(Enum):
+
+    # Stored answer of a matching curated question, no generation call
+    EXTRACTIVE = "extractive"
+    GENERATED = "generated"
+    # Generation failed or timed out, the top document is returned instead
+    TOP_DOCUMENT = "top_document"
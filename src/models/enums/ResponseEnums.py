@@ -9,14 +9,43 @@ class ResponseSignal(Enum):
     FILE_UPLOAD_FAILED = "file_upload_failed"
     PROCESSING_SUCCESS = "processing_success"
     PROCESSING_FAILED = "processing_failed"
+    FILE_NOT_FOUND = "file_not_found"
+    INVALID_FILE_FORMAT = "invalid_file_format"
+    INVALID_CURSOR = "invalid_cursor"
     NO_FILES_ERROR = "not_found_files"
     FILE_ID_ERROR = "no_file_found_with_this_id"
     PROJECT_NOT_FOUND_ERROR = "project_not_found"
     INSERT_INTO_VECTORDB_ERROR = "insert_into_vectordb_error"
     INSERT_INTO_VECTORDB_SUCCESS = "insert_into_vectordb_success"
+    PROJECT_INGEST_PARTIAL = "project_ingest_partial"
+    SNAPSHOT_CREATED = "snapshot_created"
+    SNAPSHOT_EMPTY = "snapshot_empty_collection"
+    SNAPSHOTS_RETRIEVED = "snapshots_retrieved"
+    SNAPSHOT_NOT_FOUND = "snapshot_not_found"
+    SNAPSHOT_INCOMPATIBLE = "snapshot_incompatible_embedding_model"
+    SNAPSHOT_CORRUPTED = "snapshot_checksum_mismatch"
+    SNAPSHOT_IMPORTED = "snapshot_imported"
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved"
     VECTORDB_SEARCH_ERROR = "vectordb_search_error"
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success"
     RAG_ANSWER_ERROR = "rag_answer_error"
+    SESSION_NOT_FOUND = "session_not_found"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
-    
\ No newline at end of file
+    MULTI_SEARCH_TOO_MANY_PROJECTS = "multi_search_too_many_projects"
+    PROVIDER_THROTTLED = "provider_throttled"
+    PROVIDER_ERROR = "provider_error"
+    REQUEST_DEADLINE_EXCEEDED = "request_deadline_exceeded"
+    SERVER_OVERLOADED = "server_overloaded"
+    ADMIN_TOKEN_INVALID = "admin_token_invalid"
+    PROFILES_RETRIEVED = "profiles_retrieved"
+    PROFILE_NOT_FOUND = "profile_not_found"
+    
+    UPLOAD_SESSION_CREATED = "upload_session_created"
+    UPLOAD_SESSION_RETRIEVED = "upload_session_retrieved"
+    UPLOAD_SESSION_NOT_FOUND = "upload_session_not_found"
+    UPLOAD_SESSION_ABORTED = "upload_session_aborted"
+    UPLOAD_PART_RECEIVED = "upload_part_received"
+    UPLOAD_PART_INVALID = "upload_part_invalid"
+    UPLOAD_PART_SIZE_INVALID = "upload_part_size_invalid"
+    UPLOAD_INCOMPLETE = "upload_incomplete"
+    UPLOAD_HASH_MISMATCH = "upload_hash_mismatch"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+class RetrievalModeEnum(Enum):
+
+    REUSE = "reuse"
+    EXTEND = "extend"
+    REFRESH = "refresh"
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, FastAPI, Depends
+from fastapi import APIRouter, FastAPI, Depends, Request, status
+from fastapi.responses import PlainTextResponse, JSONResponse
 from helpers import get_settings, Settings
+from helpers.metrics import REGISTRY
 
 base_router = APIRouter()
 
@@ -11,4 +13,41 @@ async def welcome(app_settings:Settings = Depends(get_settings)):
         "message": "Welcome to EGRONX-AI-Chatbot",
         "app_name": app_name,
         "app_version": app_version
-        }
\ No newline at end of file
+        }
+
+@base_router.get("/health/live")
+async def health_live():
+    # The process is up and serving; says nothing about providers or the vector DB
+    return { "status": "ok" }
+
+@base_router.get("/health/ready")
+async def health_ready(request: Request):
+    warm_up_status = request.app.warm_up.get_status()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if warm_up_status["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=warm_up_status,
+    )
+
+@base_router.get("/stats")
+async def stats(request: Request):
+    stats = {
+        "single_flight": request.app.single_flight.get_stats(),
+        "rate_limiters": request.app.rate_limiters.get_stats(),
+        "http_pool": request.app.http_transport.get_stats(),
+        "executors": request.app.executors.get_stats(),
+    }
+
+    if request.app.admission is not None:
+        stats["admission"] = request.app.admission.get_stats()
+
+    if hasattr(request.app.generation_client, "get_stats"):
+        stats["generation"] = request.app.generation_client.get_stats()
+
+    if hasattr(request.app.embedding_client, "get_stats"):
+        stats["embedding_batcher"] = request.app.embedding_client.get_stats()
+
+    return stats
+
+@base_router.get("/metrics")
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type=REGISTRY.CONTENT_TYPE)
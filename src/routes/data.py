@@ -1,11 +1,17 @@
-from fastapi import FastAPI, APIRouter, Depends, UploadFile, status
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, Depends, UploadFile, Request, status
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from helpers import get_settings, Settings
-from controllers import DataController, ProjectController, ProcessController
+from controllers import DataController, ProjectController, ProcessController, UploadController
+from controllers.ProcessController import parse_file, parse_file_page
 import aiofiles
+import asyncio
+import hashlib
+import orjson
+import os
 from models import ResponseSignal
 import logging
-from .schemes import ProcessRequest
+from .schemes import ProcessRequest, UploadInitRequest
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -38,9 +44,13 @@ async def upload_data(project_id: str, file: UploadFile,
         project_id=project_id
     )
 
+    # Hash while streaming so identical content is detected without a second read
+    hasher = hashlib.sha256()
+
     try:
         async with aiofiles.open(file_path, "wb") as f:
             while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                hasher.update(chunk)
                 await f.write(chunk)
     except Exception as e:
 
@@ -53,16 +63,228 @@ async def upload_data(project_id: str, file: UploadFile,
             }
         )
 
+    # Re-uploads of the same content resolve to the file already stored in the project
+    file_hash = hasher.hexdigest()
+    canonical_file_id = data_controller.register_file_hash(
+        project_id=project_id, file_hash=file_hash, file_id=file_id
+    )
+    if canonical_file_id != file_id:
+        os.remove(file_path)
+
     return JSONResponse(
             content={
                 "signal": ResponseSignal.FILE_UPLOAD_SUCCESS.value,
-                "file_id": file_id
+                "file_id": canonical_file_id,
+                "sha256": file_hash,
+                "deduplicated": canonical_file_id != file_id
             }
         )
 
 
+def upload_session_not_found_response():
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content={
+            "signal": ResponseSignal.UPLOAD_SESSION_NOT_FOUND.value
+        }
+    )
+
+
+@data_router.post("/upload/{project_id}/init")
+async def init_resumable_upload(project_id: str, init_request: UploadInitRequest):
+
+    upload_controller = UploadController()
+
+    is_valid, result_signal = upload_controller.validate_upload_request(
+        content_type=init_request.content_type,
+        file_size=init_request.file_size
+    )
+
+    if is_valid:
+        is_valid, result_signal = upload_controller.validate_part_size(
+            file_size=init_request.file_size,
+            part_size=init_request.part_size
+        )
+
+    if not is_valid:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": result_signal
+            }
+        )
+
+    # A known hash skips the transfer entirely
+    if init_request.sha256:
+        existing_file_id = upload_controller.find_file_by_hash(
+            project_id=project_id, file_hash=init_request.sha256.lower()
+        )
+        if existing_file_id:
+            return JSONResponse(
+                content={
+                    "signal": ResponseSignal.FILE_UPLOAD_SUCCESS.value,
+                    "file_id": existing_file_id,
+                    "sha256": init_request.sha256.lower(),
+                    "deduplicated": True
+                }
+            )
+
+    manifest = upload_controller.create_upload(
+        project_id=project_id,
+        file_name=init_request.file_name,
+        content_type=init_request.content_type,
+        file_size=init_request.file_size,
+        file_hash=init_request.sha256,
+        part_size=init_request.part_size,
+    )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.UPLOAD_SESSION_CREATED.value,
+            "upload_id": manifest["upload_id"],
+            "part_size": manifest["part_size"],
+            "total_parts": manifest["total_parts"]
+        }
+    )
+
+
+@data_router.put("/upload/{project_id}/{upload_id}/parts/{part_number}")
+async def upload_part(request: Request, project_id: str, upload_id: str, part_number: int):
+
+    upload_controller = UploadController()
+    upload_path = upload_controller.get_upload_path(project_id=project_id, upload_id=upload_id)
+
+    if upload_path is None:
+        return upload_session_not_found_response()
+
+    manifest = upload_controller.get_manifest(upload_path=upload_path)
+    expected_size = upload_controller.get_expected_part_size(manifest=manifest, part_number=part_number)
+
+    if expected_size is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.UPLOAD_PART_INVALID.value,
+                "message": f"part_number must be between 1 and {manifest['total_parts']}"
+            }
+        )
+
+    # Parts land in a temp file and are only renamed once complete, so a dropped
+    # connection leaves the part missing rather than truncated
+    part_path = upload_controller.get_part_path(upload_path, part_number)
+    tmp_path = part_path + ".tmp"
+    hasher = hashlib.sha256()
+    received = 0
+
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > expected_size:
+                    break
+                hasher.update(chunk)
+                await f.write(chunk)
+    except Exception as e:
+        logger.error(f"Error while uploading part {part_number} of {upload_id}: {e}")
+        received = -1
+
+    if received != expected_size:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.UPLOAD_PART_INVALID.value,
+                "message": f"part {part_number} must be exactly {expected_size} bytes"
+            }
+        )
+
+    os.replace(tmp_path, part_path)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.UPLOAD_PART_RECEIVED.value,
+            "part_number": part_number,
+            "size": received,
+            "sha256": hasher.hexdigest()
+        }
+    )
+
+
+@data_router.get("/upload/{project_id}/{upload_id}")
+async def get_upload_status(project_id: str, upload_id: str):
+
+    upload_controller = UploadController()
+    upload_path = upload_controller.get_upload_path(project_id=project_id, upload_id=upload_id)
+
+    if upload_path is None:
+        return upload_session_not_found_response()
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.UPLOAD_SESSION_RETRIEVED.value,
+            "upload": upload_controller.get_upload_status(upload_path=upload_path)
+        }
+    )
+
+
+@data_router.post("/upload/{project_id}/{upload_id}/complete")
+async def complete_resumable_upload(project_id: str, upload_id: str):
+
+    upload_controller = UploadController()
+    upload_path = upload_controller.get_upload_path(project_id=project_id, upload_id=upload_id)
+
+    if upload_path is None:
+        return upload_session_not_found_response()
+
+    # Concatenating and hashing a large file is blocking disk work
+    result_signal, file_id, file_hash, deduplicated = await run_in_threadpool(
+        upload_controller.assemble_upload,
+        project_id=project_id,
+        upload_path=upload_path
+    )
+
+    if file_id is None:
+        content = { "signal": result_signal, "sha256": file_hash }
+        if result_signal == ResponseSignal.UPLOAD_INCOMPLETE.value:
+            content["missing_parts"] = upload_controller.get_upload_status(upload_path=upload_path)["missing_parts"]
+
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content=content
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.FILE_UPLOAD_SUCCESS.value,
+            "file_id": file_id,
+            "sha256": file_hash,
+            "deduplicated": deduplicated
+        }
+    )
+
+
+@data_router.delete("/upload/{project_id}/{upload_id}")
+async def abort_resumable_upload(project_id: str, upload_id: str):
+
+    upload_controller = UploadController()
+    upload_path = upload_controller.get_upload_path(project_id=project_id, upload_id=upload_id)
+
+    if upload_path is None:
+        return upload_session_not_found_response()
+
+    upload_controller.delete_upload(upload_path=upload_path)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.UPLOAD_SESSION_ABORTED.value
+        }
+    )
+
+
 @data_router.post("/process/{project_id}")
-async def process_endpoint(project_id: str, process_request: ProcessRequest):
+async def process_endpoint(request: Request, project_id: str, process_request: ProcessRequest,
+                           app_settings: Settings = Depends(get_settings)):
     try:
         file_id = process_request.file_id
         chunk_size = process_request.chunk_size
@@ -70,15 +292,74 @@ async def process_endpoint(project_id: str, process_request: ProcessRequest):
 
         process_controller = ProcessController(project_id=project_id)
 
-        # Use the complete pipeline method instead of separate calls
-        file_chunks = process_controller.process_file(
+        position = { "offset": 0, "record": 0, "skip": 0 }
+        if process_request.cursor:
+            position = process_controller.decode_cursor(cursor=process_request.cursor, file_id=file_id)
+            if position is None:
+                return ORJSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={
+                        "signal": ResponseSignal.INVALID_CURSOR.value
+                    }
+                )
+        offset = position["offset"]
+
+        # Streaming / paginated modes: pages are split in the worker processes, resuming at the cursor's position
+        if process_request.stream or process_request.page_size:
+            page_size = min(process_request.page_size or app_settings.PROCESS_MAX_PAGE_SIZE,
+                            app_settings.PROCESS_MAX_PAGE_SIZE)
+
+            def get_page(position: dict):
+                return request.app.executors.run_cpu(
+                    parse_file_page,
+                    project_id=project_id,
+                    file_id=file_id,
+                    page_size=page_size,
+                    chunk_size=chunk_size,
+                    overlap_size=overlap_size,
+                    **position
+                )
+
+            # The first page is read eagerly so missing or unsupported files fail before any response
+            page, next_position = await get_page(position)
+
+            if process_request.stream:
+                return StreamingResponse(
+                    iter_ndjson_pages(page, next_position, get_page, first_chunk_id=offset),
+                    media_type="application/x-ndjson"
+                )
+
+            next_cursor = None
+            if next_position is not None:
+                next_cursor = process_controller.encode_cursor(file_id=file_id, **next_position)
+
+            return ORJSONResponse(
+                status_code=status.HTTP_200_OK,
+                content={
+                    "signal": ResponseSignal.PROCESSING_SUCCESS.value,
+                    "data": {
+                        "project_id": project_id,
+                        "file_id": file_id,
+                        "returned_chunks": len(page),
+                        "chunk_size": chunk_size,
+                        "overlap_size": overlap_size,
+                        "chunks": serialize_chunks(page, first_chunk_id=offset),
+                        "next_cursor": next_cursor
+                    }
+                }
+            )
+
+        # Loading and splitting are CPU-bound: run them in the worker processes, off the event loop
+        file_chunks = await request.app.executors.run_cpu(
+            parse_file,
+            project_id=project_id,
             file_id=file_id,
             chunk_size=chunk_size,
             overlap_size=overlap_size
         )
 
         if file_chunks is None or len(file_chunks) == 0:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
                     "signal": ResponseSignal.PROCESSING_FAILED.value
@@ -86,15 +367,9 @@ async def process_endpoint(project_id: str, process_request: ProcessRequest):
             )
 
         # Convert Document objects to serializable format
-        serialized_chunks = []
-        for chunk in file_chunks:
-            serialized_chunks.append({
-                "content": chunk.page_content,
-                "metadata": chunk.metadata,
-                "chunk_id": len(serialized_chunks)  # Add chunk ID for reference
-            })
+        serialized_chunks = serialize_chunks(file_chunks)
 
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_200_OK,
             content={
                 "signal": ResponseSignal.PROCESSING_SUCCESS.value,
@@ -110,7 +385,7 @@ async def process_endpoint(project_id: str, process_request: ProcessRequest):
         )
 
     except FileNotFoundError as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={
                 "signal": ResponseSignal.FILE_NOT_FOUND.value,
@@ -119,7 +394,7 @@ async def process_endpoint(project_id: str, process_request: ProcessRequest):
         )
     
     except ValueError as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
                 "signal": ResponseSignal.INVALID_FILE_FORMAT.value,
@@ -128,10 +403,60 @@ async def process_endpoint(project_id: str, process_request: ProcessRequest):
         )
     
     except Exception as e:
-        return JSONResponse(
+        logger.error(f"Error while processing file: {e}")
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "signal": ResponseSignal.PROCESSING_FAILED.value,
                 "message": "An unexpected error occurred during processing"
             }
-        )
\ No newline at end of file
+        )
+
+
+def serialize_chunks(chunks, first_chunk_id: int = 0):
+    return [
+        {
+            "content": chunk.page_content,
+            "metadata": chunk.metadata,
+            "chunk_id": first_chunk_id + idx  # Add chunk ID for reference
+        }
+        for idx, chunk in enumerate(chunks)
+    ]
+
+
+async def iter_ndjson_pages(page: list, next_position: dict, get_page, first_chunk_id: int = 0):
+    """NDJSON of a file page by page, splitting the next page in a worker while this one is sent"""
+    chunk_id = first_chunk_id
+    while True:
+        next_page = asyncio.ensure_future(get_page(next_position)) if next_position is not None else None
+        try:
+            for data in iter_ndjson_chunks(page, first_chunk_id=chunk_id):
+                yield data
+        except BaseException:
+            if next_page is not None:
+                next_page.cancel()
+            raise
+
+        if next_page is None:
+            return
+        chunk_id += len(page)
+        page, next_position = await next_page
+
+
+def iter_ndjson_chunks(chunks, first_chunk_id: int = 0, flush_size: int = 65536):
+    """One JSON object per line, buffered into ~64KB writes instead of one send per chunk"""
+    buffer = bytearray()
+    for chunk_id, chunk in enumerate(chunks, start=first_chunk_id):
+        buffer += orjson.dumps({
+            "content": chunk.page_content,
+            "metadata": chunk.metadata,
+            "chunk_id": chunk_id
+        })
+        buffer += b"\n"
+
+        if len(buffer) >= flush_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield bytes(buffer)
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, Header, status
+from fastapi.responses import JSONResponse, FileResponse
+from helpers import get_settings, Settings
+from controllers import ProfileController
+from models import ResponseSignal
+from typing import Optional
+import hmac
+import os
+
+debug_router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+)
+
+def is_admin(admin_token: Optional[str], app_settings: Settings):
+    if not app_settings.ADMIN_TOKEN or not admin_token:
+        return False
+    return hmac.compare_digest(admin_token.encode("utf-8"), app_settings.ADMIN_TOKEN.encode("utf-8"))
+
+def admin_token_invalid_response():
+    return JSONResponse(
+        status_code=status.HTTP_403_FORBIDDEN,
+        content={
+            "signal": ResponseSignal.ADMIN_TOKEN_INVALID.value
+        }
+    )
+
+@debug_router.get("/profiles")
+async def list_profiles(x_admin_token: Optional[str] = Header(default=None),
+                        app_settings: Settings = Depends(get_settings)):
+
+    if not is_admin(x_admin_token, app_settings):
+        return admin_token_invalid_response()
+
+    profile_controller = ProfileController(max_profiles=app_settings.PROFILING_MAX_PROFILES)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.PROFILES_RETRIEVED.value,
+            "profiles": profile_controller.list_profiles()
+        }
+    )
+
+@debug_router.get("/profiles/{profile_id}/{kind}")
+async def download_profile(profile_id: str, kind: str,
+                           x_admin_token: Optional[str] = Header(default=None),
+                           app_settings: Settings = Depends(get_settings)):
+
+    if not is_admin(x_admin_token, app_settings):
+        return admin_token_invalid_response()
+
+    profile_controller = ProfileController(max_profiles=app_settings.PROFILING_MAX_PROFILES)
+    file_path = profile_controller.get_profile_file_path(profile_id=profile_id, kind=kind)
+
+    if file_path is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.PROFILE_NOT_FOUND.value
+            }
+        )
+
+    return FileResponse(file_path, filename=os.path.basename(file_path))
@@ -1,8 +1,15 @@
 from fastapi import FastAPI, APIRouter, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
-from controllers import NLPController, ProcessController, ProjectController
+from fastapi.responses import JSONResponse, ORJSONResponse, FileResponse
+from starlette.concurrency import run_in_threadpool
+from routes.schemes.nlp import (PushRequest, PushAllRequest, SearchRequest, MultiSearchRequest,
+                                ExportSnapshotRequest, ImportSnapshotRequest)
+from controllers import (NLPController, ProcessController, ProjectController, IngestController,
+                         SnapshotController)
+from controllers.ProcessController import parse_file
 from models import ResponseSignal
+from helpers.singleflight import SingleFlight
+from stores.llm.LLMExceptions import ProviderError, ProviderThrottledError
+from helpers.deadline import DeadlineExceeded
 
 import logging
 
@@ -13,6 +20,39 @@ nlp_router = APIRouter(
     tags=["nlp"],
 )
 
+def deadline_exceeded_response(error: DeadlineExceeded):
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={
+            "signal": ResponseSignal.REQUEST_DEADLINE_EXCEEDED.value,
+            "message": str(error)
+        }
+    )
+
+def provider_error_response(error: ProviderError):
+    # Throttling is retryable by the client, anything else is an upstream failure
+    if isinstance(error, ProviderThrottledError):
+        headers = {}
+        if error.retry_after:
+            headers["Retry-After"] = str(int(error.retry_after + 0.999))
+
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers=headers,
+            content={
+                "signal": ResponseSignal.PROVIDER_THROTTLED.value,
+                "message": str(error)
+            }
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        content={
+            "signal": ResponseSignal.PROVIDER_ERROR.value,
+            "message": str(error)
+        }
+    )
+
 @nlp_router.post("/index/push/{project_id}")
 async def index_project(request: Request, project_id: str, push_request: PushRequest):
 
@@ -25,8 +65,10 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
         template_parser=request.app.template_parser,
     )
 
-    process_controller = ProcessController(project_id=project_id)
-    chunks = process_controller.process_file(
+    # Parsing and splitting run in the worker processes, embedding and upserts on the I/O threads
+    chunks = await request.app.executors.run_cpu(
+        parse_file,
+        project_id=project_id,
         file_id=push_request.file_id,
         chunk_size=push_request.chunk_size,
         overlap_size=push_request.overlap_size,
@@ -40,16 +82,28 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
             }
         )
 
-    chunks_ids = list(range(0, len(chunks)))
+    chunks_ids = nlp_controller.get_chunk_ids(
+        project=project, file_id=push_request.file_id, count=len(chunks)
+    )
 
-    is_inserted = nlp_controller.index_into_vector_db(
-        project=project,
-        chunks=chunks,
-        do_reset=bool(push_request.do_reset),
-        chunks_ids=chunks_ids,
-        batch_size=push_request.batch_size or 64
+    # Indexed payloads only carry file_id; file-level fields are joined back from this sidecar
+    await request.app.executors.run_io(
+        ProcessController(project_id=project_id).save_chunks_file_metadata, chunks
     )
 
+    try:
+        is_inserted = await request.app.executors.run_io(
+            nlp_controller.index_into_vector_db,
+            project=project,
+            chunks=chunks,
+            do_reset=bool(push_request.do_reset),
+            chunks_ids=chunks_ids,
+            batch_size=push_request.batch_size or 64
+        )
+    except ProviderError as e:
+        logger.error(f"Error while embedding chunks: {e}")
+        return provider_error_response(e)
+
     if not is_inserted:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -65,6 +119,47 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
         }
     )
 
+@nlp_router.post("/index/push-all/{project_id}")
+async def index_project_files(request: Request, project_id: str, push_request: PushAllRequest):
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+    ingest_controller = IngestController(nlp_controller=nlp_controller, executors=request.app.executors)
+
+    file_ids = ingest_controller.list_project_files(project_id=project_id)
+    if not file_ids:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.NO_FILES_ERROR.value
+            }
+        )
+
+    files = await request.app.executors.run_io(
+        ingest_controller.ingest_project,
+        project_id=project_id,
+        chunk_size=push_request.chunk_size,
+        overlap_size=push_request.overlap_size,
+        batch_size=push_request.batch_size or 64,
+        do_reset=bool(push_request.do_reset),
+        file_ids=file_ids,
+    )
+
+    all_indexed = all(f["status"] in ("indexed", "empty") for f in files)
+
+    return JSONResponse(
+        content={
+            "signal": (ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value if all_indexed
+                       else ResponseSignal.PROJECT_INGEST_PARTIAL.value),
+            "inserted_items_count": sum(f["indexed"] for f in files),
+            "files": files
+        }
+    )
+
 @nlp_router.get("/index/info/{project_id}")
 async def get_project_index_info(request: Request, project_id: str):
     project = {"project_id": project_id}
@@ -82,6 +177,113 @@ async def get_project_index_info(request: Request, project_id: str):
         }
     )
 
+@nlp_router.post("/index/export/{project_id}")
+async def export_index_snapshot(request: Request, project_id: str, export_request: ExportSnapshotRequest):
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+    snapshot_controller = SnapshotController(nlp_controller=nlp_controller)
+
+    manifest = await run_in_threadpool(
+        snapshot_controller.export_snapshot,
+        project_id=project_id,
+        batch_size=export_request.batch_size or 1024,
+    )
+
+    if manifest is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.SNAPSHOT_EMPTY.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.SNAPSHOT_CREATED.value,
+            "snapshot": manifest
+        }
+    )
+
+@nlp_router.get("/index/snapshots/{project_id}")
+async def list_index_snapshots(request: Request, project_id: str):
+    snapshot_controller = SnapshotController(nlp_controller=None)
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.SNAPSHOTS_RETRIEVED.value,
+            "snapshots": snapshot_controller.list_snapshots(project_id=project_id)
+        }
+    )
+
+@nlp_router.get("/index/snapshots/{project_id}/{snapshot_id}/{file_name}")
+async def download_index_snapshot_file(request: Request, project_id: str, snapshot_id: str, file_name: str):
+    # Copying these three files into assets/snapshots/<project_id>/ on another node is enough to import there
+    file_path = SnapshotController(nlp_controller=None).get_snapshot_file_path(
+        project_id=project_id, snapshot_id=snapshot_id, file_name=file_name
+    )
+
+    if file_path is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.SNAPSHOT_NOT_FOUND.value
+            }
+        )
+
+    return FileResponse(file_path, filename=file_name)
+
+@nlp_router.post("/index/import/{project_id}")
+async def import_index_snapshot(request: Request, project_id: str, import_request: ImportSnapshotRequest):
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+    snapshot_controller = SnapshotController(nlp_controller=nlp_controller)
+
+    snapshot_path = snapshot_controller.get_snapshot_path(
+        project_id=import_request.source_project_id or project_id,
+        snapshot_id=import_request.snapshot_id,
+    )
+    if snapshot_path is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.SNAPSHOT_NOT_FOUND.value
+            }
+        )
+
+    signal, imported_count = await run_in_threadpool(
+        snapshot_controller.import_snapshot,
+        project_id=project_id,
+        snapshot_path=snapshot_path,
+        do_reset=bool(import_request.do_reset),
+        batch_size=import_request.batch_size or 256,
+        force=bool(import_request.force),
+    )
+
+    if signal != ResponseSignal.SNAPSHOT_IMPORTED.value:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": signal,
+                "imported_items_count": imported_count
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": signal,
+            "imported_items_count": imported_count
+        }
+    )
+
 @nlp_router.post("/index/search/{project_id}")
 async def search_index(request: Request, project_id: str, search_request: SearchRequest):
     
@@ -93,10 +295,31 @@ async def search_index(request: Request, project_id: str, search_request: Search
         template_parser=request.app.template_parser,
     )
 
-    results = nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+    search_options = search_request.get_search_options()
+    deadline = search_request.get_deadline(default_seconds=request.app.request_deadline_seconds)
+
+    # Identical concurrent searches share one embedding + vector search
+    flight_key = (
+        project_id,
+        SingleFlight.normalize_text(search_request.text),
+        search_request.limit,
+        tuple(sorted(search_options.items())),
     )
 
+    try:
+        results = await request.app.single_flight.do(
+            "search", flight_key,
+            lambda: run_in_threadpool(
+                nlp_controller.search_vector_db_collection,
+                project=project, text=search_request.text, limit=search_request.limit,
+                deadline=deadline, **search_options
+            )
+        )
+    except ProviderError as e:
+        return provider_error_response(e)
+    except DeadlineExceeded as e:
+        return deadline_exceeded_response(e)
+
     if not results:
         return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -105,10 +328,21 @@ async def search_index(request: Request, project_id: str, search_request: Search
                 }
             )
     
-    return JSONResponse(
+    # orjson serializes the plain dicts in one C pass; model_dump skips the deprecated .dict() shim
+    serialized_results = [ result.model_dump() for result in results ]
+
+    if search_request.with_metadata:
+        joined_metadata = await run_in_threadpool(
+            ProcessController(project_id=project_id).join_file_metadata,
+            [ result.metadata for result in results ],
+        )
+        for serialized_result, metadata in zip(serialized_results, joined_metadata):
+            serialized_result["metadata"] = metadata
+
+    return ORJSONResponse(
         content={
             "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
-            "results": [ result.dict()  for result in results ]
+            "results": serialized_results
         }
     )
 
@@ -122,11 +356,62 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
         template_parser=request.app.template_parser,
     )
 
-    answer, full_prompt, chat_history = nlp_controller.answer_rag_question(
-        project=project,
-        query=search_request.text,
-        limit=search_request.limit,
-    )
+    # Stateless calls get a scratch session that is never stored, so they cannot evict conversations
+    session_store = request.app.session_store
+    is_stored_session = bool(search_request.session_id or search_request.start_session)
+    if search_request.session_id:
+        session = session_store.get(session_id=search_request.session_id, project_id=project_id)
+        if session is None:
+            # Unknown, expired or another project's: a fresh session would silently drop the context
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={
+                    "signal": ResponseSignal.SESSION_NOT_FOUND.value
+                }
+            )
+    elif search_request.start_session:
+        session = session_store.create(project_id=project_id)
+    else:
+        session = { "session_id": None, "turns": [], "documents": [] }
+    base_turns = len(session["turns"])
+
+    search_options = search_request.get_search_options()
+    deadline = search_request.get_deadline(default_seconds=request.app.request_deadline_seconds)
+
+    def answer_question(target_session: dict):
+        answer, full_prompt, chat_history = nlp_controller.answer_rag_question(
+            project=project,
+            query=search_request.text,
+            limit=search_request.limit,
+            language=search_request.language,
+            session=target_session,
+            retrieval_mode=search_request.get_retrieval_mode(),
+            history_turns=request.app.session_history_turns,
+            search_options=search_options,
+            deadline=deadline,
+        )
+        return (answer, full_prompt, chat_history, target_session,
+                nlp_controller.generation_error, nlp_controller.answer_path)
+
+    try:
+        if session["turns"] or session["documents"]:
+            # Follow-ups depend on their own conversation state, so they are never coalesced
+            answer, full_prompt, chat_history, _, generation_error, answer_path = await run_in_threadpool(
+                answer_question, session
+            )
+        else:
+            answer, full_prompt, chat_history, generation_error, answer_path = await answer_fresh_question(
+                request=request,
+                project_id=project_id,
+                search_request=search_request,
+                search_options=search_options,
+                session=session,
+                answer_question=answer_question,
+            )
+    except ProviderError as e:
+        return provider_error_response(e)
+    except DeadlineExceeded as e:
+        return deadline_exceeded_response(e)
 
     if not answer:
         return JSONResponse(
@@ -135,12 +420,152 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
                     "signal": ResponseSignal.RAG_ANSWER_ERROR.value
                 }
         )
-    
+
+    if is_stored_session:
+        session_store.save(session, base_turns=base_turns)
+
     return JSONResponse(
         content={
             "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
             "answer": answer,
             "full_prompt": full_prompt,
-            "chat_history": chat_history
+            "chat_history": chat_history,
+            "session_id": session["session_id"],
+            "generation_error": generation_error,
+            "answer_path": answer_path,
         }
-    )
\ No newline at end of file
+    )
+
+async def answer_fresh_question(request: Request, project_id: str, search_request: SearchRequest,
+                                search_options: dict, session: dict, answer_question):
+    # Fresh questions are stateless: identical concurrent ones share one computation
+    # on a scratch session, and each caller then records the turn in its own session
+    flight_key = (
+        project_id,
+        SingleFlight.normalize_text(search_request.text),
+        search_request.limit,
+        search_request.language,
+        tuple(sorted(search_options.items())),
+    )
+
+    answer, full_prompt, chat_history, shared_session, generation_error, answer_path = await request.app.single_flight.do(
+        "answer", flight_key,
+        lambda: run_in_threadpool(answer_question, { "turns": [], "documents": [] })
+    )
+
+    session["turns"].extend(shared_session["turns"])
+    session["documents"] = list(shared_session["documents"])
+
+    return answer, full_prompt, chat_history, generation_error, answer_path
+
+def too_many_projects_response(request: Request, search_request: MultiSearchRequest):
+    if len(search_request.get_project_ids()) <= request.app.multi_search_max_projects:
+        return None
+
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={
+            "signal": ResponseSignal.MULTI_SEARCH_TOO_MANY_PROJECTS.value,
+            "max_projects": request.app.multi_search_max_projects
+        }
+    )
+
+@nlp_router.post("/index/search-multi")
+async def search_projects_index(request: Request, search_request: MultiSearchRequest):
+
+    error_response = too_many_projects_response(request, search_request)
+    if error_response is not None:
+        return error_response
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+
+    try:
+        results, shards = await run_in_threadpool(
+            nlp_controller.search_projects,
+            project_ids=search_request.get_project_ids(),
+            text=search_request.text,
+            scatter_gather=request.app.scatter_gather,
+            limit=search_request.limit,
+            shard_timeout=search_request.get_shard_timeout(),
+            deadline=search_request.get_deadline(default_seconds=request.app.request_deadline_seconds),
+        )
+    except ProviderError as e:
+        return provider_error_response(e)
+    except DeadlineExceeded as e:
+        return deadline_exceeded_response(e)
+
+    if not results:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value,
+                "shards": shards
+            }
+        )
+
+    return ORJSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                { **document.model_dump(), "project_id": project_id }
+                for project_id, document in results
+            ],
+            "shards": shards
+        }
+    )
+
+@nlp_router.post("/index/answer-multi")
+async def answer_projects_rag(request: Request, search_request: MultiSearchRequest):
+
+    error_response = too_many_projects_response(request, search_request)
+    if error_response is not None:
+        return error_response
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+
+    try:
+        answer, full_prompt, chat_history, shards = await run_in_threadpool(
+            nlp_controller.answer_projects_question,
+            project_ids=search_request.get_project_ids(),
+            query=search_request.text,
+            scatter_gather=request.app.scatter_gather,
+            limit=search_request.limit,
+            language=search_request.language,
+            shard_timeout=search_request.get_shard_timeout(),
+            deadline=search_request.get_deadline(default_seconds=request.app.request_deadline_seconds),
+        )
+    except ProviderError as e:
+        return provider_error_response(e)
+    except DeadlineExceeded as e:
+        return deadline_exceeded_response(e)
+
+    if not answer:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value,
+                "shards": shards
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+            "answer": answer,
+            "full_prompt": full_prompt,
+            "chat_history": chat_history,
+            "generation_error": nlp_controller.generation_error,
+            "answer_path": nlp_controller.answer_path,
+            "shards": shards
+        }
+    )
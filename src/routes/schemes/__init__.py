@@ -1 +1 @@
-from .data import ProcessRequest
\ No newline at end of file
+from .data import ProcessRequest, UploadInitRequest
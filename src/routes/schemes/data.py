@@ -1,8 +1,18 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 class ProcessRequest(BaseModel):
     file_id: str
     chunk_size: Optional[int] = 100
     overlap_size: Optional[int] = 20
-    do_reset: Optional[int] = 0
\ No newline at end of file
+    do_reset: Optional[int] = 0
+    cursor: Optional[str] = None
+    page_size: Optional[int] = Field(default=None, ge=1)
+    stream: Optional[bool] = False
+
+class UploadInitRequest(BaseModel):
+    file_name: str
+    content_type: str
+    file_size: int
+    sha256: Optional[str] = None
+    part_size: Optional[int] = None
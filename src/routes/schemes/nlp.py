@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from helpers.deadline import Deadline
+from models.enums.RetrievalEnum import RetrievalModeEnum
 
 class PushRequest(BaseModel):
     file_id: str
@@ -8,6 +10,71 @@ class PushRequest(BaseModel):
     batch_size: Optional[int] = 64
     do_reset: Optional[int] = 0
 
+class PushAllRequest(BaseModel):
+    chunk_size: Optional[int] = 100
+    overlap_size: Optional[int] = 20
+    batch_size: Optional[int] = 64
+    do_reset: Optional[int] = 0
+
+class ExportSnapshotRequest(BaseModel):
+    batch_size: Optional[int] = 1024
+
+class ImportSnapshotRequest(BaseModel):
+    snapshot_id: str
+    # Restore another project's snapshot into this one (point ids are remapped)
+    source_project_id: Optional[str] = None
+    do_reset: Optional[int] = 0
+    batch_size: Optional[int] = 256
+    # Skip the embedding model check, e.g. after renaming a model id
+    force: Optional[bool] = False
+
 class SearchRequest(BaseModel):
     text: str
-    limit: Optional[int] = 3
\ No newline at end of file
+    limit: Optional[int] = 3
+    language: Optional[str] = None
+    use_mmr: Optional[bool] = False
+    mmr_lambda: Optional[float] = Field(0.5, ge=0.0, le=1.0)
+    mmr_oversample: Optional[int] = Field(4, ge=1)
+    # /search only: return each hit's payload metadata, with its file-level fields joined back in
+    with_metadata: Optional[bool] = False
+    # Conversations are opt-in: pass a session_id to resume one, or start_session to open one
+    session_id: Optional[str] = None
+    start_session: Optional[bool] = False
+    retrieval_mode: Optional[RetrievalModeEnum] = None
+    deadline_ms: Optional[int] = None
+
+    def get_search_options(self):
+        return {
+            "use_mmr": bool(self.use_mmr),
+            "mmr_lambda": self.mmr_lambda if self.mmr_lambda is not None else 0.5,
+            "mmr_oversample": self.mmr_oversample or 4,
+        }
+
+    def get_retrieval_mode(self):
+        return self.retrieval_mode.value if self.retrieval_mode is not None else None
+
+    def get_deadline(self, default_seconds: float = None):
+        if self.deadline_ms:
+            return Deadline(timeout_seconds=self.deadline_ms / 1000.0)
+        return Deadline(timeout_seconds=default_seconds)
+
+class MultiSearchRequest(BaseModel):
+    project_ids: List[str] = Field(min_length=1)
+    text: str
+    limit: Optional[int] = 3
+    language: Optional[str] = None
+    # Projects slower than this are left out of the merged results
+    shard_timeout_ms: Optional[int] = None
+    deadline_ms: Optional[int] = None
+
+    def get_project_ids(self):
+        # Duplicates would only run the same search twice
+        return list(dict.fromkeys(self.project_ids))
+
+    def get_shard_timeout(self):
+        return self.shard_timeout_ms / 1000.0 if self.shard_timeout_ms else None
+
+    def get_deadline(self, default_seconds: float = None):
+        if self.deadline_ms:
+            return Deadline(timeout_seconds=self.deadline_ms / 1000.0)
+        return Deadline(timeout_seconds=default_seconds)
@@ -0,0 +1,158 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import logging
+import queue
+import time
+
+
+class EmbeddingBatcher:
+    """Merges concurrent single-text `embed_text` calls into batched `embed_texts` calls.
+
+    Texts arriving within `window_ms` of the first queued one (or until
+    `max_batch_size` is reached) are sent to the wrapped client as one request
+    and the vectors are fanned back out to the waiting callers. `embed_texts`
+    calls are already batches and go straight to the client, but are counted
+    too. Every other attribute is delegated to the wrapped client.
+    """
+
+    def __init__(self, embedding_client, window_ms: float = 3, max_batch_size: int = 32,
+                 max_concurrent_batches: int = 4):
+
+        self.client = embedding_client
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+
+        self.queue = queue.Queue()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches, thread_name_prefix="embedding-batch"
+        )
+
+        self.stats = {
+            "requests": 0, "batches": 0, "provider_texts": 0, "max_batch_size": 0,
+            "bulk_requests": 0, "bulk_texts": 0, "errors": 0,
+        }
+        self.stats_lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+        self.worker = threading.Thread(target=self.collect_batches, name="embedding-batcher", daemon=True)
+        self.worker.start()
+
+    def __getattr__(self, name):
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def submit(self, text: str, document_type: str = None):
+        """Queue a text for the next batch and return a Future of its vector"""
+        future = Future()
+        self.queue.put((text, document_type, future))
+        return future
+
+    def embed_text(self, text: str, document_type: str = None):
+        return self.submit(text=text, document_type=document_type).result()
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        """Bulk embeds (e.g. ingest) pass straight through, without waiting for a window"""
+        try:
+            vectors = self.embed_batch(texts=texts, document_type=document_type)
+        except Exception:
+            self.count_error()
+            raise
+
+        if not vectors:
+            self.count_error()
+
+        with self.stats_lock:
+            self.stats["bulk_requests"] += 1
+            self.stats["bulk_texts"] += len(texts)
+        return vectors
+
+    def count_error(self):
+        with self.stats_lock:
+            self.stats["errors"] += 1
+
+    def collect_batches(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            stop = False
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self.executor.submit(self.flush, batch)
+
+            if stop:
+                return
+
+    def flush(self, batch: list):
+        # Queries and documents use different input types, so they are embedded separately
+        groups = {}
+        for text, document_type, future in batch:
+            groups.setdefault(document_type, []).append((text, future))
+
+        for document_type, items in groups.items():
+            # Identical texts in the same window are embedded once
+            unique_texts = list(dict.fromkeys(text for text, _ in items))
+
+            try:
+                vectors = self.embed_batch(texts=unique_texts, document_type=document_type)
+            except Exception as e:
+                self.count_error()
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+
+            if not vectors or len(vectors) != len(unique_texts):
+                self.logger.error("Embedding batch returned an unexpected number of vectors")
+                self.count_error()
+                vectors = [None] * len(unique_texts)
+
+            vectors_by_text = dict(zip(unique_texts, vectors))
+            for text, future in items:
+                future.set_result(vectors_by_text[text])
+
+            with self.stats_lock:
+                self.stats["requests"] += len(items)
+                self.stats["batches"] += 1
+                self.stats["provider_texts"] += len(unique_texts)
+                self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(unique_texts))
+
+    def embed_batch(self, texts: list, document_type: str = None):
+        if hasattr(self.client, "embed_texts"):
+            return self.client.embed_texts(texts=texts, document_type=document_type)
+
+        return [
+            self.client.embed_text(text=text, document_type=document_type)
+            for text in texts
+        ]
+
+    def get_stats(self):
+        with self.stats_lock:
+            stats = dict(self.stats)
+
+        stats["queued"] = self.queue.qsize()
+        stats["avg_batch_size"] = (
+            stats["provider_texts"] / stats["batches"] if stats["batches"] else 0
+        )
+        return stats
+
+    def close(self):
+        self.queue.put(None)
+        self.worker.join(timeout=1)
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,132 @@
+from .LLMEnums import EmbeddingTypeEnums
+import numpy as np
+import logging
+
+
+def quantize_vectors(vectors, embedding_type: str):
+    """Quantize float vectors the way the providers do it natively.
+
+    `int8`/`uint8` scale every vector by its largest component (cosine ranking is
+    unchanged by a per-vector scale), `ubinary` keeps the sign of each component
+    as -1/+1 so the dot product stays `size - 2 * hamming distance`.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+
+    if embedding_type == EmbeddingTypeEnums.UBINARY.value:
+        return np.where(vectors > 0, 1.0, -1.0).astype(np.float32)
+
+    if embedding_type in (EmbeddingTypeEnums.INT8.value, EmbeddingTypeEnums.UINT8.value):
+        scale = np.maximum(np.abs(vectors).max(axis=-1, keepdims=True), 1e-12)
+        quantized = np.clip(np.rint(vectors / scale * 127), -128, 127)
+        if embedding_type == EmbeddingTypeEnums.UINT8.value:
+            quantized = quantized + 128
+        return quantized.astype(np.float32)
+
+    return vectors
+
+
+def unpack_ubinary(packed, embedding_size: int):
+    """Expand packed `ubinary` bytes (8 dimensions per byte) into -1/+1 vectors"""
+    bits = np.unpackbits(np.asarray(packed, dtype=np.uint8), axis=-1)[..., :embedding_size]
+    return bits.astype(np.float32) * 2 - 1
+
+
+class PCAProjection:
+    """Linear projection fitted on a sample of full-size embeddings.
+
+    Stored as an `.npz` with the sample `mean` and the top `components`; projected
+    vectors are re-normalized so cosine and dot distances keep working.
+    """
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, explained_variance_ratio: np.ndarray = None):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+        self.explained_variance_ratio = explained_variance_ratio
+
+    @property
+    def input_size(self):
+        return self.components.shape[1]
+
+    @property
+    def output_size(self):
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, vectors, n_components: int):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if n_components >= vectors.shape[1]:
+            raise ValueError(f"n_components must be below the embedding size ({vectors.shape[1]})")
+
+        mean = vectors.mean(axis=0)
+        # Economy SVD of the centered sample; rows of vt are the principal axes
+        _, singular_values, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+        variance = singular_values ** 2
+
+        return cls(
+            mean=mean,
+            components=vt[:n_components],
+            explained_variance_ratio=variance[:n_components] / variance.sum(),
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            return cls(
+                mean=data["mean"],
+                components=data["components"],
+                explained_variance_ratio=data["explained_variance_ratio"] if "explained_variance_ratio" in data else None,
+            )
+
+    def save(self, path: str):
+        arrays = { "mean": self.mean, "components": self.components }
+        if self.explained_variance_ratio is not None:
+            arrays["explained_variance_ratio"] = self.explained_variance_ratio
+        np.savez(path, **arrays)
+
+    def transform(self, vectors):
+        projected = (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T
+        return projected / np.maximum(np.linalg.norm(projected, axis=-1, keepdims=True), 1e-12)
+
+
+class EmbeddingCompressor:
+    """Applies a local PCA projection and/or quantization to a provider's float vectors.
+
+    Used for what the provider cannot do itself (see `create_embedding_client`):
+    `embedding_size` is the stored size, every other attribute is delegated to
+    the wrapped client.
+    """
+
+    def __init__(self, embedding_client, projection: PCAProjection = None,
+                 embedding_type: str = EmbeddingTypeEnums.FLOAT.value):
+
+        self.client = embedding_client
+        self.projection = projection
+        self.embedding_type = embedding_type
+        self.embedding_size = projection.output_size if projection else embedding_client.embedding_size
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name):
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def compress(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.projection is not None:
+            vectors = self.projection.transform(vectors)
+        return quantize_vectors(vectors, self.embedding_type)
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        vectors = self.client.embed_texts(texts=texts, document_type=document_type)
+        if not vectors:
+            return vectors
+
+        return self.compress(vectors).tolist()
+
+    def embed_text(self, text: str, document_type: str = None):
+        vector = self.client.embed_text(text=text, document_type=document_type)
+        if not vector:
+            return vector
+
+        return self.compress([vector])[0].tolist()
@@ -0,0 +1,153 @@
+from helpers.metrics import HTTP_POOL_REQUESTS, HTTP_POOL_WAITS, HTTP_POOL_ACQUIRE, HTTP_POOL_CONNECTIONS
+import threading
+import logging
+import httpx
+import time
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """Pooled httpx transport that records pool wait time and connection usage.
+
+    The wait is measured from entering the transport to the first httpcore
+    trace event (opening a connection or sending headers on a reused one),
+    which is the time spent waiting for a free pooled connection. Everything is
+    also exported as `http_pool_*` metrics.
+    """
+
+    def __init__(self, max_connections: int = None, **kwargs):
+        super().__init__(**kwargs)
+
+        self.max_connections = max_connections
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "waits": 0,
+            "pool_wait_seconds_total": 0.0,
+            "pool_wait_seconds_max": 0.0,
+        }
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+        # Connection counts come from httpx's private httpcore pool: check it once, loudly
+        if self.get_pool_connections() is None:
+            self.logger.warning(
+                f"httpx {httpx.__version__} has no inspectable connection pool, pool connection counts are disabled"
+            )
+
+    def get_pool_connections(self):
+        """The pool's connections, or None if this httpx version does not expose them"""
+        pool = getattr(self, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return None
+        return list(connections)
+
+    def count_connections(self):
+        """(connections, idle connections), also published as gauges; None when unavailable"""
+        connections = self.get_pool_connections()
+        if connections is None:
+            return None, None
+
+        idle_connections = sum(1 for connection in connections if connection.is_idle())
+        HTTP_POOL_CONNECTIONS.set(len(connections) - idle_connections, state="active")
+        HTTP_POOL_CONNECTIONS.set(idle_connections, state="idle")
+        return len(connections), idle_connections
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started_at = time.perf_counter()
+        acquired_at = []
+        parent_trace = request.extensions.get("trace")
+
+        def trace(event_name, info):
+            if not acquired_at:
+                acquired_at.append(time.perf_counter())
+            if parent_trace is not None:
+                parent_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+
+        with self.lock:
+            # Every connection is taken: this request queues for one
+            waited = self.max_connections is not None and self.stats["in_flight"] >= self.max_connections
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            if waited:
+                self.stats["waits"] += 1
+
+        if waited:
+            HTTP_POOL_WAITS.inc()
+
+        failed = True
+        try:
+            response = super().handle_request(request)
+            failed = False
+            return response
+        except Exception:
+            with self.lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            wait = (acquired_at[0] if acquired_at else time.perf_counter()) - started_at
+            with self.lock:
+                self.stats["in_flight"] -= 1
+                self.stats["pool_wait_seconds_total"] += wait
+                self.stats["pool_wait_seconds_max"] = max(self.stats["pool_wait_seconds_max"], wait)
+
+            HTTP_POOL_REQUESTS.inc(status="error" if failed else "ok")
+            HTTP_POOL_ACQUIRE.observe(wait)
+            self.count_connections()
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+
+        connections, idle_connections = self.count_connections()
+
+        stats["connections"] = connections
+        stats["idle_connections"] = idle_connections
+        stats["pool_utilization"] = (
+            (connections - idle_connections) / self.max_connections
+            if self.max_connections and connections is not None else 0.0
+        )
+        stats["pool_wait_seconds_avg"] = (
+            stats["pool_wait_seconds_total"] / stats["requests"] if stats["requests"] else 0.0
+        )
+        return stats
+
+
+def create_http_transport(config):
+    """Build the pooled, keep-alive transport shared by every LLM provider"""
+    logger = logging.getLogger(__name__)
+
+    http2 = bool(config.HTTP2_ENABLED)
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP2_ENABLED is set but the 'h2' package is missing, using HTTP/1.1")
+            http2 = False
+
+    limits = httpx.Limits(
+        max_connections=config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+    return InstrumentedTransport(
+        max_connections=config.HTTP_MAX_CONNECTIONS,
+        limits=limits,
+        http2=http2,
+    )
+
+
+def create_http_client(config, transport: InstrumentedTransport):
+    """Wrap the shared transport in an httpx client with the default timeouts"""
+    # Read/write default to the generation budget, embeddings override it per call
+    timeout = httpx.Timeout(
+        config.HTTP_GENERATION_TIMEOUT_SECONDS,
+        connect=config.HTTP_CONNECT_TIMEOUT_SECONDS,
+        pool=config.HTTP_POOL_TIMEOUT_SECONDS,
+    )
+
+    return httpx.Client(transport=transport, timeout=timeout)
@@ -3,12 +3,16 @@ from enum import Enum
 class LLMEnums(Enum):
     OPENAI = "OPENAI"
     COHERE = "COHERE"
+    LOCAL = "LOCAL"
+    FAKE = "FAKE"
 
 class OpenAIEnums(Enum):
     SYSTEM = "system"
     USER = "user"
     ASSISTANT = "assistant"
 
+    DIMENSIONS_MODEL_PREFIX = "text-embedding-3"
+
 class CoHereEnums(Enum):
     SYSTEM = "SYSTEM"
     USER = "USER"
@@ -20,4 +24,11 @@ class CoHereEnums(Enum):
 
 class DocumentTypeEnum(Enum):
     DOCUMENT = "document"
-    QUERY = "query"
\ No newline at end of file
+    QUERY = "query"
+
+class EmbeddingTypeEnums(Enum):
+    # Cohere `embedding_types`; other providers get them through EmbeddingCompressor
+    FLOAT = "float"
+    INT8 = "int8"
+    UINT8 = "uint8"
+    UBINARY = "ubinary"
@@ -0,0 +1,20 @@
+class ProviderError(Exception):
+    """Raised when a provider call fails after the rate limiter gave up retrying"""
+
+    def __init__(self, message: str, provider: str = None, status_code: int = None):
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+
+
+class ProviderThrottledError(ProviderError):
+    """The provider kept rejecting the call for quota reasons (429)"""
+
+    def __init__(self, message: str, provider: str = None, status_code: int = 429,
+                 retry_after: float = None):
+        super().__init__(message, provider=provider, status_code=status_code)
+        self.retry_after = retry_after
+
+
+class ProviderRequestError(ProviderError):
+    """The call failed for any other reason (5xx, network, invalid request)"""
@@ -1,27 +1,62 @@
 
 from .LLMEnums import LLMEnums
-from .providers import OpenAIProvider, CoHereProvider
+from .RateLimiter import RateLimiterRegistry
+from .HTTPTransport import create_http_transport, create_http_client
 
 class LLMProviderFactory:
     def __init__(self, config: dict):
         self.config = config
+        # Shared by every client this factory creates, so quotas are enforced per provider/model
+        self.rate_limiters = RateLimiterRegistry(config)
+        # One pooled keep-alive http client for every provider
+        self.http_transport = create_http_transport(config)
+        self.http_client = create_http_client(config, transport=self.http_transport)
 
     def create(self, provider: str):
+        # Provider SDKs are imported only for the backends actually configured
         if provider == LLMEnums.OPENAI.value:
+            from .providers.OpenAIProvider import OpenAIProvider
             return OpenAIProvider(
                 api_key = self.config.OPENAI_API_KEY,
                 api_url = self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                rate_limiters=self.rate_limiters,
+                http_client=self.http_client,
+                embedding_timeout=self.config.HTTP_EMBEDDING_TIMEOUT_SECONDS,
+                generation_timeout=self.config.HTTP_GENERATION_TIMEOUT_SECONDS,
             )
 
         if provider == LLMEnums.COHERE.value:
+            from .providers.CoHereProvider import CoHereProvider
             return CoHereProvider(
                 api_key = self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                rate_limiters=self.rate_limiters,
+                http_client=self.http_client,
+                embedding_timeout=self.config.HTTP_EMBEDDING_TIMEOUT_SECONDS,
+                generation_timeout=self.config.HTTP_GENERATION_TIMEOUT_SECONDS,
+            )
+
+        if provider == LLMEnums.LOCAL.value:
+            from .providers.LocalProvider import LocalProvider
+            return LocalProvider(
+                default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
+                max_workers=self.config.LOCAL_EMBEDDING_THREADS,
+                device=self.config.LOCAL_EMBEDDING_DEVICE,
+                backend=self.config.LOCAL_EMBEDDING_BACKEND,
+                inference_batch_size=self.config.LOCAL_EMBEDDING_BATCH_SIZE,
+            )
+
+        if provider == LLMEnums.FAKE.value:
+            from .providers.FakeProvider import FakeProvider
+            return FakeProvider(
+                latency_ms=self.config.FAKE_PROVIDER_LATENCY_MS,
+                jitter_ms=self.config.FAKE_PROVIDER_JITTER_MS,
+                default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
             )
 
         return None
\ No newline at end of file
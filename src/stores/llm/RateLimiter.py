@@ -0,0 +1,206 @@
+from .LLMExceptions import ProviderThrottledError, ProviderRequestError
+import threading
+import logging
+import random
+import time
+
+
+def estimate_tokens(*texts):
+    """Rough token count (~4 characters per token) used for TPM budgeting"""
+    return max(1, sum(len(text) for text in texts if text) // 4)
+
+
+class TokenBucket:
+    """Thread-safe bucket refilled continuously up to `capacity` units per minute"""
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = float(capacity_per_minute)
+        self.rate = self.capacity / 60.0
+        self.available = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def refill(self, now: float):
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, amount: float = 1):
+        # Requests larger than the whole bucket would never fit, let them drain it instead
+        amount = min(float(amount), self.capacity)
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.refill(now)
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                wait = (amount - self.available) / self.rate
+
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """Client-side RPM/TPM limiter with an in-flight cap and jittered exponential backoff"""
+
+    def __init__(self, name: str, requests_per_minute: int = None, tokens_per_minute: int = None,
+                 max_in_flight: int = None, max_retries: int = 4,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0):
+
+        self.name = name
+        self.requests_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # A Retry-After from the provider pauses every caller sharing this limiter
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+        self.stats = { "calls": 0, "retries": 0, "throttled": 0, "failed": 0, "wait_seconds": 0.0 }
+
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def get_status_code(error: Exception):
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            status_code = getattr(getattr(error, "response", None), "status_code", None)
+        return status_code
+
+    @staticmethod
+    def is_transient_error(error: Exception):
+        # Connection resets and timeouts from httpx/openai/cohere carry no status code
+        error_name = type(error).__name__
+        return isinstance(error, (OSError, TimeoutError)) or \
+            "Connection" in error_name or "Timeout" in error_name
+
+    @staticmethod
+    def get_retry_after(error: Exception):
+        headers = getattr(getattr(error, "response", None), "headers", None) or getattr(error, "headers", None)
+        if not headers:
+            return None
+
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    def get_backoff(self, attempt: int, retry_after: float = None):
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+
+        # Full jitter keeps concurrent callers from retrying in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def wait_for_capacity(self, tokens: int):
+        started_at = time.monotonic()
+
+        blocked_for = self.blocked_until - started_at
+        if blocked_for > 0:
+            time.sleep(blocked_for)
+
+        if self.requests_bucket:
+            self.requests_bucket.acquire(1)
+        if self.tokens_bucket:
+            self.tokens_bucket.acquire(tokens)
+
+        with self.lock:
+            self.stats["wait_seconds"] += time.monotonic() - started_at
+
+    def call(self, fn, tokens: int = 1):
+        """Run `fn()` within the limits, retrying 429/5xx/network errors with backoff"""
+        with self.lock:
+            self.stats["calls"] += 1
+
+        attempt = 0
+        while True:
+            self.wait_for_capacity(tokens=tokens)
+
+            if self.in_flight:
+                self.in_flight.acquire()
+            try:
+                return fn()
+            except Exception as e:
+                status_code = self.get_status_code(e)
+                retry_after = self.get_retry_after(e)
+                is_throttled = status_code == 429
+                is_retryable = is_throttled or (
+                    self.is_transient_error(e) if status_code is None else status_code >= 500
+                )
+
+                if is_throttled and retry_after:
+                    with self.lock:
+                        self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+                if not is_retryable or attempt >= self.max_retries:
+                    with self.lock:
+                        self.stats["throttled" if is_throttled else "failed"] += 1
+
+                    if is_throttled:
+                        raise ProviderThrottledError(
+                            f"{self.name} throttled the request: {e}",
+                            provider=self.name, retry_after=retry_after,
+                        ) from e
+
+                    raise ProviderRequestError(
+                        f"{self.name} request failed: {e}",
+                        provider=self.name, status_code=status_code,
+                    ) from e
+
+                backoff = self.get_backoff(attempt=attempt, retry_after=retry_after)
+                self.logger.warning(
+                    f"{self.name} call failed with status {status_code}, retrying in {backoff:.2f}s"
+                )
+                with self.lock:
+                    self.stats["retries"] += 1
+            finally:
+                if self.in_flight:
+                    self.in_flight.release()
+
+            time.sleep(backoff)
+            attempt += 1
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+class RateLimiterRegistry:
+    """Hands out one shared limiter per provider/model, configured from `Settings.RATE_LIMITS`.
+
+    `RATE_LIMITS` maps "PROVIDER" or "PROVIDER:model_id" to
+    {"rpm": ..., "tpm": ..., "max_in_flight": ...}; model entries override provider ones.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.limiters = {}
+        self.lock = threading.Lock()
+
+    def get(self, provider: str, model_id: str = None):
+        name = f"{provider}:{model_id}" if model_id else provider
+
+        with self.lock:
+            if name not in self.limiters:
+                limits = dict((self.config.RATE_LIMITS or {}).get(provider, {}))
+                limits.update((self.config.RATE_LIMITS or {}).get(name, {}))
+
+                self.limiters[name] = RateLimiter(
+                    name=name,
+                    requests_per_minute=limits.get("rpm"),
+                    tokens_per_minute=limits.get("tpm"),
+                    max_in_flight=limits.get("max_in_flight", self.config.RATE_LIMIT_MAX_IN_FLIGHT),
+                    max_retries=self.config.RATE_LIMIT_MAX_RETRIES,
+                    backoff_base=self.config.RATE_LIMIT_BACKOFF_BASE_SECONDS,
+                    backoff_max=self.config.RATE_LIMIT_BACKOFF_MAX_SECONDS,
+                )
+
+            return self.limiters[name]
+
+    def get_stats(self):
+        with self.lock:
+            return { name: limiter.get_stats() for name, limiter in self.limiters.items() }
@@ -0,0 +1,214 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from .LLMExceptions import ProviderRequestError
+from helpers.deadline import Deadline, DeadlineExceeded
+import threading
+import logging
+import time
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and lets one probe through
+    after `reset_seconds` (half-open); a successful probe closes it again."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow_request(self):
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                return True
+
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, percentile: float, min_samples: int = 1):
+        with self.lock:
+            samples = sorted(self.samples)
+
+        if len(samples) < max(min_samples, 1):
+            return None
+
+        index = min(len(samples) - 1, int(round(percentile / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+
+class ResilientGenerationClient:
+    """Generation with deadlines, hedging to a secondary backend and per-backend circuit breakers.
+
+    The primary backend is always tried first. When it takes longer than its
+    recent p95 latency, the same prompt is hedged to the secondary backend and
+    the first successful answer wins. A backend whose breaker is open is skipped
+    entirely. Every other attribute is delegated to the primary client.
+    """
+
+    def __init__(self, primary, secondary=None, hedge_enabled: bool = False,
+                 hedge_percentile: float = 95, hedge_min_delay: float = 1.0,
+                 hedge_min_samples: int = 20, failure_threshold: int = 5,
+                 reset_seconds: float = 30.0, max_workers: int = 16):
+
+        self.primary = primary
+        self.secondary = secondary
+
+        self.hedge_enabled = hedge_enabled and secondary is not None
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+
+        self.breakers = {
+            "primary": CircuitBreaker(failure_threshold, reset_seconds),
+            "secondary": CircuitBreaker(failure_threshold, reset_seconds),
+        }
+        self.latency = LatencyTracker()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation")
+
+        self.stats = { "calls": 0, "hedged": 0, "secondary_wins": 0, "deadline_exceeded": 0, "short_circuited": 0 }
+        self.stats_lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name):
+        if name == "primary":
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+    def count(self, key: str):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def get_hedge_delay(self):
+        if not self.hedge_enabled:
+            return None
+
+        threshold = self.latency.percentile(self.hedge_percentile, min_samples=self.hedge_min_samples)
+        return max(self.hedge_min_delay, threshold or 0.0) if threshold else None
+
+    def call_backend(self, name: str, client, prompt: str, build_chat_history):
+        chat_history = build_chat_history(client)
+        started_at = time.monotonic()
+
+        try:
+            answer = client.generate_text(prompt=prompt, chat_history=chat_history)
+        except Exception:
+            self.breakers[name].record_failure()
+            raise
+
+        if not answer:
+            self.breakers[name].record_failure()
+            raise ProviderRequestError(f"{name} generation backend returned no answer", provider=name)
+
+        self.breakers[name].record_success()
+        if name == "primary":
+            self.latency.record(time.monotonic() - started_at)
+
+        return answer, chat_history
+
+    def submit(self, name: str, client, prompt: str, build_chat_history):
+        future = self.executor.submit(self.call_backend, name, client, prompt, build_chat_history)
+        future.backend_name = name
+        return future
+
+    def generate_with_fallbacks(self, prompt: str, build_chat_history, deadline: Deadline = None):
+        """Return (answer, chat_history); raise DeadlineExceeded or the last backend error"""
+        deadline = deadline or Deadline()
+        self.count("calls")
+
+        # Breakers are consulted lazily, so an unused secondary never burns its half-open probe
+        backends = [
+            (name, client) for name, client in (("primary", self.primary), ("secondary", self.secondary))
+            if client is not None
+        ]
+
+        pending = set()
+        last_error = None
+
+        def submit_next():
+            while backends:
+                name, client = backends.pop(0)
+                if self.breakers[name].allow_request():
+                    pending.add(self.submit(name, client, prompt, build_chat_history))
+                    return True
+            return False
+
+        if not submit_next():
+            self.count("short_circuited")
+            raise ProviderRequestError("Every generation backend has an open circuit breaker")
+
+        hedge_delay = self.get_hedge_delay()
+
+        while pending:
+            # Wait for a result, the hedge threshold or the deadline, whichever comes first
+            timeout = deadline.bound(hedge_delay if backends else None)
+            done, pending_left = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            pending.intersection_update(pending_left)
+
+            for future in done:
+                try:
+                    answer, chat_history = future.result()
+                except Exception as e:
+                    self.logger.warning(f"Generation backend {future.backend_name} failed: {e}")
+                    last_error = e
+                    continue
+
+                if future.backend_name == "secondary":
+                    self.count("secondary_wins")
+                return answer, chat_history
+
+            if deadline.expired():
+                self.count("deadline_exceeded")
+                raise DeadlineExceeded("Request deadline reached during generation")
+
+            # Hedge on a slow primary, or fail over right away when it errored
+            if backends and (not done or not pending):
+                if submit_next() and not done:
+                    self.count("hedged")
+
+        if last_error is None:
+            self.count("short_circuited")
+            raise ProviderRequestError("Every generation backend has an open circuit breaker")
+
+        raise last_error
+
+    def get_stats(self):
+        with self.stats_lock:
+            stats = dict(self.stats)
+
+        stats["breakers"] = { name: breaker.state for name, breaker in self.breakers.items() }
+        stats["hedge_delay"] = self.get_hedge_delay()
+        return stats
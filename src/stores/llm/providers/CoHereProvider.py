@@ -1,36 +1,83 @@
 from ..LLMInterface import LLMInterface
-from ..LLMEnums import CoHereEnums, DocumentTypeEnum
+from ..LLMEnums import LLMEnums, CoHereEnums, DocumentTypeEnum, EmbeddingTypeEnums
+from ..RateLimiter import estimate_tokens
+from ..EmbeddingCompressor import unpack_ubinary
 import cohere
 import logging
 
 class CoHereProvider(LLMInterface):
 
+    # Compact types are requested from the API instead of quantizing locally
+    SUPPORTED_EMBEDDING_TYPES = tuple(embedding_type.value for embedding_type in EmbeddingTypeEnums)
+
     def __init__(self, api_key: str,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       rate_limiters=None, http_client=None,
+                       embedding_timeout: float=None, generation_timeout: float=None):
         
         self.api_key = api_key
+        self.rate_limiters = rate_limiters
+
+        # Per-operation timeouts on top of the shared pooled http client; retries are
+        # owned by the shared rate limiter so the SDK's own are disabled when it is set
+        self.embedding_request_options = self.build_request_options(timeout=embedding_timeout)
+        self.generation_request_options = self.build_request_options(timeout=generation_timeout)
 
         self.default_input_max_characters = default_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
         self.default_generation_temperature = default_generation_temperature
 
         self.generation_model_id = None
+        self.generation_limiter = None
 
         self.embedding_model_id = None
         self.embedding_size = None
+        self.embedding_type = EmbeddingTypeEnums.FLOAT.value
+        self.embedding_limiter = None
 
-        self.client = cohere.Client(api_key=self.api_key)
+        self.client = cohere.Client(api_key=self.api_key, httpx_client=http_client)
 
         self.logger = logging.getLogger(__name__)
 
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
+        if self.rate_limiters:
+            self.generation_limiter = self.rate_limiters.get(LLMEnums.COHERE.value, model_id)
 
     def set_embedding_model(self, model_id: str, embedding_size: int):
         self.embedding_model_id = model_id
         self.embedding_size = embedding_size
+        if self.rate_limiters:
+            self.embedding_limiter = self.rate_limiters.get(LLMEnums.COHERE.value, model_id)
+
+    def set_embedding_type(self, embedding_type: str):
+        self.embedding_type = embedding_type
+
+    def get_embeddings(self, response):
+        embeddings = getattr(response.embeddings, self.embedding_type, None) if response and response.embeddings else None
+        if not embeddings:
+            return None
+
+        if self.embedding_type == EmbeddingTypeEnums.UBINARY.value:
+            # Packed bits are expanded to -1/+1 so every store sees `embedding_size` dimensions
+            return unpack_ubinary(embeddings, self.embedding_size).tolist()
+
+        return embeddings
+
+    def build_request_options(self, timeout: float = None):
+        request_options = {}
+        if timeout:
+            request_options["timeout_in_seconds"] = timeout
+        if self.rate_limiters:
+            request_options["max_retries"] = 0
+        return request_options
+
+    def call_with_limits(self, limiter, fn, tokens: int = 1):
+        if limiter is None:
+            return fn()
+        return limiter.call(fn, tokens=tokens)
 
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
@@ -49,12 +96,18 @@ class CoHereProvider(LLMInterface):
         max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
         temperature = temperature if temperature else self.default_generation_temperature
 
-        response = self.client.chat(
-            model = self.generation_model_id,
-            chat_history = chat_history,
-            message = self.process_text(prompt),
-            temperature = temperature,
-            max_tokens = max_output_tokens
+        message = self.process_text(prompt)
+        response = self.call_with_limits(
+            self.generation_limiter,
+            lambda: self.client.chat(
+                model = self.generation_model_id,
+                chat_history = chat_history,
+                message = message,
+                temperature = temperature,
+                max_tokens = max_output_tokens,
+                request_options = self.generation_request_options
+            ),
+            tokens = estimate_tokens(message, *[ turn.get("text") for turn in chat_history ]) + max_output_tokens
         )
 
         if not response or not response.text:
@@ -76,18 +129,25 @@ class CoHereProvider(LLMInterface):
         if document_type == DocumentTypeEnum.QUERY:
             input_type = CoHereEnums.QUERY
 
-        response = self.client.embed(
-            model = self.embedding_model_id,
-            texts = [self.process_text(text)],
-            input_type = input_type,
-            embedding_types=['float'],
+        processed = self.process_text(text)
+        response = self.call_with_limits(
+            self.embedding_limiter,
+            lambda: self.client.embed(
+                model = self.embedding_model_id,
+                texts = [processed],
+                input_type = input_type,
+                embedding_types=[self.embedding_type],
+                request_options = self.embedding_request_options
+            ),
+            tokens = estimate_tokens(processed)
         )
 
-        if not response or not response.embeddings or not response.embeddings.float:
+        embeddings = self.get_embeddings(response)
+        if not embeddings:
             self.logger.error("Error while embedding text with CoHere")
             return None
         
-        return response.embeddings.float[0]
+        return embeddings[0]
 
     def embed_texts(self, texts: list, document_type: str = None):
         if not self.client:
@@ -104,18 +164,24 @@ class CoHereProvider(LLMInterface):
 
         processed = [self.process_text(t) for t in texts]
 
-        response = self.client.embed(
-            model=self.embedding_model_id,
-            texts=processed,
-            input_type=input_type,
-            embedding_types=['float'],
+        response = self.call_with_limits(
+            self.embedding_limiter,
+            lambda: self.client.embed(
+                model=self.embedding_model_id,
+                texts=processed,
+                input_type=input_type,
+                embedding_types=[self.embedding_type],
+                request_options=self.embedding_request_options
+            ),
+            tokens=estimate_tokens(*processed)
         )
 
-        if not response or not response.embeddings or not response.embeddings.float:
+        embeddings = self.get_embeddings(response)
+        if not embeddings:
             self.logger.error("Error while embedding texts with CoHere")
             return None
 
-        return response.embeddings.float
+        return embeddings
     
     def construct_prompt(self, prompt: str, role: str):
         return {
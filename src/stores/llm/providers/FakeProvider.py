@@ -0,0 +1,65 @@
+from ..LLMInterface import LLMInterface
+import numpy as np
+import logging
+import random
+import time
+import zlib
+
+
+class FakeProvider(LLMInterface):
+    """Deterministic stand-in for a remote provider with configurable latency and jitter.
+
+    Vectors are derived from a crc32 of the text, so the same text always maps
+    to the same vector across processes, and answers echo the prompt size.
+    """
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0,
+                       default_input_max_characters: int = 1000):
+
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.default_input_max_characters = default_input_max_characters
+
+        self.generation_model_id = None
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def process_text(self, text: str):
+        return text[:self.default_input_max_characters].strip()
+
+    def simulate_latency(self):
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        self.simulate_latency()
+        return f"Fake answer for a {len(prompt)} characters prompt with {len(chat_history)} history turns"
+
+    def vectorize(self, text: str):
+        seed = zlib.crc32(self.process_text(text).encode("utf-8"))
+        return np.random.default_rng(seed).standard_normal(self.embedding_size).astype(np.float32).tolist()
+
+    def embed_text(self, text: str, document_type: str = None):
+        self.simulate_latency()
+        return self.vectorize(text)
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        self.simulate_latency()
+        return [ self.vectorize(text) for text in texts ]
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": self.process_text(prompt)
+        }
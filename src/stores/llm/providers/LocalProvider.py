@@ -0,0 +1,158 @@
+from ..LLMInterface import LLMInterface
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import threading
+import logging
+import zlib
+import re
+
+
+class LocalProvider(LLMInterface):
+    """In-process CPU embeddings: a sentence-transformers (torch or ONNX) model when one is
+    configured and installed, otherwise a dependency-free feature-hashing vectorizer."""
+
+    HASHING_MODEL_ID = "hashing"
+    # Size of hashing vectors when EMBEDDING_MODEL_SIZE is not set
+    DEFAULT_HASHING_SIZE = 384
+
+    def __init__(self, default_input_max_characters: int=1000,
+                       max_workers: int=2, device: str="cpu", backend: str="torch",
+                       inference_batch_size: int=32):
+
+        self.default_input_max_characters = default_input_max_characters
+        self.device = device
+        self.backend = backend
+        self.inference_batch_size = inference_batch_size
+
+        self.embedding_model_id = None
+        self.embedding_size = None
+        self.model = None
+        self.model_lock = threading.Lock()
+
+        # CPU inference runs on a dedicated pool so batches are split across cores
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="local-embedding")
+
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str):
+        self.logger.warning("LocalProvider only supports embeddings, generation model ignored")
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id or self.HASHING_MODEL_ID
+        self.embedding_size = embedding_size
+        self.model = None
+
+        if self.embedding_model_id == self.HASHING_MODEL_ID:
+            self.use_hashing_vectorizer()
+
+    def use_hashing_vectorizer(self):
+        self.embedding_model_id = self.HASHING_MODEL_ID
+        if not self.embedding_size:
+            self.logger.warning(
+                f"EMBEDDING_MODEL_SIZE is not set, hashing vectors get {self.DEFAULT_HASHING_SIZE} dimensions"
+            )
+            self.embedding_size = self.DEFAULT_HASHING_SIZE
+
+    def process_text(self, text: str):
+        return text[:self.default_input_max_characters].strip()
+
+    def load_model(self):
+        with self.model_lock:
+            if self.model is not None or self.embedding_model_id == self.HASHING_MODEL_ID:
+                return
+
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                self.logger.warning(
+                    "sentence-transformers is not installed, falling back to the hashing vectorizer"
+                )
+                self.use_hashing_vectorizer()
+                return
+
+            model_kwargs = { "device": self.device }
+            if self.backend and self.backend != "torch":
+                model_kwargs["backend"] = self.backend
+
+            self.model = SentenceTransformer(self.embedding_model_id, **model_kwargs)
+
+            model_size = self.model.get_sentence_embedding_dimension()
+            if self.embedding_size and model_size != self.embedding_size:
+                self.logger.warning(
+                    f"EMBEDDING_MODEL_SIZE={self.embedding_size} does not match {self.embedding_model_id} "
+                    f"({model_size}), using the model size"
+                )
+            self.embedding_size = model_size
+
+    def warm_up(self):
+        """Load the model and run one inference so the first request pays no setup cost"""
+        self.load_model()
+        self.embed_texts(texts=["warm up"])
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        self.logger.error("LocalProvider does not support text generation")
+        return None
+
+    def hash_features(self, text: str):
+        # Word unigrams plus character trigrams keep the vectors useful for
+        # morphologically rich and non-latin languages
+        words = re.findall(r"\w+", text.lower())
+        features = list(words)
+        for word in words:
+            padded = f"<{word}>"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+
+        vector = np.zeros(self.embedding_size, dtype=np.float32)
+        if not features:
+            return vector
+
+        # crc32 is stable across processes, unlike hash()
+        hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features),
+                             dtype=np.uint32, count=len(features))
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.embedding_size, signs)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def encode_batch(self, texts: list):
+        if self.model is not None:
+            return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).tolist()
+
+        return [ self.hash_features(text).tolist() for text in texts ]
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for LocalProvider was not set")
+            return None
+
+        self.load_model()
+
+        processed = [ self.process_text(text) for text in texts ]
+        batches = [
+            processed[i:i + self.inference_batch_size]
+            for i in range(0, len(processed), self.inference_batch_size)
+        ]
+
+        if len(batches) == 1:
+            return self.encode_batch(batches[0])
+
+        vectors = []
+        for batch_vectors in self.executor.map(self.encode_batch, batches):
+            vectors.extend(batch_vectors)
+
+        return vectors
+
+    def embed_text(self, text: str, document_type: str = None):
+        vectors = self.embed_texts(texts=[text], document_type=document_type)
+        if not vectors:
+            return None
+
+        return vectors[0]
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": self.process_text(prompt)
+        }
@@ -1,5 +1,6 @@
 from ..LLMInterface import LLMInterface
-from ..LLMEnums import OpenAIEnums
+from ..LLMEnums import LLMEnums, OpenAIEnums
+from ..RateLimiter import estimate_tokens
 from openai import OpenAI
 import logging
 
@@ -8,35 +9,65 @@ class OpenAIProvider(LLMInterface):
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       rate_limiters=None, http_client=None,
+                       embedding_timeout: float=None, generation_timeout: float=None):
         
         self.api_key = api_key
         self.api_url = api_url
+        self.rate_limiters = rate_limiters
+
+        # Per-operation timeouts on top of the shared pooled http client
+        self.embedding_request_options = { "timeout": embedding_timeout } if embedding_timeout else {}
+        self.generation_request_options = { "timeout": generation_timeout } if generation_timeout else {}
 
         self.default_input_max_characters = default_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
         self.default_generation_temperature = default_generation_temperature
 
         self.generation_model_id = None
+        self.generation_limiter = None
 
         self.embedding_model_id = None
         self.embedding_size = None
+        self.embedding_options = {}
+        self.embedding_limiter = None
 
         # Only pass base_url if it is a full URL with http/https
         client_kwargs = { "api_key": self.api_key }
         if self.api_url and (self.api_url.startswith("http://") or self.api_url.startswith("https://")):
             client_kwargs["base_url"] = self.api_url
 
+        if http_client is not None:
+            client_kwargs["http_client"] = http_client
+
+        # Retries are owned by the shared rate limiter so they are not multiplied
+        if self.rate_limiters:
+            client_kwargs["max_retries"] = 0
+
         self.client = OpenAI(**client_kwargs)
 
         self.logger = logging.getLogger(__name__)
 
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
+        if self.rate_limiters:
+            self.generation_limiter = self.rate_limiters.get(LLMEnums.OPENAI.value, model_id)
 
     def set_embedding_model(self, model_id: str, embedding_size: int):
         self.embedding_model_id = model_id
         self.embedding_size = embedding_size
+        # text-embedding-3 models are shortened server-side to the configured size
+        self.embedding_options = {}
+        if embedding_size and model_id and model_id.startswith(OpenAIEnums.DIMENSIONS_MODEL_PREFIX.value):
+            self.embedding_options["dimensions"] = embedding_size
+        if self.rate_limiters:
+            self.embedding_limiter = self.rate_limiters.get(LLMEnums.OPENAI.value, model_id)
+
+    def call_with_limits(self, limiter, fn, tokens: int = 1):
+        if limiter is None:
+            return fn()
+        return limiter.call(fn, tokens=tokens)
 
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
@@ -59,11 +90,16 @@ class OpenAIProvider(LLMInterface):
             self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
         )
 
-        response = self.client.chat.completions.create(
-            model = self.generation_model_id,
-            messages = chat_history,
-            max_tokens = max_output_tokens,
-            temperature = temperature
+        response = self.call_with_limits(
+            self.generation_limiter,
+            lambda: self.client.chat.completions.create(
+                model = self.generation_model_id,
+                messages = chat_history,
+                max_tokens = max_output_tokens,
+                temperature = temperature,
+                **self.generation_request_options
+            ),
+            tokens = estimate_tokens(*[ message.get("content") for message in chat_history ]) + max_output_tokens
         )
 
         if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
@@ -83,9 +119,15 @@ class OpenAIProvider(LLMInterface):
             self.logger.error("Embedding model for OpenAI was not set")
             return None
         
-        response = self.client.embeddings.create(
-            model = self.embedding_model_id,
-            input = text,
+        response = self.call_with_limits(
+            self.embedding_limiter,
+            lambda: self.client.embeddings.create(
+                model = self.embedding_model_id,
+                input = text,
+                **self.embedding_options,
+                **self.embedding_request_options
+            ),
+            tokens = estimate_tokens(text)
         )
 
         if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
@@ -94,6 +136,34 @@ class OpenAIProvider(LLMInterface):
 
         return response.data[0].embedding
 
+    def embed_texts(self, texts: list, document_type: str = None):
+
+        if not self.client:
+            self.logger.error("OpenAI client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        response = self.call_with_limits(
+            self.embedding_limiter,
+            lambda: self.client.embeddings.create(
+                model = self.embedding_model_id,
+                input = texts,
+                **self.embedding_options,
+                **self.embedding_request_options
+            ),
+            tokens = estimate_tokens(*texts)
+        )
+
+        if not response or not response.data or len(response.data) != len(texts):
+            self.logger.error("Error while embedding texts with OpenAI")
+            return None
+
+        # The API may return items out of order, so align them by index
+        return [ item.embedding for item in sorted(response.data, key=lambda item: item.index) ]
+
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
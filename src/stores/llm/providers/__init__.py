@@ -1,2 +1,11 @@
-from .CoHereProvider import CoHereProvider
-from .OpenAIProvider import OpenAIProvider
\ No newline at end of file
+import importlib
+
+# Each provider pulls in its SDK (openai, cohere, torch...), so they are only
+# imported when first referenced rather than whenever this package is loaded
+__all__ = ["CoHereProvider", "OpenAIProvider", "LocalProvider", "FakeProvider"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(importlib.import_module(f".{name}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
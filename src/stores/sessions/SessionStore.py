@@ -0,0 +1,149 @@
+from collections import OrderedDict
+import threading
+import logging
+import sqlite3
+import json
+import time
+import uuid
+
+
+class SessionStore:
+    """Bounded LRU + TTL store for conversation sessions with optional SQLite spill.
+
+    Callers work on copies: `create` and `get` hand out a session dict that is
+    not shared with the store, and `save` merges it back under the lock, so
+    concurrent follow-ups on one session each add their turns.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: int = 1800,
+                 max_turns: int = 10, max_documents: int = 20, sqlite_path: str = None):
+
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+        self.max_documents = max_documents
+
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.connection = None
+        if sqlite_path:
+            self.connection = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)"
+            )
+            self.connection.commit()
+
+        self.logger = logging.getLogger(__name__)
+
+    def is_expired(self, session: dict, now: float = None):
+        now = now if now is not None else time.time()
+        return now - session["updated_at"] > self.ttl_seconds
+
+    def create(self, project_id: str, session_id: str = None):
+        """A new session; it is only stored once saved"""
+        return {
+            "session_id": session_id or uuid.uuid4().hex,
+            "project_id": project_id,
+            "turns": [],
+            "documents": [],
+            "updated_at": time.time(),
+        }
+
+    @staticmethod
+    def copy(session: dict):
+        return { **session, "turns": list(session["turns"]), "documents": list(session["documents"]) }
+
+    def get(self, session_id: str, project_id: str = None):
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = self.load_spilled(session_id)
+                if session is not None:
+                    self.put(session)
+
+            if session is None:
+                return None
+
+            if self.is_expired(session):
+                self.sessions.pop(session_id, None)
+                return None
+
+            if project_id is not None and session["project_id"] != project_id:
+                return None
+
+            self.sessions.move_to_end(session_id)
+            return self.copy(session)
+
+    def save(self, session: dict, base_turns: int = 0):
+        """Store a session copy; its turns past `base_turns` are appended to the stored ones"""
+        with self.lock:
+            stored = self.sessions.get(session["session_id"]) or self.load_spilled(session["session_id"])
+            turns = session["turns"]
+            if stored is not None:
+                # Turns saved by concurrent follow-ups since this copy was taken are kept
+                turns = stored["turns"] + session["turns"][base_turns:]
+
+            self.put({
+                **session,
+                "turns": turns[-self.max_turns:],
+                # Extended retrieval sets append new documents, so the newest are the ones kept
+                "documents": session["documents"][-self.max_documents:],
+                "updated_at": time.time(),
+            })
+
+    def delete(self, session_id: str):
+        with self.lock:
+            self.sessions.pop(session_id, None)
+            if self.connection is not None:
+                self.connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self.connection.commit()
+
+    def put(self, session: dict):
+        """Insert as most recent and evict past capacity; caller holds the lock"""
+        self.sessions[session["session_id"]] = session
+        self.sessions.move_to_end(session["session_id"])
+
+        now = time.time()
+        while len(self.sessions) > self.max_sessions:
+            _, evicted = self.sessions.popitem(last=False)
+            if not self.is_expired(evicted, now=now):
+                self.spill(evicted)
+
+    def spill(self, session: dict):
+        if self.connection is None:
+            return
+
+        try:
+            # Spilled sessions that were never resumed are cleaned up lazily here
+            self.connection.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?)",
+                (session["session_id"], json.dumps(session), session["updated_at"])
+            )
+            self.connection.commit()
+        except Exception as e:
+            self.logger.error(f"Error while spilling session to SQLite: {e}")
+
+    def load_spilled(self, session_id: str):
+        if self.connection is None:
+            return None
+
+        row = self.connection.execute(
+            "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        # The session moves back into memory, so the spilled copy is dropped
+        self.connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        self.connection.commit()
+
+        return json.loads(row[0])
@@ -0,0 +1 @@
+from .SessionStore import SessionStore
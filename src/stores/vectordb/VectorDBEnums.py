@@ -2,7 +2,13 @@ from enum import Enum
 
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
+    MEMORY = "MEMORY"
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
-    DOT = "dot"
\ No newline at end of file
+    DOT = "dot"
+
+class CollectionModeEnums(Enum):
+    # One collection per project, or every project in one collection filtered by project_id
+    PER_PROJECT = "PER_PROJECT"
+    SHARED = "SHARED"
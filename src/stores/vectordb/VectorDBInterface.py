@@ -30,22 +30,38 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                tenant_field: str = None):
         pass
 
     @abstractmethod
     def insert_one(self, collection_name: str, text: str, vector: list,
                          metadata: dict = None, 
-                         record_id: str = None):
+                         record_id: str = None,
+                         extra_payload: dict = None):
         pass
 
     @abstractmethod
     def insert_many(self, collection_name: str, texts: list, 
                           vectors: list, metadata: list = None, 
-                          record_ids: list = None, batch_size: int = 50):
+                          record_ids: list = None, batch_size: int = 50,
+                          extra_payload: dict = None):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int):
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               with_vectors: bool = False, filters: dict = None):
+        pass
+
+    @abstractmethod
+    def delete_by_filter(self, collection_name: str, filters: dict):
+        pass
+
+    @abstractmethod
+    def count_points(self, collection_name: str, filters: dict = None) -> int:
+        pass
+
+    @abstractmethod
+    def iterate_points(self, collection_name: str, batch_size: int = 256,
+                             with_vectors: bool = True, filters: dict = None):
         pass
-    
\ No newline at end of file
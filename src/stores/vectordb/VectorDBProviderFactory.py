@@ -1,4 +1,3 @@
-from .providers.QdrantDBProvider import QdrantDBProvider
 from .VectorDBEnums import VectorDBEnums
 from controllers.BaseController import BaseController
 
@@ -8,12 +7,21 @@ class VectorDBProviderFactory:
         self.base_controller = BaseController()
 
     def create(self, provider: str):
+        # qdrant_client alone takes a large share of startup, so it is imported on demand
         if provider == VectorDBEnums.QDRANT.value:
+            from .providers.QdrantDBProvider import QdrantDBProvider
             db_path = self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_PATH)
 
             return QdrantDBProvider(
                 db_path=db_path,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                embedding_type=self.config.EMBEDDING_TYPE,
             )
         
+        if provider == VectorDBEnums.MEMORY.value:
+            from .providers.InMemoryDBProvider import InMemoryDBProvider
+            return InMemoryDBProvider(
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+            )
+
         return None
\ No newline at end of file
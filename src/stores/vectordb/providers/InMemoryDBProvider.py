@@ -0,0 +1,294 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums
+from models.db_schemes import RetrievedDocument
+from typing import List
+import numpy as np
+import threading
+import logging
+
+
+class InMemoryDBProvider(VectorDBInterface):
+    """Brute-force NumPy vector store kept in process memory (tests and benchmarks)"""
+
+    def __init__(self, distance_method: str):
+
+        self.collections = None
+        self.distance_method = distance_method or DistanceMethodEnums.COSINE.value
+        self.lock = threading.RLock()
+
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        self.collections = {}
+
+    def disconnect(self):
+        self.collections = None
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return collection_name in self.collections
+
+    def list_all_collections(self) -> List:
+        return list(self.collections.keys())
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            return None
+
+        return {
+            "points_count": len(collection["ids"]),
+            "embedding_size": collection["embedding_size"],
+            "distance": self.distance_method,
+        }
+
+    def delete_collection(self, collection_name: str):
+        with self.lock:
+            return self.collections.pop(collection_name, None) is not None
+
+    def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                tenant_field: str = None):
+        with self.lock:
+            if do_reset:
+                _ = self.delete_collection(collection_name=collection_name)
+
+            if self.is_collection_existed(collection_name):
+                return False
+
+            self.collections[collection_name] = {
+                "embedding_size": embedding_size,
+                "vectors": np.zeros((0, embedding_size), dtype=np.float32),
+                "buffer": None,
+                "ids": [],
+                "positions": {},
+                "payloads": [],
+                # Positions per tenant value, so tenant-scoped searches skip everyone else
+                "tenant_field": tenant_field,
+                "tenants": {},
+            }
+            return True
+
+    def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None,
+                         record_id: str = None,
+                         extra_payload: dict = None):
+        return self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id],
+            extra_payload=extra_payload,
+        )
+
+    def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 50,
+                          extra_payload: dict = None):
+
+        if not self.is_collection_existed(collection_name):
+            self.logger.error(f"Can not insert new records to non-existed collection: {collection_name}")
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        new_vectors = np.asarray(vectors, dtype=np.float32)
+        if self.distance_method == DistanceMethodEnums.COSINE.value:
+            new_vectors = new_vectors / np.maximum(
+                np.linalg.norm(new_vectors, axis=1, keepdims=True), 1e-12
+            )
+
+        with self.lock:
+            collection = self.collections[collection_name]
+            size = len(collection["ids"])
+            appended = []
+
+            # Upsert semantics: existing ids are overwritten in place
+            for x, record_id in enumerate(record_ids):
+                payload = { "text": texts[x], "metadata": metadata[x], **(extra_payload or {}) }
+                position = collection["positions"].get(record_id)
+                if position is None:
+                    position = collection["positions"][record_id] = size + len(appended)
+                    appended.append((record_id, x, payload))
+                elif position >= size:
+                    # Repeated within this batch: the last occurrence wins, as for existing ids
+                    self.untrack_tenant(collection, position, payload=appended[position - size][2])
+                    appended[position - size] = (record_id, x, payload)
+                else:
+                    self.untrack_tenant(collection, position)
+                    collection["vectors"][position] = new_vectors[x]
+                    collection["payloads"][position] = payload
+                self.track_tenant(collection, position, payload)
+
+            if appended:
+                self.append_vectors(collection, new_vectors[[x for _, x, _ in appended]])
+                collection["ids"].extend(record_id for record_id, _, _ in appended)
+                collection["payloads"].extend(payload for _, _, payload in appended)
+
+        return True
+
+    def append_vectors(self, collection: dict, new_vectors: np.ndarray):
+        # Rows go into a buffer grown geometrically; "vectors" is a view of its filled part,
+        # so many small inserts (one per project in a shared collection) stay amortized O(n)
+        size = len(collection["vectors"])
+        buffer = collection.get("buffer")
+        if buffer is None or len(buffer) < size + len(new_vectors):
+            capacity = max(2 * size, size + len(new_vectors), 64)
+            buffer = np.empty((capacity, collection["embedding_size"]), dtype=np.float32)
+            buffer[:size] = collection["vectors"]
+            collection["buffer"] = buffer
+
+        buffer[size:size + len(new_vectors)] = new_vectors
+        collection["vectors"] = buffer[:size + len(new_vectors)]
+
+    def track_tenant(self, collection: dict, position: int, payload: dict):
+        tenant_field = collection["tenant_field"]
+        if tenant_field is not None:
+            collection["tenants"].setdefault(payload.get(tenant_field), []).append(position)
+
+    def untrack_tenant(self, collection: dict, position: int, payload: dict = None):
+        tenant_field = collection["tenant_field"]
+        if tenant_field is not None:
+            payload = payload if payload is not None else collection["payloads"][position]
+            collection["tenants"][payload.get(tenant_field)].remove(position)
+
+    def get_filtered_positions(self, collection: dict, filters: dict):
+        """Positions matching every `field == value` filter; None means the whole collection"""
+        if not filters:
+            return None
+
+        filters = dict(filters)
+        positions = None
+
+        tenant_field = collection["tenant_field"]
+        if tenant_field is not None and tenant_field in filters:
+            positions = collection["tenants"].get(filters.pop(tenant_field), [])
+
+        if filters:
+            payloads = collection["payloads"]
+            positions = [
+                position for position in (positions if positions is not None else range(len(payloads)))
+                if all(payloads[position].get(key) == value for key, value in filters.items())
+            ]
+
+        return np.asarray(positions, dtype=np.int64)
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               with_vectors: bool = False, filters: dict = None):
+
+        collection = self.collections.get(collection_name)
+        if collection is None or len(collection["ids"]) == 0:
+            return None
+
+        query = np.asarray(vector, dtype=np.float32)
+        if self.distance_method == DistanceMethodEnums.COSINE.value:
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        with self.lock:
+            vectors = collection["vectors"]
+            candidates = self.get_filtered_positions(collection, filters)
+
+            if candidates is None:
+                scores = vectors @ query
+            elif len(candidates) == 0:
+                return None
+            else:
+                scores = vectors[candidates] @ query
+
+            limit = min(limit, len(scores))
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+
+            if candidates is not None:
+                # Scores are indexed by candidate, map them back to collection positions
+                scores = dict(zip(candidates[top].tolist(), scores[top].tolist()))
+                top = list(scores.keys())
+
+            return [
+                RetrievedDocument(**{
+                    "score": float(scores[position]),
+                    "text": collection["payloads"][position]["text"],
+                    "id": collection["ids"][position],
+                    "vector": vectors[position].tolist() if with_vectors else None,
+                    "metadata": collection["payloads"][position]["metadata"],
+                })
+                for position in top
+            ]
+
+    def delete_by_filter(self, collection_name: str, filters: dict):
+        if not filters:
+            raise ValueError("Refusing to delete by an empty filter")
+
+        with self.lock:
+            collection = self.collections.get(collection_name)
+            if collection is None:
+                return False
+
+            deleted = self.get_filtered_positions(collection, filters)
+            if len(deleted) == 0:
+                return True
+
+            keep = np.ones(len(collection["ids"]), dtype=bool)
+            keep[deleted] = False
+
+            collection["vectors"] = collection["buffer"] = collection["vectors"][keep]
+            collection["ids"] = [ record_id for record_id, kept in zip(collection["ids"], keep) if kept ]
+            collection["payloads"] = [ payload for payload, kept in zip(collection["payloads"], keep) if kept ]
+            collection["positions"] = { record_id: position for position, record_id in enumerate(collection["ids"]) }
+
+            collection["tenants"] = {}
+            for position, payload in enumerate(collection["payloads"]):
+                self.track_tenant(collection, position, payload)
+
+        return True
+
+    def count_points(self, collection_name: str, filters: dict = None) -> int:
+        with self.lock:
+            collection = self.collections.get(collection_name)
+            if collection is None:
+                return 0
+
+            positions = self.get_filtered_positions(collection, filters)
+            return len(collection["ids"]) if positions is None else len(positions)
+
+    def iterate_points(self, collection_name: str, batch_size: int = 256,
+                             with_vectors: bool = True, filters: dict = None):
+        """Points present when iteration starts, in batches copied under the lock.
+
+        Deletes compact the arrays, so every batch looks its ids' positions up
+        again: points deleted meanwhile are skipped, and iteration stops if the
+        collection is deleted or reset.
+        """
+        with self.lock:
+            collection = self.collections.get(collection_name)
+            if collection is None:
+                return
+
+            positions = self.get_filtered_positions(collection, filters)
+            if positions is None:
+                record_ids = list(collection["ids"])
+            else:
+                record_ids = [ collection["ids"][position] for position in positions ]
+
+        for start in range(0, len(record_ids), batch_size):
+            with self.lock:
+                if self.collections.get(collection_name) is not collection:
+                    return
+
+                batch = []
+                for record_id in record_ids[start:start + batch_size]:
+                    position = collection["positions"].get(record_id)
+                    if position is None:
+                        continue
+                    batch.append((
+                        record_id,
+                        collection["vectors"][position].tolist() if with_vectors else None,
+                        collection["payloads"][position],
+                    ))
+            if batch:
+                yield batch
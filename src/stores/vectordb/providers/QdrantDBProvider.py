@@ -1,17 +1,20 @@
 from qdrant_client import models, QdrantClient
 from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import DistanceMethodEnums
+from stores.llm.LLMEnums import EmbeddingTypeEnums
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocument
+from helpers.metrics import track_stage, VECTORDB_LATENCY, VECTORDB_ERRORS, BATCH_SIZE
 
 class QdrantDBProvider(VectorDBInterface):
 
-    def __init__(self, db_path: str, distance_method: str):
+    def __init__(self, db_path: str, distance_method: str, embedding_type: str = None):
 
         self.client = None
         self.db_path = db_path
         self.distance_method = None
+        self.embedding_type = embedding_type
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
@@ -30,7 +33,7 @@ class QdrantDBProvider(VectorDBInterface):
         return self.client.collection_exists(collection_name=collection_name)
     
     def list_all_collections(self) -> List:
-        return self.client.get_collections()
+        return [ c.name for c in self.client.get_collections().collections ]
     
     def get_collection_info(self, collection_name: str) -> dict:
         return self.client.get_collection(collection_name=collection_name)
@@ -41,26 +44,81 @@ class QdrantDBProvider(VectorDBInterface):
         
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                tenant_field: str = None):
         if do_reset:
             _ = self.delete_collection(collection_name=collection_name)
         
         if not self.is_collection_existed(collection_name):
-            _ = self.client.create_collection(
-                collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=embedding_size,
-                    distance=self.distance_method
+            # Multi-tenant collections are always searched within one tenant, so skip the
+            # global HNSW graph and build one per tenant value instead
+            hnsw_config = models.HnswConfigDiff(payload_m=16, m=0) if tenant_field else None
+
+            with track_stage("create", VECTORDB_LATENCY, "operation", "vectordb_create"):
+                _ = self.client.create_collection(
+                    collection_name=collection_name,
+                    vectors_config=self.get_vector_params(embedding_size=embedding_size),
+                    hnsw_config=hnsw_config,
+                    quantization_config=self.get_quantization_config(),
                 )
-            )
+
+                if tenant_field:
+                    self.create_tenant_index(collection_name=collection_name, field_name=tenant_field)
 
             return True
         
         return False
+
+    def get_vector_params(self, embedding_size: int):
+        # Qdrant has no signed int8 type: int8 and -1/+1 binary values are exact in float16
+        datatype = {
+            EmbeddingTypeEnums.INT8.value: models.Datatype.FLOAT16,
+            EmbeddingTypeEnums.UINT8.value: models.Datatype.UINT8,
+            EmbeddingTypeEnums.UBINARY.value: models.Datatype.FLOAT16,
+        }.get(self.embedding_type)
+
+        return models.VectorParams(
+            size=embedding_size,
+            distance=self.distance_method,
+            datatype=datatype,
+            # Binary vectors are searched through the in-RAM quantized copy, originals stay on disk
+            on_disk=True if self.embedding_type == EmbeddingTypeEnums.UBINARY.value else None,
+        )
+
+    def get_quantization_config(self):
+        if self.embedding_type != EmbeddingTypeEnums.UBINARY.value:
+            return None
+
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        )
+
+    def create_tenant_index(self, collection_name: str, field_name: str):
+        # Tenant-optimized keyword indexes (co-located storage per tenant) need qdrant-client>=1.11
+        if hasattr(models, "KeywordIndexParams"):
+            field_schema = models.KeywordIndexParams(type="keyword", is_tenant=True)
+        else:
+            field_schema = models.PayloadSchemaType.KEYWORD
+
+        return self.client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+        )
+
+    def build_filter(self, filters: dict = None):
+        if not filters:
+            return None
+
+        return models.Filter(must=[
+            models.FieldCondition(key=key, match=models.MatchValue(value=value))
+            for key, value in filters.items()
+        ])
     
     def insert_one(self, collection_name: str, text: str, vector: list,
                          metadata: dict = None, 
-                         record_id: str = None):
+                         record_id: str = None,
+                         extra_payload: dict = None):
         
         if not self.is_collection_existed(collection_name):
             self.logger.error(f"Can not insert new record to non-existed collection: {collection_name}")
@@ -74,7 +132,7 @@ class QdrantDBProvider(VectorDBInterface):
                         id=record_id,
                         vector=vector,
                         payload={
-                            "text": text, "metadata": metadata
+                            "text": text, "metadata": metadata, **(extra_payload or {})
                         }
                     )
                 ]
@@ -87,7 +145,8 @@ class QdrantDBProvider(VectorDBInterface):
     
     def insert_many(self, collection_name: str, texts: list, 
                           vectors: list, metadata: list = None, 
-                          record_ids: list = None, batch_size: int = 50):
+                          record_ids: list = None, batch_size: int = 50,
+                          extra_payload: dict = None):
         
         if metadata is None:
             metadata = [None] * len(texts)
@@ -100,6 +159,9 @@ class QdrantDBProvider(VectorDBInterface):
 
             batch_texts = texts[i:batch_end]
             batch_vectors = vectors[i:batch_end]
+            if hasattr(batch_vectors, "tolist"):
+                # NumPy rows (e.g. a memory-mapped snapshot) become plain lists for the client
+                batch_vectors = batch_vectors.tolist()
             batch_metadata = metadata[i:batch_end]
             batch_record_ids = record_ids[i:batch_end]
 
@@ -108,31 +170,43 @@ class QdrantDBProvider(VectorDBInterface):
                     id=batch_record_ids[x],
                     vector=batch_vectors[x],
                     payload={
-                        "text": batch_texts[x], "metadata": batch_metadata[x]
+                        "text": batch_texts[x], "metadata": batch_metadata[x], **(extra_payload or {})
                     }
                 )
 
                 for x in range(len(batch_texts))
             ]
 
+            BATCH_SIZE.observe(len(batch_records), operation="vectordb_insert")
+
             try:
-                _ = self.client.upload_records(
-                    collection_name=collection_name,
-                    records=batch_records,
-                )
+                with track_stage("insert", VECTORDB_LATENCY, "operation", "vectordb_insert"):
+                    _ = self.client.upload_records(
+                        collection_name=collection_name,
+                        records=batch_records,
+                    )
             except Exception as e:
+                VECTORDB_ERRORS.inc(operation="insert")
                 self.logger.error(f"Error while inserting batch: {e}")
                 return False
 
         return True
         
-    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               with_vectors: bool = False, filters: dict = None):
 
-        results = self.client.search(
-            collection_name=collection_name,
-            query_vector=vector,
-            limit=limit
-        )
+        try:
+            with track_stage("search", VECTORDB_LATENCY, "operation", "vectordb_search"):
+                results = self.client.search(
+                    collection_name=collection_name,
+                    query_vector=vector,
+                    query_filter=self.build_filter(filters),
+                    limit=limit,
+                    with_vectors=with_vectors,
+                )
+        except Exception:
+            VECTORDB_ERRORS.inc(operation="search")
+            raise
 
         if not results or len(results) == 0:
             return None
@@ -141,6 +215,57 @@ class QdrantDBProvider(VectorDBInterface):
             RetrievedDocument(**{
                 "score": result.score,
                 "text": result.payload["text"],
+                "id": result.id,
+                "vector": result.vector if with_vectors else None,
+                "metadata": result.payload.get("metadata"),
             })
             for result in results
         ]
+
+    def delete_by_filter(self, collection_name: str, filters: dict):
+        if not filters:
+            raise ValueError("Refusing to delete by an empty filter")
+
+        if not self.is_collection_existed(collection_name):
+            return False
+
+        try:
+            with track_stage("delete", VECTORDB_LATENCY, "operation", "vectordb_delete"):
+                _ = self.client.delete(
+                    collection_name=collection_name,
+                    points_selector=models.FilterSelector(filter=self.build_filter(filters)),
+                )
+        except Exception:
+            VECTORDB_ERRORS.inc(operation="delete")
+            raise
+
+        return True
+
+    def count_points(self, collection_name: str, filters: dict = None) -> int:
+        if not self.is_collection_existed(collection_name):
+            return 0
+
+        return self.client.count(
+            collection_name=collection_name,
+            count_filter=self.build_filter(filters),
+            exact=True,
+        ).count
+
+    def iterate_points(self, collection_name: str, batch_size: int = 256,
+                             with_vectors: bool = True, filters: dict = None):
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=self.build_filter(filters),
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=with_vectors,
+            )
+
+            if points:
+                yield [ (point.id, point.vector, point.payload) for point in points ]
+
+            if offset is None:
+                break
@@ -1,28 +1,161 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+
+
+class _MissingVariables(dict):
+    """Leaves unknown {{var}} placeholders untouched instead of failing"""
+
+    def __missing__(self, key):
+        return "{{" + key + "}}"
+
+
+class CompiledTemplate:
+
+    __slots__ = ("source", "_format")
+
+    # Names only: a {{0}} placeholder would become a positional field and fail at render time,
+    # so anything that is not an identifier stays literal text like any other brace
+    _VARIABLE_PATTERN = re.compile(r"\{\{((?!\d)\w+)\}\}")
+
+    def __init__(self, source: str):
+        self.source = source
+
+        # Translate the {{var}} syntax into a str.format pattern once, so rendering
+        # is a single C-level format_map call instead of one replace per variable
+        parts = self._VARIABLE_PATTERN.split(source)
+        for i in range(0, len(parts), 2):
+            parts[i] = parts[i].replace("{", "{{").replace("}", "}}")
+        for i in range(1, len(parts), 2):
+            parts[i] = "{" + parts[i] + "}"
+
+        self._format = "".join(parts)
+
+    def render(self, variables: dict = None):
+        if not variables:
+            return self.source
+
+        try:
+            return self._format.format_map(variables)
+        except KeyError:
+            return self._format.format_map(_MissingVariables(variables))
+
+
 class TemplateParser:
 
-    def __init__(self):
-        # Default English RAG templates
-        self.templates = {
-            "rag": {
-                "system_prompt": (
-                    "You are a helpful assistant that answers strictly based on the provided documents. "
-                    "If the answer cannot be found, say you don't know."
-                ),
-                "document_prompt": "Document {{doc_num}}:\n{{chunk_text}}",
-                "footer_prompt": (
-                    "Using the documents above, answer the user's question concisely and accurately."
-                ),
-            }
+    # Locales come from requests: only plain language tags ('en', 'ar_EG', 'pt-BR') reach the filesystem
+    _LOCALE_PATTERN = re.compile(r"^[A-Za-z]{2,3}([_-][A-Za-z]{2,4})?$")
+
+    def __init__(self, language: str = "en", default_language: str = "en",
+                 templates_dir: str = None, reload_interval: float = 2.0):
+
+        self.templates_dir = templates_dir or os.path.join(
+            os.path.dirname(__file__), "locales"
+        )
+        self.default_language = default_language
+        self.language = None
+        self.reload_interval = reload_interval
+
+        # (locale, section) -> {"path", "mtime", "checked_at", "templates"}
+        self.sections = {}
+        self.lock = threading.Lock()
+
+        self.logger = logging.getLogger(__name__)
+
+        self.set_language(language)
+
+    def set_language(self, language: str):
+        self.language = language or self.default_language
+
+    def is_known_locale(self, locale: str):
+        return bool(locale) and bool(self._LOCALE_PATTERN.match(locale)) and os.path.isdir(
+            os.path.join(self.templates_dir, locale)
+        )
+
+    def get_locale_candidates(self, language: str = None):
+        """Resolve 'ar_EG' -> ['ar_EG', 'ar', <default>] without duplicates.
+
+        Unknown or malformed locales are dropped before any lookup, so they never
+        touch the filesystem outside `templates_dir` nor add cache entries.
+        """
+        language = language or self.language or ""
+        candidates = [language, language.split("_")[0].split("-")[0]]
+        candidates = [c for c in candidates if self.is_known_locale(c)]
+        candidates.append(self.default_language)
+        return list(dict.fromkeys(c for c in candidates if c))
+
+    def load_section(self, locale: str, section: str):
+        file_path = os.path.join(self.templates_dir, locale, f"{section}.json")
+
+        # Missing locales are cached as empty sections and re-checked like any other file
+        mtime, raw_templates = None, {}
+        if os.path.exists(file_path):
+            mtime = os.path.getmtime(file_path)
+            with open(file_path, "r", encoding="utf-8") as file:
+                raw_templates = json.load(file)
+
+        return {
+            "path": file_path,
+            "mtime": mtime,
+            "checked_at": time.monotonic(),
+            "templates": {
+                key: CompiledTemplate(value) for key, value in raw_templates.items()
+            },
         }
 
-    def get(self, section: str, key: str, variables: dict = None):
-        template = self.templates.get(section, {}).get(key, "")
-        if not variables:
-            return template
-        # Minimal templating using double braces {{var}}
-        result = template
-        for k, v in variables.items():
-            result = result.replace(f"{{{{{k}}}}}", str(v))
-        return result
+    def get_section(self, locale: str, section: str):
+        cache_key = (locale, section)
+        entry = self.sections.get(cache_key)
+
+        if entry is not None:
+            now = time.monotonic()
+            if now - entry["checked_at"] < self.reload_interval:
+                return entry
+
+            # Hot reload: only re-read the file when it changed on disk
+            entry["checked_at"] = now
+            try:
+                if os.path.getmtime(entry["path"]) == entry["mtime"]:
+                    return entry
+            except OSError:
+                pass
+
+        with self.lock:
+            try:
+                entry = self.load_section(locale=locale, section=section)
+            except Exception as e:
+                self.logger.error(f"Failed to load templates {locale}/{section}: {e}")
+                entry = self.sections.get(cache_key)
+
+            if entry is not None:
+                self.sections[cache_key] = entry
+
+        return entry
+
+    def get_template(self, section: str, key: str, language: str = None):
+        for locale in self.get_locale_candidates(language):
+            entry = self.get_section(locale=locale, section=section)
+            if entry and key in entry["templates"]:
+                return entry["templates"][key]
+
+        return None
+
+    def get(self, section: str, key: str, variables: dict = None, language: str = None):
+        template = self.get_template(section=section, key=key, language=language)
+        if template is None:
+            return ""
+
+        return template.render(variables)
 
+    def render_many(self, section: str, key: str, variables_list: list,
+                    separator: str = "\n", language: str = None):
+        """Render one template for every variables dict and join them in a single pass"""
+        template = self.get_template(section=section, key=key, language=language)
+        if template is None:
+            return ""
 
+        render = template.render
+        return separator.join([render(variables) for variables in variables_list])
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from benchmarks.splitter_benchmark import random_text
+from helpers.text_splitter import SpanTextSplitter
+
+EDGE_CASE_TEXTS = [
+    "",
+    "   ",
+    "\n\n\n",
+    " \t \n ",
+    "a",
+    "x" * 2500,
+    "short " + "y" * 700 + " words after an unbroken token",
+    "first paragraph\n\nsecond paragraph\nwith a line\n\n\n" + "z" * 120,
+]
+
+SIZES = [ (1, 0), (5, 2), (20, 0), (50, 10), (50, 49), (100, 20), (100, 99), (500, 20), (1000, 200) ]
+
+
+def assert_same_chunks(texts: list, chunk_size: int, overlap_size: int):
+    metadatas = [ { "idx": idx } for idx in range(len(texts)) ]
+    expected = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=overlap_size, length_function=len
+    ).create_documents(texts, metadatas=metadatas)
+    actual = SpanTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=overlap_size
+    ).create_chunks(texts, metadatas=metadatas)
+
+    assert [ (chunk.page_content, chunk.metadata) for chunk in actual ] == [
+        (doc.page_content, doc.metadata) for doc in expected
+    ]
+
+
+@pytest.mark.parametrize("chunk_size,overlap_size", SIZES)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_langchain_on_random_texts(seed, chunk_size, overlap_size):
+    rng = random.Random(seed)
+    texts = [ random_text(rng, 400) for _ in range(20) ]
+    assert_same_chunks(texts, chunk_size=chunk_size, overlap_size=overlap_size)
+
+
+@pytest.mark.parametrize("chunk_size,overlap_size", SIZES)
+def test_matches_langchain_on_edge_cases(chunk_size, overlap_size):
+    assert_same_chunks(EDGE_CASE_TEXTS, chunk_size=chunk_size, overlap_size=overlap_size)
+
+
+def test_empty_and_whitespace_texts_have_no_chunks():
+    splitter = SpanTextSplitter(chunk_size=10, chunk_overlap=2)
+    assert splitter.create_chunks(["", "   ", "\n\n"]) == []